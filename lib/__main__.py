@@ -0,0 +1,208 @@
+import sys
+import time
+import argparse
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows, peak RSS is then not reported
+    resource = None
+
+from lib.helpers import DataRoot
+
+"""
+Command-line entry point of the whole pipeline, which runs the process of each module without editing the source files:
+
+    python -m lib clean [--mode all] [--jobs 4] [--force] [--publish]
+    python -m lib prepare [--mode h1 h2] [--publish]
+    python -m lib analyse [--no-plots]
+    python -m lib regress [--mode main sub-periods ...] [--jobs 4] [--method trust-exact]
+    python -m lib tables [--table table_6 appendix_b ...] [--thresholds] [--publish]
+
+Choices of --mode are the same as in clean_data_run(), PrepareData().control() and Regression().control().
+Several modes can be given, they are then executed one after another.
+If a stage fails, its error is printed and the command exits with a non-zero status (e.g. for scheduled jobs).
+The tables of the thesis (see TABLES in lib/regression.py) are rendered from the results saved by 'regress'.
+
+Options available for all subcommands:
+    + --raw-dir, --cleaned-dir, --stats-dir, --results-dir, --cache-dir: override the directories of DataRoot
+    + --profile: print wall time and cumulative peak RSS (resident memory) of each stage at the end
+"""
+
+
+class Profiler:
+    """
+    Measure wall time and peak RSS of each stage of the pipeline.
+
+    The peak RSS is the high-water mark of the whole process (ru_maxrss), which never decreases. Therefore, each stage
+    reports the cumulative peak RSS after the stage and by how much the stage raised it (0 if the stage stayed below
+    the peak of an earlier stage). The peak RSS of finished child processes (e.g. the pool of ETL stages with --jobs)
+    is reported separately, as the largest peak of a single child process.
+
+    :param enabled: if False, stages are executed without being measured
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        peak_before = self.peak_rss()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                peak = self.peak_rss()
+                self.stages.append((name, time.perf_counter() - start, peak, peak - peak_before,
+                                    self.peak_rss(children=True)))
+
+    @staticmethod
+    def peak_rss(children: bool = False) -> float:
+        """
+        Returns the peak RSS in MB of this process (or the largest peak of its finished child processes),
+        or NaN if it cannot be measured.
+        """
+        if resource is None:
+            return float('nan')
+
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+    def report(self) -> None:
+        if not self.enabled:
+            return
+
+        print('Profile:')
+        for name, wall_time, peak_rss, increase, children_rss in self.stages:
+            print('  - {:<40} {:>8.1f}s   cumulative peak RSS {:>8.0f} MB (+{:.0f} MB)   child processes {:>6.0f} MB'
+                  .format(name, wall_time, peak_rss, increase, children_rss))
+
+
+def clean(args, profiler: Profiler) -> None:
+    from lib.clean_data import clean_data_run, publish_cleaned_data
+
+    for mode in args.mode:
+        with profiler.stage('clean {}'.format(mode)):
+            clean_data_run(mode=mode, force=args.force, jobs=args.jobs)
+
+    if args.publish:
+        with profiler.stage('clean publish'):
+            publish_cleaned_data()
+
+
+def prepare(args, profiler: Profiler) -> None:
+    from lib.prepare_data import PrepareData
+
+    with profiler.stage('prepare (read cleaned data)'):
+        prepare_data = PrepareData()
+
+    for mode in args.mode:
+        with profiler.stage('prepare {}'.format(mode)):
+            prepare_data.control(mode=mode, publish=args.publish)
+
+
+def analyse(args, profiler: Profiler) -> None:
+    from lib.analyse_data import AnalyseData
+
+    with profiler.stage('analyse (read regression data)'):
+        analyse_data = AnalyseData()
+
+    with profiler.stage('analyse'):
+        analyse_data.control(plots=args.plots)
+
+
+def regress(args, profiler: Profiler) -> None:
+    from lib.regression import Regression
+
+    with profiler.stage('regress (read regression data)'):
+        regression = Regression(jobs=args.jobs, method=args.method)
+
+    for mode in args.mode:
+        with profiler.stage('regress {}'.format(mode)):
+            regression.control(mode=mode)
+
+
+def tables(args, profiler: Profiler) -> None:
+    from lib.regression import table_specs
+    from lib.result_store import ResultStore
+
+    store = ResultStore()
+    with profiler.stage('tables'):
+        for table in args.table:
+            print(table)
+            print(store.table(table_specs(table), thresholds=args.thresholds).to_string(index=False))
+
+        if args.publish:
+            file_path = store.publish({table: table_specs(table) for table in args.table}, thresholds=args.thresholds)
+            print('Tables are exported to {}'.format(file_path))
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--raw-dir', help='directory of raw data (default: data/raw_data)')
+    common.add_argument('--cleaned-dir', help='directory of cleaned and regression data (default: data/cleaned_data)')
+    common.add_argument('--stats-dir', help='directory of descriptive statistics (default: data/descriptive stats)')
+    common.add_argument('--results-dir', help='directory of regression results (default: data/regression_results)')
+    common.add_argument('--cache-dir', help='directory of the Excel cache (default: data/cache)')
+    common.add_argument('--profile', action='store_true', help='print wall time and cumulative peak RSS of each stage')
+
+    parser = argparse.ArgumentParser(prog='python -m lib', description='Run the data pipeline of the thesis.')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    parser_clean = subparsers.add_parser('clean', parents=[common], help='clean raw data (ETL process)')
+    parser_clean.add_argument('--mode', nargs='+', default=['all'],
+                              choices=['bloomberg_esg', 'refinitiv_esg', 'credit_rating', 'accounting', 'all'])
+    parser_clean.add_argument('--jobs', type=int, default=1, help="number of processes for mode 'all'")
+    parser_clean.add_argument('--force', action='store_true', help='re-run even if raw data and code are unchanged')
+    parser_clean.add_argument('--publish', action='store_true', help="export cleaned data to 'cleaned_data.xlsx'")
+    parser_clean.set_defaults(run=clean)
+
+    parser_prepare = subparsers.add_parser('prepare', parents=[common], help='prepare regression data')
+    parser_prepare.add_argument('--mode', nargs='+', default=['h1', 'h2'], choices=['h1', 'h2'])
+    parser_prepare.add_argument('--publish', action='store_true', help='export regression data to Excel')
+    parser_prepare.set_defaults(run=prepare)
+
+    parser_analyse = subparsers.add_parser('analyse', parents=[common], help='descriptive statistics and correlations')
+    parser_analyse.add_argument('--no-plots', dest='plots', action='store_false', help='do not show pair plots')
+    parser_analyse.set_defaults(run=analyse)
+
+    parser_regress = subparsers.add_parser('regress', parents=[common], help='run regressions')
+    parser_regress.add_argument('--mode', nargs='+', default=['main'],
+                                choices=['main', 'sub-periods', 'industry-breakdown', 'endogeneity',
+                                         'alternative-model', 'size-impact'])
+    parser_regress.add_argument('--jobs', type=int, default=1, help='number of processes fitting the regressions')
+    parser_regress.add_argument('--method',
+                                help="optimizer of all regressions, e.g. 'trust-exact' (default: optimizer of each spec)")
+    parser_regress.set_defaults(run=regress)
+
+    parser_tables = subparsers.add_parser('tables', parents=[common], help='render tables of stored regression results')
+    parser_tables.add_argument('--table', nargs='+', default=['table_6'],
+                               choices=['table_6', 'appendix_b', 'appendix_c', 'appendix_d', 'appendix_e',
+                                        'appendix_f'])
+    parser_tables.add_argument('--thresholds', action='store_true', help='also report the thresholds')
+    parser_tables.add_argument('--publish', action='store_true', help="export the tables to 'regression_tables.xlsx'")
+    parser_tables.set_defaults(run=tables)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list = None) -> None:
+    args = parse_args(argv)
+
+    DataRoot.configure(raw_data_root=args.raw_dir, cleaned_data_root=args.cleaned_dir,
+                       descriptive_stats_root=args.stats_dir, regression_results_root=args.results_dir,
+                       cache_root=args.cache_dir)
+
+    profiler = Profiler(enabled=args.profile)
+    with profiler.stage('total'):
+        args.run(args, profiler)
+    profiler.report()
+
+
+if __name__ == "__main__":
+    main()
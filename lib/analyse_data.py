@@ -22,15 +22,15 @@ class AnalyseData(DataRoot):
     """
     def __init__(self):
         super().__init__()
-        self.regression_data_dict = ExtractData().extract_regression_data()
+        self.regression_data_dict = ExtractData().extract_regression_data(preload=True)
 
-    def control(self) -> None:
+    def control(self, plots: bool = True) -> None:
         """
         The following steps are done:
             - get descriptive statistics of all datasets for both hypotheses
             - get correlation matrices of all datasets for both hypotheses
             - save all data generated above to excel
-            - generate pair plots
+            - generate pair plots (if plots is True)
         """
         # get descriptive statistics of all datasets
         descriptive_stat = self.descriptive_stat()
@@ -56,10 +56,11 @@ class AnalyseData(DataRoot):
             corr_esg.to_excel(writer, sheet_name=Variables.DescriptiveStats.CORR_ESG_SHEET_NAME, index=False)
 
         # generate pair plots
-        self.pairplot(data_set='h1_refinitiv')
-        self.pairplot(data_set='h1_spglobal')
-        self.pairplot(data_set='h1_sustainalytics')
-        self.pairplot(data_set='h2_main')
+        if plots:
+            self.pairplot(data_set='h1_refinitiv')
+            self.pairplot(data_set='h1_spglobal')
+            self.pairplot(data_set='h1_sustainalytics')
+            self.pairplot(data_set='h2_main')
 
     def descriptive_stat(self) -> pd.DataFrame:
         """
@@ -1,10 +1,20 @@
 import os
+import re
+import argparse
+import json
+import hashlib
+import inspect
+import importlib
+import time
 from datetime import date
+from contextlib import contextmanager
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import numpy as np
 import pandas as pd
 
 from lib.helpers import DataRoot, SmallFunction
+from lib.rating_scale import RatingScale
 from lib.variable_names import Variables
 
 """
@@ -12,10 +22,10 @@ This module performs ETL process for raw data from all data sources.
 More details can be found in the documentation of each class below.
 
 To execute a specific class to see how the output is generated:
-    + please scroll down to the end of the script where the clause
-      if __name__ == "__main__" is placed
+    + run 'python -m lib.clean_data --mode <mode>' from the project root, or
     + assign a string to the 'mode' variable in function clean_data_run()
     + choices of the 'mode' variable are defined in function clean_data_run()
+    + all data sources can be cleaned in parallel with 'python -m lib.clean_data --mode all --jobs 4'
 """
 
 
@@ -29,7 +39,12 @@ class CleanBase(DataRoot):
     The ETL process will follow below steps:
         1. Extract raw data downloaded from Bloomberg/Refinitiv in Excel files
         2. Transform data (convert from wide format to long format)
-        3. Load transformed data by exporting to Excel and saved under 'data/cleaned_data/cleaned_data.xlsx'.
+        3. Load transformed data to the data store under 'data/cleaned_data/cleaned_data' (one Parquet file per sheet).
+        The cleaned data can then be published to 'data/cleaned_data/cleaned_data.xlsx' (see clean_data_run()).
+
+    The ETL process is incremental: for each output sheet, a fingerprint (hash of each raw file, sheet names
+    and version of the cleaning code) is recorded in 'data/cleaned_data/cleaned_data_manifest.json'.
+    If the fingerprints of all output sheets are unchanged, extract/transform/load are skipped (see control()).
     """
 
     def __init__(self):
@@ -38,9 +53,57 @@ class CleanBase(DataRoot):
         self.raw_sheet_name = None
         self.cleaned_file_name = Variables.CleanedData.FILE_NAME
         self.cleaned_sheet_name = None
+        self.manifest_file = os.path.join(self.cleaned_data_root, Variables.CleanedData.MANIFEST_FILE_NAME)
         self.bb_ticker = Variables.BloombergDB.FIELDS.BB_TICKER
 
-    def control(self) -> None:
+        # if True, load_data() only collects the data in pending_writes instead of writing it (see StageRunner)
+        self.defer_writes = False
+        self.pending_writes = []
+
+    # ETL classes whose cleaned data must be available before this ETL process can run (see StageRunner)
+    depends_on = ()
+
+    # modules (besides the ETL classes) whose source code is part of the code version (see code_version()),
+    # e.g. lib/helpers.py for SmallFunction.generate_panel() used to populate monthly data
+    code_modules = ('lib.helpers', 'lib.variable_names')
+
+    @property
+    def inputs(self) -> list:
+        """
+        Raw data used by the ETL process as a list of (file path, sheet name).
+        Override in the child class if it uses other raw data than raw_file_name / raw_sheet_name.
+        """
+        return [(os.path.join(self.raw_data_root, self.raw_file_name), self.raw_sheet_name)]
+
+    @property
+    def outputs(self) -> list:
+        """
+        Sheet names written by the ETL process.
+        Override in the child class if it writes more than one sheet.
+        """
+        return [self.cleaned_sheet_name]
+
+    def control(self, force: bool = False) -> bool:
+        """
+        Execute ETL process if the raw data or the cleaning code has changed since the last run.
+
+        :param force: if True, the ETL process is executed even if nothing has changed
+        :return: True if the ETL process was executed, False if the cleaned data were up to date (cached)
+        """
+        fingerprint = self.fingerprint()
+        manifest = self.read_manifest(self.manifest_file)
+
+        if not force and self.is_up_to_date(fingerprint, manifest):
+            print('{}: raw data and code unchanged, using cleaned data (cached)'.format(type(self).__name__))
+            return False
+
+        self.etl()
+        self.record(fingerprint)
+        print('{}: cleaned data updated'.format(type(self).__name__))
+
+        return True
+
+    def etl(self) -> None:
         """
         Execute ETL process
         """
@@ -53,6 +116,77 @@ class CleanBase(DataRoot):
         # load
         self.load_data(data=data_t, file_name=self.cleaned_file_name, sheet_name=self.cleaned_sheet_name)
 
+    def fingerprint(self) -> dict:
+        """
+        Fingerprint of the inputs of the ETL process: hash of each raw file, its sheet name and the code version.
+        """
+        return {
+            'stage': type(self).__name__,
+            'inputs': [{'file': os.path.basename(file_path), 'sheet': sheet_name, 'sha1': self.file_hash(file_path)}
+                       for file_path, sheet_name in self.inputs],
+            'code_version': self.code_version(),
+        }
+
+    def code_version(self) -> str:
+        """
+        Hash of the source code of this class and all its parents up to CleanBase, and of the modules in code_modules.
+        Hence, any change in the cleaning code of a data source (or in the helpers it uses) re-runs its ETL process.
+        """
+        sources = [inspect.getsource(cls) for cls in type(self).__mro__ if issubclass(cls, CleanBase)]
+        sources += [inspect.getsource(importlib.import_module(module)) for module in self.code_modules]
+        return hashlib.sha1('\n'.join(sources).encode('utf-8')).hexdigest()
+
+    def record(self, fingerprint: dict) -> None:
+        """
+        Record the fingerprint of each output sheet once all sheets are written.
+        """
+        manifest = self.read_manifest(self.manifest_file)  # re-read: may have been updated by other stages
+        manifest.update({sheet_name: fingerprint for sheet_name in self.outputs})
+        self.write_manifest(self.manifest_file, manifest)
+
+    def is_up_to_date(self, fingerprint: dict, manifest: dict) -> bool:
+        """
+        Check whether all output sheets were generated from the same fingerprint and still exist.
+        """
+        if any(manifest.get(sheet_name) != fingerprint for sheet_name in self.outputs):
+            return False
+
+        store = self.data_store(self.cleaned_file_name)
+        return all(store.exists(sheet_name) for sheet_name in self.outputs)
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """
+        SHA-1 hash of the content of a file.
+        """
+        sha1 = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(chunk)
+
+        return sha1.hexdigest()
+
+    @staticmethod
+    def read_manifest(manifest_file: str) -> dict:
+        """
+        Returns the recorded fingerprint of each output sheet (empty if no manifest has been written yet).
+        """
+        if not Path(manifest_file).is_file():
+            return {}
+
+        with open(manifest_file, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def write_manifest(manifest_file: str, manifest: dict) -> None:
+        """
+        Write the manifest to a temporary file first, so that an interrupted run never leaves a corrupt manifest.
+        """
+        tmp_file = manifest_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, manifest_file)
+
     def extract_data(self, file_name: str, sheet_name: str) -> pd.DataFrame:
         """
         Extract raw data from downloaded Excel files stored under 'data/raw_data'.
@@ -75,23 +209,18 @@ class CleanBase(DataRoot):
 
     def load_data(self, data: pd.DataFrame, file_name: str, sheet_name: str) -> None:
         """
-        Write / append the transformed data to Excel file and save it under 'data/cleaned_data/cleaned_data.xlsx'.
+        Write the transformed data to the data store of the cleaned data (see DataStore in lib/helpers.py),
+        by default 'data/cleaned_data/cleaned_data/<sheet_name>.parquet'. An existing sheet is replaced.
 
         :param data: a transformed data frame resulted from transform_data()
-        :param file_name: file name that data will be written to (usually 'cleaned_data.xlsx')
+        :param file_name: name of the dataset that data will be written to (usually 'cleaned_data.xlsx')
         :param sheet_name: relevant sheet name, depending on data source
         :return: None
         """
-        output_file = os.path.join(self.cleaned_data_root, file_name)
-
-        # if the file exists -> append new sheet
-        if Path(output_file).is_file():
-            with pd.ExcelWriter(output_file, engine='openpyxl', mode='a') as writer:
-                data.to_excel(writer, sheet_name=sheet_name, index=False)
-
-        else:  # create new file and save
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                data.to_excel(writer, sheet_name=sheet_name, index=False)
+        if self.defer_writes:
+            self.pending_writes.append((data, file_name, sheet_name))
+        else:
+            self.data_store(file_name).write(data, sheet_name=sheet_name)
 
 
 class BloombergESG(CleanBase):
@@ -99,7 +228,7 @@ class BloombergESG(CleanBase):
     Clean S&P Global (formerly RobecoSAM) and Sustainalytics ESG data downloaded from Bloomberg.
     This class inherits all features from the CleanBase class defined above.
 
-    The generated data is saved under sheet name 'esg_bb' in 'data/cleaned_data/cleaned_data.xlsx'.
+    The generated data is saved under sheet name 'esg_bb' of the cleaned data (see CleanBase.load_data()).
     """
 
     def __init__(self):
@@ -110,37 +239,30 @@ class BloombergESG(CleanBase):
 
     def transform_data(self, data):
 
-        data.iloc[2, :] = data.iloc[2, :].fillna(method='ffill', axis=0)  # fill BB_Ticker to missing columns
-
-        data = data.rename(columns=data.iloc[2])  # rename columns to BB_Tickers
-
-        data = data.iloc[4:, :].reset_index(drop=True)  # remove redundant headers
-
-        # reset index to 'Dates'
-        data = data.rename(columns={data.columns[0]: 'Dates'})
-        data = data.set_index('Dates')
-
-        # reshape data (also drop NA values)
-        temp = data.T
-        temp = temp.set_index(['Dates'], append=True)
-        temp = temp.reset_index()
-        temp = temp.rename(columns={
-            temp.columns[0]: self.bb_ticker,
-            temp.columns[1]: 'variable'})
-
-        data_t = temp.melt(id_vars=[self.bb_ticker, 'variable'], var_name='Dates')
-        data_t = pd.pivot_table(
-            data_t,
-            values='value',
-            index=[self.bb_ticker, 'Dates'],
-            columns=['variable'],
-            aggfunc='first'
-        )
+        # the downloaded sheet consists of a block of columns per BB_Ticker
+        #   - row 2: BB_Ticker (only filled in the first column of each block)
+        #   - row 4: field names
+        #   - row 5 onwards: one row per date (first column) with values of each field of each BB_Ticker
+        tickers = data.iloc[2, 1:].fillna(method='ffill', axis=0)  # fill BB_Ticker to missing columns
+        fields = data.iloc[4, 1:]
+
+        values = data.iloc[5:, 1:]
+        values.index = pd.Index(data.iloc[5:, 0], name='Dates')
+        values.columns = pd.MultiIndex.from_arrays([tickers, fields], names=[self.bb_ticker, 'variable'])
+
+        # remove columns and rows without BB_Ticker / field name / date
+        values = values.loc[values.index.notnull(), tickers.notnull().values & fields.notnull().values]
+
+        # keep only the first valid observation if a field of a BB_Ticker is downloaded more than once
+        if values.columns.duplicated().any():
+            values = values.groupby(level=[self.bb_ticker, 'variable'], axis=1).first()
+
+        # reshape data from (Dates) x (BB_Ticker, field) to (BB_Ticker, Dates) x field
+        # (also drop rows where all fields are NA values)
+        data_t = values.stack(level=self.bb_ticker, dropna=True)
+        data_t = data_t.reorder_levels([self.bb_ticker, 'Dates']).sort_index(axis=0).sort_index(axis=1)
+        data_t = data_t.infer_objects()  # raw values are read as objects -> convert to numeric types
         data_t = data_t.reset_index()
-        data_t = data_t.rename(columns={
-            data_t.columns[0]: self.bb_ticker,
-            data_t.columns[1]: 'Dates'
-        })
 
         # extract month and year from reported days
         # which will be used for merging data to run regression
@@ -160,7 +282,7 @@ class RefinitivESG(CleanBase):
     Clean ESG data downloaded from Refinitiv.
     This class inherits all features from the CleanBase class defined above.
 
-    The generated data is saved under sheet name 'esg_refinitiv' in 'data/cleaned_data/cleaned_data.xlsx'.
+    The generated data is saved under sheet name 'esg_refinitiv' of the cleaned data (see CleanBase.load_data()).
     """
 
     def __init__(self):
@@ -169,42 +291,37 @@ class RefinitivESG(CleanBase):
         self.raw_sheet_name = Variables.RefinitivDB.ESG_SHEET_NAME
         self.cleaned_sheet_name = Variables.CleanedData.REFINITIV_ESG_SHEET_NAME
 
+    @property
+    def inputs(self):
+        # company info is used to map ISIN to BB_Ticker
+        return super().inputs + [(self.company_info_file, Variables.BloombergDB.FILES.COMPANY_INFO_SHEET_NAME)]
+
+    # each column is identified by a code such as 'SE0007100581(TRESGS)', i.e. ISIN followed by the field in brackets
+    CODE_PATTERN = re.compile(r'^\s*(?P<isin>[^(\s]+)\s*\((?P<field>[^)]+)\)?\s*$')
+
     def transform_data(self, data):
 
-        data = data.set_index('Name')  # set index
-
-        # rename columns and esg variables
-        df = data.iloc[0, :]
-        df = df.reset_index(drop=True)
-        df = df.to_frame()
-        df = df.assign(list=df['Code'].str.split("(")).explode("list")
-        df = df.reset_index(drop=True)
-        column_names = df["list"].iloc[::2]  # extract even indexes
-        variable_names = df["list"].iloc[1::2]  # extract odd indexes
-
-        data.columns = list(column_names)
-        data.loc["Code", :] = list(variable_names)
-
-        # rename index to 'Dates'
-        data = data.reset_index()
-        data = data.rename(columns={data.columns[0]: 'Dates'})
-        data = data.set_index('Dates')
-
-        # reshape data (also drop NA values)
-        temp = data.T
-        temp = temp.set_index(['Code'], append=True)
-        temp = temp.reset_index()
-        temp = temp.rename(columns={temp.columns[0]: 'company_isin', temp.columns[1]: 'variable'})
-
-        data_t = temp.melt(id_vars=['company_isin', 'variable'], var_name='Dates')
-        data_t = pd.pivot_table(
-            data_t,
-            values='value',
-            index=['company_isin', 'Dates'],
-            columns=['variable'],
-            aggfunc='first'
-        )
+        # parse ISIN and field name of each column from its code (first row)
+        codes = data.iloc[0, 1:].astype(str).str.extract(self.CODE_PATTERN)
+
+        values = data.iloc[1:, 1:]
+        values.index = pd.Index(data.iloc[1:, 0], name='Dates')
+        values.columns = pd.MultiIndex.from_arrays([codes['isin'], codes['field']], names=['ID_ISIN', 'variable'])
+
+        # remove columns whose code cannot be parsed and rows without date
+        values = values.loc[values.index.notnull(), codes['isin'].notnull().values]
+
+        # keep only the first valid observation if a field of an ISIN is downloaded more than once
+        if values.columns.duplicated().any():
+            values = values.groupby(level=['ID_ISIN', 'variable'], axis=1).first()
+
+        # reshape data from (Dates) x (ISIN, field) to (ISIN, Dates) x field
+        # (also drop rows where all fields are NA values)
+        data_t = values.stack(level='ID_ISIN', dropna=True)
+        data_t = data_t.reorder_levels(['ID_ISIN', 'Dates']).sort_index(axis=0).sort_index(axis=1)
+        data_t = data_t.infer_objects()  # raw values are read as objects -> convert to numeric types
         data_t = data_t.reset_index()
+        data_t.columns.name = None
 
         # shift Dates to 1 day backward to get end-of-month rating
         data_t['Dates'] = pd.to_datetime(data_t['Dates'])
@@ -216,18 +333,16 @@ class RefinitivESG(CleanBase):
         data_t['Dates'] = data_t['Dates'].dt.date
 
         # sort values
-        data_t = data_t.sort_values(['company_isin', 'Dates'], ascending=True)
-        data_t = data_t.rename(columns={'company_isin': 'ID_ISIN'})
+        data_t = data_t.sort_values(['ID_ISIN', 'Dates'], ascending=True)
 
-        # merge with 'company_info.xlsx' to get BB_TICKER
-        data_t = data_t.merge(self.company_info[[self.bb_ticker, 'ID_ISIN']], on='ID_ISIN', how='outer')
-        data_t = data_t.loc[data_t['Dates'].notnull()]
+        # map ISIN to BB_TICKER using company info
+        company_info = self.company_info.loc[self.company_info['ID_ISIN'].notnull()]
+        isin_to_ticker = dict(zip(company_info['ID_ISIN'], company_info[self.bb_ticker]))
+        data_t[self.bb_ticker] = data_t['ID_ISIN'].map(isin_to_ticker)
 
-        # exclude data before 2006
-        data_t = data_t.loc[data_t['Dates'] > date(2005, 12, 31)].reset_index(drop=True)
-
-        # exclude data that are not in selected companies sample
-        data_t = data_t.loc[data_t[self.bb_ticker].notnull()]
+        # exclude data before 2006 and data that are not in selected companies sample
+        data_t = data_t.loc[(data_t['Dates'] > date(2005, 12, 31)) & (data_t[self.bb_ticker].notnull())]
+        data_t = data_t.reset_index(drop=True)
 
         return data_t
 
@@ -236,7 +351,7 @@ class BloombergCreditRtg(CleanBase):
     """
     This class clean and transform data for credit ratings.
 
-    It performs the following steps (as defined in .control() method):
+    It performs the following steps (as defined in .etl() method):
 
         1. clean_supervisor_data():
             + clean credit ratings provided by supervisors
@@ -249,25 +364,40 @@ class BloombergCreditRtg(CleanBase):
 
         4. hard_code_rtg():
             + transform credit ratings to an ordinal scale
-
-        5. classify_rtg():
             + label whether a rating is investment / speculative grade
 
-        6. populate_rtg():
+        5. populate_rtg():
             + populate credit ratings to monthly data
             because we only have information when there is a change in credit ratings from Bloomberg,
             not a continuous time series.
 
-    The cleaned credit rating data is saved under sheet name 'sp_credit_rtg' in 'data/cleaned_data/cleaned_data.xlsx'.
+    The cleaned credit rating data is saved under sheet name 'sp_credit_rtg' of the cleaned data (see CleanBase.load_data()).
 
     The cleaned and monthly populated credit rating data is saved
-    under sheet name 'populated_sp_credit_rtg' in 'data/cleaned_data/cleaned_data.xlsx'.
+    under sheet name 'populated_sp_credit_rtg' of the cleaned data (see CleanBase.load_data()).
     """
 
+    # ratings are encoded with the scales defined in lib/rating_scale.py
+    code_modules = CleanBase.code_modules + ('lib.rating_scale',)
+
     def __init__(self):
         super().__init__()
 
-    def control(self) -> None:
+    @property
+    def inputs(self):
+        # company info is used to map the companyid of the supervisor data to BB_Ticker
+        return [
+            (os.path.join(self.raw_data_root, Variables.SupervisorData.FILE_NAME), Variables.SupervisorData.SHEET_NAME),
+            (os.path.join(self.raw_data_root, Variables.BloombergDB.FILES.RAW_DATA_FILE_NAME),
+             Variables.BloombergDB.FILES.SP_RATING_CHANGES_SHEET_NAME),
+            (self.company_info_file, Variables.BloombergDB.FILES.COMPANY_INFO_SHEET_NAME),
+        ]
+
+    @property
+    def outputs(self):
+        return [Variables.CleanedData.SP_CREDIT_RTG_SHEET_NAME, Variables.CleanedData.POPULATED_SP_CREDIT_RTG_SHEET_NAME]
+
+    def etl(self) -> None:
         """
         This function executes workflow of cleaning credit ratings as described in the class documentation.
         """
@@ -289,11 +419,8 @@ class BloombergCreditRtg(CleanBase):
         # merge cleaned Bloomberg data and supervisor's provided data
         data = self.merge_all(supervisor_data_c, bb_data_c)
 
-        # transform credit ratings to an ordinal scale
-        data_t = self.hard_code_rtg(data)
-
-        # classify credit ratings
-        sp_credit_rtg = self.classify_rtg(data_t)
+        # transform credit ratings to an ordinal scale and classify credit ratings
+        sp_credit_rtg = self.hard_code_rtg(data)
 
         # populate cleaned ratings to monthly data from 2006 --> 2020
         populated_rtg = self.populate_rtg(sp_credit_rtg)
@@ -366,60 +493,34 @@ class BloombergCreditRtg(CleanBase):
         return data
 
     @staticmethod
-    def hard_code_rtg(data: pd.DataFrame) -> pd.DataFrame:
+    def hard_code_rtg(data: pd.DataFrame, scale: str = Variables.SPCreditRtg.RATING_SCALE) -> pd.DataFrame:
         """
-        Transform credit rating to an ordinal scale
+        Transform credit rating to an ordinal scale and label its grade in a single lookup (see lib/rating_scale.py)
             - NR: rating has not been assigned or is no longer assigned.
-
-        :param data: transformed data frame of credit ratings
-        """
-        data.loc[data['rating'] == 'NR', 'ordinal_rating'] = 0
-        data.loc[data['rating'] == 'D', 'ordinal_rating'] = 1
-        data.loc[data['rating'] == 'SD', 'ordinal_rating'] = 1
-        data.loc[data['rating'] == 'C', 'ordinal_rating'] = 2
-        data.loc[data['rating'] == 'CC', 'ordinal_rating'] = 3
-        data.loc[data['rating'] == 'CCC-', 'ordinal_rating'] = 4
-        data.loc[data['rating'] == 'CCC', 'ordinal_rating'] = 5
-        data.loc[data['rating'] == 'CCC+', 'ordinal_rating'] = 6
-        data.loc[data['rating'] == 'B-', 'ordinal_rating'] = 7
-        data.loc[data['rating'] == 'B', 'ordinal_rating'] = 8
-        data.loc[data['rating'] == 'B+', 'ordinal_rating'] = 9
-        data.loc[data['rating'] == 'BB-', 'ordinal_rating'] = 10
-        data.loc[data['rating'] == 'BB', 'ordinal_rating'] = 11
-        data.loc[data['rating'] == 'BB+', 'ordinal_rating'] = 12
-        data.loc[data['rating'] == 'BBB-', 'ordinal_rating'] = 13
-        data.loc[data['rating'] == 'BBB', 'ordinal_rating'] = 14
-        data.loc[data['rating'] == 'BBB+', 'ordinal_rating'] = 15
-        data.loc[data['rating'] == 'A-', 'ordinal_rating'] = 16
-        data.loc[data['rating'] == 'A', 'ordinal_rating'] = 17
-        data.loc[data['rating'] == 'A+', 'ordinal_rating'] = 18
-        data.loc[data['rating'] == 'AA-', 'ordinal_rating'] = 19
-        data.loc[data['rating'] == 'AA', 'ordinal_rating'] = 20
-        data.loc[data['rating'] == 'AA+', 'ordinal_rating'] = 21
-        data.loc[data['rating'] == 'AAA', 'ordinal_rating'] = 22
-
-        return data
-
-    @staticmethod
-    def classify_rtg(data: pd.DataFrame) -> pd.DataFrame:
-        """
-        Labels grade to credit ratings
             - if > 12 (i.e. BB+): grade = 'investment'
             - else: grade = 'speculative'
 
+        Ratings that are not part of the scale are reported and kept with NaN ordinal_rating and grade.
+
         :param data: transformed data frame of credit ratings
+        :param scale: name of the registered rating scale (S&P by default)
         """
-        data.loc[data['ordinal_rating'] > 12, 'grade'] = 'investment'
-        data.loc[data['ordinal_rating'] <= 12, 'grade'] = 'speculative'
+        encoded = RatingScale.get(scale).encode(data['rating'])
 
-        return data
+        return data.assign(ordinal_rating=encoded['ordinal_rating'], grade=encoded['grade'])
 
-    def populate_rtg(self, data: pd.DataFrame) -> pd.DataFrame:
+    def populate_rtg(self, data: pd.DataFrame, start_dt: date = date(2006, 1, 1),
+                     end_dt: date = date(2020, 12, 31)) -> pd.DataFrame:
         """
-        Populate credit ratings to monthly data from 2006 - 2020
-        by using 'ffill' method from pandas package.
+        Populate credit ratings to monthly data from start_dt to end_dt (by default 2006 - 2020)
+        by forward filling ('ffill') the ratings of each company over the full (company x month) panel.
+
+        Only credit rating changes within the period are populated, i.e. months before the first change
+        within the period are excluded.
 
         :param data: transformed data frame of credit ratings from merge_all() function
+        :param start_dt: first month of the populated data
+        :param end_dt: last month of the populated data
         """
 
         # extract month and year from rating_date
@@ -427,8 +528,6 @@ class BloombergCreditRtg(CleanBase):
         data['month'] = data['rating_date'].dt.month
         data['year'] = data['rating_date'].dt.year
 
-        series = SmallFunction.generate_series(start_dt=date(2006, 1, 1), end_dt=date(2020, 12, 31))
-
         ########################
         # populate credit rating
         ########################
@@ -439,20 +538,18 @@ class BloombergCreditRtg(CleanBase):
         # but these cases are very rare, and thus we only keep the latest value within that month
         rating = rating.drop_duplicates(keep='last')
 
-        # populate (this also excludes data after 2020)
-        populated_rtg = []
-        for company in rating[self.bb_ticker].unique():
-            df = rating.loc[rating[self.bb_ticker] == company]
-            df = series.merge(df, on=['month', 'year'], how='outer')
-            df = df.fillna(method='ffill')  # propagate last valid observation forward to next valid
-            populated_rtg.append(df)
-        populated_rtg = pd.concat(populated_rtg)
+        # full (company x month) panel between start_dt and end_dt
+        panel = SmallFunction.generate_panel(rating[self.bb_ticker], start_dt=start_dt, end_dt=end_dt)
+
+        # place credit rating changes on the panel (this also excludes data outside the period)
+        populated_rtg = panel.merge(rating, on=['month', 'year', self.bb_ticker], how='left')
 
-        # only get data between 2006 and 2020
-        populated_rtg = populated_rtg.loc[(populated_rtg['year'] >= 2006) & (populated_rtg['year'] <= 2020)]
+        # propagate last valid observation forward to next valid (within each company)
+        rating_columns = [column for column in rating.columns if column not in ['month', 'year', self.bb_ticker]]
+        populated_rtg[rating_columns] = populated_rtg.groupby(self.bb_ticker, sort=False)[rating_columns].ffill()
 
         # drop NA values
-        populated_rtg = populated_rtg.dropna(axis=0, how='any')
+        populated_rtg = populated_rtg.dropna(axis=0, how='any').reset_index(drop=True)
 
         return populated_rtg
 
@@ -470,24 +567,30 @@ class BloombergAccounting(BloombergESG):
         - populate():
             + populate accounting to monthly data (as downloaded data is yearly)
 
-    The cleaned accounting data is saved under sheet name 'accounting' in 'data/cleaned_data/cleaned_data.xlsx'.
+    The cleaned accounting data is saved under sheet name 'accounting' of the cleaned data (see CleanBase.load_data()).
 
     The cleaned and monthly populated credit rating data is saved
-    under sheet name 'populated_accounting' in 'data/cleaned_data/cleaned_data.xlsx'.
+    under sheet name 'populated_accounting' of the cleaned data (see CleanBase.load_data()).
     """
 
     def __init__(self):
         super().__init__()
+        self.raw_sheet_name = Variables.BloombergDB.FILES.ACCOUNTING_DATA_SHEET_NAME
 
-    def control(self) -> None:
-        data = self.extract_data(file_name=Variables.BloombergDB.FILES.RAW_DATA_FILE_NAME,
-                                 sheet_name=Variables.BloombergDB.FILES.ACCOUNTING_DATA_SHEET_NAME)
+    @property
+    def outputs(self):
+        return [Variables.CleanedData.ACCOUNTING_SHEET_NAME, Variables.CleanedData.POPULATED_ACCOUNTING_SHEET_NAME]
+
+    def etl(self) -> None:
+        data = self.extract_data(file_name=self.raw_file_name, sheet_name=self.raw_sheet_name)
         data_t = self.transform_data(data)
+
+        # SIZE and LEVERAGE are also needed in the (yearly) accounting data, see PrepareData.hypothesis2_yearly()
+        data_t = self.calculate_control_var(data_t)
         self.load_data(data=data_t, file_name=self.cleaned_file_name,
                        sheet_name=Variables.CleanedData.ACCOUNTING_SHEET_NAME)
 
-        data = self.calculate_control_var(data_t)
-        populated_data = self.populate(data)
+        populated_data = self.populate(data_t)
         self.load_data(data=populated_data, file_name=self.cleaned_file_name,
                        sheet_name=Variables.CleanedData.POPULATED_ACCOUNTING_SHEET_NAME)
 
@@ -506,78 +609,294 @@ class BloombergAccounting(BloombergESG):
         return data
 
 
-    def populate(self, data: pd.DataFrame) -> pd.DataFrame:
+    def populate(self, data: pd.DataFrame, fill_method: str = 'bfill', start_dt: date = date(2006, 1, 1),
+                 end_dt: date = date(2020, 12, 31)) -> pd.DataFrame:
         """
-        Populate accounting data from yearly data to monthly data over the period between 2006 and 2020.
+        Populate accounting data from yearly data to monthly data over the period between start_dt and end_dt
+        (by default 2006 - 2020), within the years for which accounting data of each company is available.
+
+        Choices of 'fill_method' variable are:
+            - 'bfill': use next valid observation to fill gap (i.e. each month gets the value of its fiscal year)
+            - 'ffill': propagate last valid observation forward
+            - 'linear': as 'bfill', but SIZE and LEVERAGE are linearly interpolated between two yearly observations
 
         :param data: transformed accounting data received from transform_data()
+        :param fill_method: how gaps between two yearly observations are filled (see above)
+        :param start_dt: first month of the populated data
+        :param end_dt: last month of the populated data
         """
-        series = SmallFunction.generate_series(start_dt=date(2006, 1, 1), end_dt=date(2020, 12, 31))
-        data = data[[
-            self.bb_ticker,
-            'month',
-            'year',
+        if fill_method not in ['bfill', 'ffill', 'linear']:
+            raise ValueError("fill_method must be 'bfill', 'ffill' or 'linear', got {!r}".format(fill_method))
+
+        control_var = [
             Variables.RegressionData.ControlVar.H1_LEV,
             Variables.RegressionData.ControlVar.H1_SIZE,
             Variables.RegressionData.ControlVar.H1_ICOV,
             Variables.RegressionData.ControlVar.H1_OMAR,
-        ]]
-        populated = []
-        for company in data[self.bb_ticker].unique():
-            df = data.loc[data[self.bb_ticker] == company]
-            min_year = min(df['year'])
-            max_year = max(df['year'])
-            df = series.merge(df, on=['month', 'year'], how='left')
-            df = df.fillna(method='bfill')  # use next valid observation to fill gap
-            df = df.loc[(df['year'] >= min_year) & (df['year'] <= max_year)]
-            populated.append(df)
-        populated = pd.concat(populated)
+        ]
+        data = data[[self.bb_ticker, 'month', 'year'] + control_var]
+
+        # years for which accounting data of each company is available
+        year_range = data.groupby(self.bb_ticker)['year'].agg(['min', 'max'])
+
+        # place yearly accounting data on the full (company x month) panel
+        panel = SmallFunction.generate_panel(data[self.bb_ticker], start_dt=start_dt, end_dt=end_dt)
+        populated = panel.merge(data, on=['month', 'year', self.bb_ticker], how='left')
+
+        # fill gaps within each company
+        grouped = populated.groupby(self.bb_ticker, sort=False)[control_var]
+        if fill_method == 'ffill':
+            filled = grouped.ffill()  # propagate last valid observation forward to next valid
+        else:
+            filled = grouped.bfill()  # use next valid observation to fill gap
+            if fill_method == 'linear':
+                interpolated_var = [Variables.RegressionData.ControlVar.H1_SIZE, Variables.RegressionData.ControlVar.H1_LEV]
+                interpolated = self.interpolate_linear(populated, columns=interpolated_var, group=self.bb_ticker)
+                filled[interpolated_var] = interpolated.fillna(filled[interpolated_var])
+        populated[control_var] = filled
+
+        # only keep years for which accounting data of the company is available
+        populated = populated.loc[
+            (populated['year'] >= populated[self.bb_ticker].map(year_range['min'])) &
+            (populated['year'] <= populated[self.bb_ticker].map(year_range['max']))
+        ]
 
         # drop row having NA values
-        populated = populated.dropna(axis=0, how='any')
+        populated = populated.dropna(axis=0, how='any').reset_index(drop=True)
 
         return populated
 
+    @staticmethod
+    def interpolate_linear(data: pd.DataFrame, columns: list, group: str) -> pd.DataFrame:
+        """
+        Linearly interpolate gaps between two valid observations of each group.
+        Gaps before the first and after the last valid observation of a group are left as NA values.
+
+        :param data: data frame sorted by group and date, with one row per period
+        :param columns: columns to be interpolated
+        :param group: name of the group column (e.g. BB_TICKER)
+        """
+        position = pd.Series(np.arange(len(data), dtype='float64'), index=data.index)
+
+        interpolated = pd.DataFrame(index=data.index)
+        for column in columns:
+            valid_position = position.where(data[column].notnull())
+            frame = pd.DataFrame({
+                group: data[group],
+                'previous_position': valid_position,
+                'next_position': valid_position,
+                'previous_value': data[column],
+                'next_value': data[column],
+            })
+            previous = frame.groupby(group, sort=False)[['previous_position', 'previous_value']].ffill()
+            following = frame.groupby(group, sort=False)[['next_position', 'next_value']].bfill()
+
+            distance = following['next_position'] - previous['previous_position']
+            weight = ((position - previous['previous_position']) / distance).where(distance > 0, 0)
+            interpolated[column] = previous['previous_value'] + weight * (following['next_value'] - previous['previous_value'])
+
+        return interpolated
+
+
+class StageRunner:
+    """
+    Run several ETL classes (stages) as a DAG: a stage starts as soon as all stages in its 'depends_on' are finished.
+
+    Extract and transform of independent stages are executed in parallel in a pool of 'jobs' processes.
+    The cleaned data of each stage is sent back to the main process, which writes it to the data store
+    and records its fingerprint, i.e. writes are serialized. Stages whose raw data and code are unchanged
+    are skipped (see CleanBase.control()).
+
+    :param stages: ETL classes to be executed (e.g. [BloombergESG, RefinitivESG])
+    :param jobs: number of processes (1: all stages are executed one after another in the main process)
+    :param force: if True, also execute stages whose raw data and code are unchanged
+    """
+
+    def __init__(self, stages: list, jobs: int = 1, force: bool = False):
+        self.stages = {stage.__name__: stage() for stage in stages}
+        self.jobs = max(1, int(jobs))
+        self.force = force
+
+    def run(self) -> dict:
+        """
+        Execute all stages and return a dictionary with for each stage name:
+            - 'executed': True if the stage was executed, False if its cleaned data were up to date (cached)
+            - 'wall_time': wall time of the stage in seconds (extract + transform + write)
+        """
+        results = {}
+        fingerprints = {}
+        manifest = CleanBase.read_manifest(next(iter(self.stages.values())).manifest_file) if self.stages else {}
+
+        # skip stages whose cleaned data are up to date
+        for name, stage in self.stages.items():
+            with stage_failure(name):
+                fingerprints[name] = stage.fingerprint()
+            if not self.force and stage.is_up_to_date(fingerprints[name], manifest):
+                results[name] = {'executed': False, 'wall_time': 0.0}
+
+        # dependencies that are not part of this run are assumed to be up to date
+        pending = {name: {dependency.__name__ for dependency in stage.depends_on} & set(self.stages)
+                   for name, stage in self.stages.items() if name not in results}
+
+        if self.jobs == 1:
+            while pending:
+                name = self.next_ready(pending, results)
+                del pending[name]
+                with stage_failure(name):
+                    pending_writes, wall_time = execute_stage(self.stages[name])
+                    results[name] = self.finish(name, pending_writes, wall_time, fingerprints[name])
+            return results
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            running = {}
+            while pending or running:
+
+                # submit all stages whose dependencies are finished
+                for name in [name for name, dependencies in pending.items() if dependencies.issubset(results)]:
+                    del pending[name]
+                    running[executor.submit(execute_stage, self.stages[name])] = name
+
+                if not running:
+                    raise ValueError('Cyclic dependencies between stages: {}'.format(sorted(pending)))
+
+                # write data of finished stages one after another
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    with stage_failure(name):
+                        pending_writes, wall_time = future.result()
+                        results[name] = self.finish(name, pending_writes, wall_time, fingerprints[name])
+
+        return results
+
+    @staticmethod
+    def next_ready(pending: dict, results: dict) -> str:
+        """
+        Returns the name of the first pending stage whose dependencies are finished.
+        """
+        for name, dependencies in pending.items():
+            if dependencies.issubset(results):
+                return name
+
+        raise ValueError('Cyclic dependencies between stages: {}'.format(sorted(pending)))
+
+    def finish(self, name: str, pending_writes: list, wall_time: float, fingerprint: dict) -> dict:
+        """
+        Write the cleaned data of a stage and record its fingerprint.
+        """
+        stage = self.stages[name]
+        start = time.perf_counter()
+        for data, file_name, sheet_name in pending_writes:
+            stage.data_store(file_name).write(data, sheet_name=sheet_name)
+        stage.record(fingerprint)
+
+        return {'executed': True, 'wall_time': wall_time + time.perf_counter() - start}
+
+    @staticmethod
+    def report(results: dict) -> None:
+        """
+        Print whether each stage was executed or cached together with its wall time.
+        """
+        for name, result in results.items():
+            if result['executed']:
+                print('  - {}: executed in {:.1f}s'.format(name, result['wall_time']))
+            else:
+                print('  - {}: raw data and code unchanged (cached)'.format(name))
+
 
-def clean_data_run(mode='all'):
+@contextmanager
+def stage_failure(name: str):
+    """
+    Print the name of an ETL stage that fails and re-raise its exception,
+    so that the command line (python -m lib clean) exits with a non-zero status.
+    """
+    try:
+        yield
+    except Exception:
+        print('ETL stage {} failed'.format(name))
+        raise
+
+
+def execute_stage(stage: CleanBase) -> tuple:
+    """
+    Extract and transform the data of a stage without writing it (executed in a worker process of StageRunner).
+
+    :return: data to be written as a list of (data, file name, sheet name) and the wall time in seconds
+    """
+    start = time.perf_counter()
+    stage.defer_writes = True
+    stage.pending_writes = []
+    try:
+        stage.etl()
+    finally:
+        stage.defer_writes = False
+
+    return stage.pending_writes, time.perf_counter() - start
+
+
+def clean_data_run(mode='all', force=False, publish=False, jobs=1):
     """
     Run the ETL process for a chosen data source as defined above.
     :param mode: name of the data source to be executed
+    :param force: if True, re-run the ETL process even if raw data and code are unchanged since the last run
+    :param publish: if True, export all cleaned data to 'data/cleaned_data/cleaned_data.xlsx' at the end
+    :param jobs: number of processes used to execute independent data sources in parallel (only for mode 'all')
 
     Choices of 'mode' variable are:
         - 'bloomberg_esg': ESG data from Sustainalytics & S&P Global
         - 'refinitiv_esg': ESG data from Refinitiv
         - 'credit_rating': S&P credit ratings data
         - 'accounting': accounting data
-        - 'all': all data sources mentioned above (Note: this may takes long time)
+        - 'all': all data sources mentioned above (Note: this may takes long time, use jobs=4 to speed it up)
 
-    Generated data will be saved in 'data/cleaned_data/cleaned_data.xlsx'.
+    Generated data will be saved in the data store under 'data/cleaned_data/cleaned_data'.
+    A failing ETL stage is reported and its exception is raised (for all modes).
     """
+    stages = {
+        'bloomberg_esg': BloombergESG,
+        'refinitiv_esg': RefinitivESG,
+        'credit_rating': BloombergCreditRtg,
+        'accounting': BloombergAccounting,
+    }
 
-    if mode == 'bloomberg_esg':
-        BloombergESG().control()
-
-    elif mode == 'refinitiv_esg':
-        RefinitivESG().control()
-
-    elif mode == 'credit_rating':
-        BloombergCreditRtg().control()
-
-    elif mode == 'accounting':
-        BloombergAccounting().control()
+    if mode in stages:
+        with stage_failure(stages[mode].__name__):
+            stages[mode]().control(force=force)
 
     else:  # i.e mode == 'all'
+        start = time.perf_counter()
+        runner = StageRunner(list(stages.values()), jobs=jobs, force=force)
+        results = runner.run()
+        store = DataRoot().data_store(Variables.CleanedData.FILE_NAME)
+        print('All raw data are successfully cleaned and transformed and saved under {} ({:.1f}s)'.format(
+            os.path.join(store.root, store.name), time.perf_counter() - start))
+        runner.report(results)
 
-        try:
-            BloombergESG().control()
-            RefinitivESG().control()
-            BloombergCreditRtg().control()
-            BloombergAccounting().control()
-            print('All raw data are successfully cleaned and transformed and saved under data/cleaned_data/cleaned_data.xlsx')
+    if publish:
+        publish_cleaned_data()
 
-        except BaseException as be:
-            print(be)
+
+def publish_cleaned_data() -> None:
+    """
+    Export all cleaned data from the data store to 'data/cleaned_data/cleaned_data.xlsx'.
+    """
+    file_path = DataRoot().data_store(Variables.CleanedData.FILE_NAME).publish(sheet_names=[
+        Variables.CleanedData.BLOOMBERG_ESG_SHEET_NAME,
+        Variables.CleanedData.REFINITIV_ESG_SHEET_NAME,
+        Variables.CleanedData.SP_CREDIT_RTG_SHEET_NAME,
+        Variables.CleanedData.POPULATED_SP_CREDIT_RTG_SHEET_NAME,
+        Variables.CleanedData.ACCOUNTING_SHEET_NAME,
+        Variables.CleanedData.POPULATED_ACCOUNTING_SHEET_NAME,
+    ])
+    print('Cleaned data are published to {}'.format(file_path))
 
 
 if __name__ == "__main__":
-    clean_data_run(mode='bloomberg_esg')
+    parser = argparse.ArgumentParser(description='Clean raw data (ETL process).')
+    parser.add_argument('--mode', default='bloomberg_esg', help="data source to be cleaned, see clean_data_run()")
+    parser.add_argument('--jobs', type=int, default=1, help="number of processes for mode 'all'")
+    parser.add_argument('--force', action='store_true', help='re-run even if raw data and code are unchanged')
+    parser.add_argument('--publish', action='store_true', help="export cleaned data to 'cleaned_data.xlsx'")
+    args = parser.parse_args()
+
+    clean_data_run(mode=args.mode, force=args.force, publish=args.publish, jobs=args.jobs)
@@ -0,0 +1,117 @@
+import pandas as pd
+
+"""
+This module provides the encoder of fixed effects (year, industry and country) used in the regressions.
+
+Regression data only stores the fixed effects as single columns: 'INDUSTRY' and 'COUNTRY' as Categoricals,
+'year' as integers (which are also needed to slice sample periods). Dummy columns are only created when
+a model is fitted, for example:
+
+    fixed_effects = FixedEffects(['year', 'INDUSTRY', 'COUNTRY'], reference={'year': 2006})
+    dummies = fixed_effects.design_matrix(data)      # one int8 column per category, except the reference categories
+    fixed_effects.references                        # reference category of each fixed effect of the last design matrix
+"""
+
+
+class FixedEffects:
+    """
+    Encoder of fixed effects into dummy columns.
+
+    :param columns: columns of the fixed effects, e.g. ['year', 'INDUSTRY', 'COUNTRY']
+    :param reference: (optional) reference category of each fixed effect, which gets no dummy column.
+    Fixed effects without explicit reference use their first (i.e. lowest) category observed in the data.
+    :param drop_reference: if False, a dummy column is created for every category (as pd.get_dummies())
+    :param sparse: if True, dummy columns are stored as sparse arrays
+    """
+
+    # fixed effects stored as Categoricals in the regression data
+    CATEGORICAL_COLUMNS = ['INDUSTRY', 'COUNTRY']
+
+    def __init__(self, columns: list, reference: dict = None, drop_reference: bool = True, sparse: bool = False):
+        self.columns = list(columns)
+        self.reference = dict(reference or {})
+        self.drop_reference = drop_reference
+        self.sparse = sparse
+        self.references = {}
+
+    @staticmethod
+    def to_categorical(data: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+        """
+        Returns data with the fixed effects converted to Categoricals with sorted categories
+        (columns that are not in data or already Categoricals are left as they are).
+        """
+        if columns is None:
+            columns = FixedEffects.CATEGORICAL_COLUMNS
+
+        return data.assign(**{
+            column: pd.Categorical(data[column], categories=sorted(data[column].dropna().unique()))
+            for column in columns
+            if column in data.columns and not isinstance(data[column].dtype, pd.CategoricalDtype)
+        })
+
+    def categories(self, data: pd.DataFrame, column: str) -> list:
+        """
+        Returns the sorted categories of a fixed effect that are observed in data.
+        Unobserved categories (e.g. after slicing a sub-sample) are ignored, as they would give constant dummies.
+        """
+        observed = pd.unique(data[column].dropna())
+        if isinstance(data[column].dtype, pd.CategoricalDtype):
+            return [category for category in data[column].cat.categories if category in set(observed)]
+
+        return sorted(observed)
+
+    def design_matrix(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the dummy columns of all fixed effects (columns labelled by category, e.g. 2007, 'Utility', 'FRANCE'),
+        as int8 (or sparse int8) columns aligned on the index of data. Fixed effects that are not in data are skipped.
+        The reference categories used are stored in self.references.
+
+        Dummies are labelled by category only (as in the thesis), therefore a category of two fixed effects
+        (e.g. an industry and a country 'Other') raises a ValueError instead of overwriting the other dummy.
+        """
+        self.references = {}
+        effects = {}
+        frames = []
+        for column in self.columns:
+            if column not in data.columns:
+                continue
+
+            categories = self.categories(data, column)
+            if self.drop_reference and categories:
+                reference = self.reference.get(column, categories[0])
+                if reference not in categories:
+                    raise ValueError('Reference category {!r} of {} is not observed in the data'.format(reference, column))
+                self.references[column] = reference
+                categories = [category for category in categories if category != reference]
+
+            collisions = {category: effects[category] for category in categories if category in effects}
+            if collisions:
+                raise ValueError('Categories of {} are also categories of other fixed effects: {}'.format(
+                    column, collisions))
+            effects.update(dict.fromkeys(categories, column))
+
+            # dummies of each fixed effect are built from its codes (sparse dummies without a dense matrix)
+            frames.append(pd.get_dummies(pd.Categorical(data[column], categories=categories),
+                                         sparse=self.sparse, dtype='int8'))
+
+        if not frames:
+            return pd.DataFrame(index=data.index)
+
+        dummies = pd.concat(frames, axis=1)
+        dummies.index = data.index
+
+        return dummies
+
+    def encode(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns data with the dummy columns of design_matrix() appended.
+        Existing columns with the same labels (e.g. dummies of previously published data) are replaced.
+        """
+        dummies = self.design_matrix(data)
+
+        return pd.concat([data.drop(columns=[column for column in dummies.columns if column in data.columns]), dummies],
+                         axis=1)
+
+
+# all dummy columns of the fixed effects used in the thesis (the regressions choose the dummies to be included)
+ALL_DUMMIES = FixedEffects(['year', 'INDUSTRY', 'COUNTRY'], drop_reference=False)
@@ -1,8 +1,29 @@
 import os
+import re
+import warnings
+import glob
+import json
+import hashlib
+import shutil
+import tempfile
+import threading
+import openpyxl
+import numpy as np
 import pandas as pd
 import datetime
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from functools import partial
 
 from lib.variable_names import Variables
+from lib.fixed_effects import FixedEffects, ALL_DUMMIES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, sheets are then always read from Excel
+    pa = None
+    pq = None
 
 
 """
@@ -14,17 +35,126 @@ class DataRoot:
     """
     Provides relative root paths of the project.
     This helps avoid using absolute paths, which makes the code unusable in another computer.
+
+    The root paths can be overridden for the whole process with DataRoot.configure() (e.g. from the command line).
     """
 
+    ROOT_NAMES = ['raw_data_root', 'cleaned_data_root', 'descriptive_stats_root', 'regression_results_root',
+                  'cache_root']
+    overrides = {}
+
     def __init__(self):
         self.project_root = os.path.dirname(os.path.dirname(__file__))
         self.raw_data_root = os.path.join(self.project_root, 'data', 'raw_data')
         self.cleaned_data_root = os.path.join(self.project_root, 'data', 'cleaned_data')
         self.descriptive_stats_root = os.path.join(self.project_root, 'data', 'descriptive stats')
+        self.regression_results_root = os.path.join(self.project_root, 'data', 'regression_results')
+        self.cache_root = os.path.join(self.project_root, 'data', 'cache')
+
+        for root_name, root in self.overrides.items():
+            setattr(self, root_name, root)
 
         # overall company info (from Bloomberg)
-        self.company_info = pd.read_excel(os.path.join(self.raw_data_root, Variables.BloombergDB.FILES.RAW_DATA_FILE_NAME),
-                                          sheet_name=Variables.BloombergDB.FILES.COMPANY_INFO_SHEET_NAME)
+        self.company_info_file = os.path.join(self.raw_data_root, Variables.BloombergDB.FILES.RAW_DATA_FILE_NAME)
+
+    @classmethod
+    def configure(cls, **roots) -> None:
+        """
+        Override root paths of all instances created afterwards, e.g. DataRoot.configure(raw_data_root='/data/raw').
+        Root paths set to None keep their default value.
+
+        :param roots: root paths by name (see DataRoot.ROOT_NAMES)
+        """
+        unknown = set(roots) - set(cls.ROOT_NAMES)
+        if unknown:
+            raise KeyError('Unknown root paths {}, valid names are: {}'.format(sorted(unknown), cls.ROOT_NAMES))
+
+        cls.overrides.update({root_name: os.path.abspath(root) for root_name, root in roots.items() if root is not None})
+
+    @property
+    def company_info(self) -> pd.DataFrame:
+        """
+        Overall company info (from Bloomberg), which is only read once per process (see ReferenceData).
+        The returned data frame is shared and therefore must not be modified in place.
+        """
+        return ReferenceData.get(self.company_info_file, Variables.BloombergDB.FILES.COMPANY_INFO_SHEET_NAME,
+                                 excel_cache=ExcelCache(self.cache_root))
+
+    def data_store(self, file_name: str, backend: str = None) -> 'DataStore':
+        """
+        Returns the store of a dataset under 'data/cleaned_data' (see DataStore), e.g. of 'cleaned_data.xlsx'.
+        """
+        return DataStore.open(self.cleaned_data_root, file_name, backend=backend)
+
+
+class ReferenceData:
+    """
+    Process-wide, thread-safe registry of reference data (e.g. company info) read from Excel files.
+
+    A sheet is read the first time it is requested and then kept in memory, keyed on the path of its file,
+    the sheet name and the modification time and size of the file. Hence, it is read again when the file changes.
+
+    Data frames can also be registered directly (e.g. an in-memory company table in tests). Registered data
+    are kept until they are invalidated, independently of the file on disk.
+    """
+
+    lock = threading.RLock()
+    registry = {}
+
+    @classmethod
+    def get(cls, file_path: str, sheet_name: str, excel_cache: 'ExcelCache' = None) -> pd.DataFrame:
+        """
+        Returns the data frame of sheet_name in file_path, which is only read if it is not registered yet
+        or if the file has changed since it was read.
+
+        :param file_path: path of the Excel file
+        :param sheet_name: sheet name of file_path
+        :param excel_cache: (optional) Parquet cache used to read the sheet
+        """
+        key = cls.key(file_path, sheet_name)
+        with cls.lock:
+            if key in cls.registry:
+                identity, data = cls.registry[key]
+                if identity is None or identity == cls.file_identity(file_path):
+                    return data
+
+            identity = cls.file_identity(file_path)
+            if excel_cache is not None:
+                data = excel_cache.read_excel(file_path, sheet_name)
+            else:
+                data = pd.read_excel(file_path, sheet_name=sheet_name)
+            cls.registry[key] = (identity, data)
+
+            return data
+
+    @classmethod
+    def register(cls, file_path: str, sheet_name: str, data: pd.DataFrame) -> None:
+        """
+        Register a data frame in place of sheet_name in file_path, until it is invalidated.
+        """
+        with cls.lock:
+            cls.registry[cls.key(file_path, sheet_name)] = (None, data)
+
+    @classmethod
+    def invalidate(cls, file_path: str = None, sheet_name: str = None) -> None:
+        """
+        Remove a sheet from the registry, so that it will be read again on the next request.
+        If no file_path is given, the whole registry is cleared.
+        """
+        with cls.lock:
+            if file_path is None:
+                cls.registry.clear()
+            else:
+                cls.registry.pop(cls.key(file_path, sheet_name), None)
+
+    @staticmethod
+    def key(file_path: str, sheet_name: str) -> tuple:
+        return os.path.abspath(file_path), sheet_name
+
+    @staticmethod
+    def file_identity(file_path: str) -> tuple:
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
 
 
 class SmallFunction:
@@ -32,6 +162,9 @@ class SmallFunction:
     Provides small functions that can be used to clean data.
     """
 
+    # number of months of each period supported by last_observation()
+    PERIOD_MONTHS = {'year': 12, 'half': 6, 'quarter': 3}
+
     @staticmethod
     def generate_series(start_dt: datetime.date, end_dt: datetime.date):
         """
@@ -47,6 +180,474 @@ class SmallFunction:
 
         return series
 
+    @staticmethod
+    def generate_panel(tickers, start_dt: datetime.date, end_dt: datetime.date,
+                       ticker_name: str = Variables.BloombergDB.FIELDS.BB_TICKER) -> pd.DataFrame:
+        """
+        Generates a dataframe having continuous lists of month and year from start_dt to end_dt for each ticker,
+        i.e. the full (ticker x month) grid, ordered by ticker (in order of first appearance) and date.
+
+        :param tickers: list / series of tickers (duplicates are ignored)
+        :param ticker_name: name of the ticker column
+        """
+        series = SmallFunction.generate_series(start_dt=start_dt, end_dt=end_dt)
+        tickers = pd.unique(pd.Series(tickers))
+
+        panel = pd.DataFrame({
+            'month': np.tile(series['month'].values, len(tickers)),
+            'year': np.tile(series['year'].values, len(tickers)),
+            ticker_name: np.repeat(tickers, len(series)),
+        })
+
+        return panel
+
+    @staticmethod
+    def forward_change(data: pd.DataFrame, column: str, group: str = Variables.BloombergDB.FIELDS.BB_TICKER,
+                       sort_by: list = ('year', 'month'), horizon: int = 1, period: str = None) -> pd.Series:
+        """
+        Forward change of a column within each group (e.g. forward credit rating change of each company):
+        value of the observation 'horizon' periods ahead minus the current value.
+
+        If period is None, the horizon counts rows of the group, i.e. the result is the same as
+        .diff(periods=horizon).shift(periods=-horizon) per group (as in the original thesis code),
+        NA for the last 'horizon' observations of each group.
+        If period is the name of a column holding consecutive integer periods (e.g. 12 * year + month),
+        the horizon counts periods: the value at period + horizon of the same group is used,
+        NA if the group has no observation at that period. If a group has several observations at that period,
+        the last of them (ordered by sort_by) is used.
+
+        Duplicate (group, period) rows, or (group, sort_by) rows if period is None, are reported with a warning.
+
+        :param data: data frame with a unique index
+        :param column: column whose change is calculated (e.g. 'ordinal_rating')
+        :param group: name of the group column
+        :param sort_by: columns ordering the observations within each group (e.g. year and month)
+        :param horizon: number of periods ahead (rows of the group if period is None)
+        :param period: name of the integer period column, None to count rows
+        :return: series aligned on the index of data
+        """
+        if horizon < 1:
+            raise ValueError('horizon must be a positive number of periods, got {}'.format(horizon))
+
+        ordered = data.sort_values([group] + list(sort_by), kind='mergesort')
+
+        keys = [group] + (list(sort_by) if period is None else [period])
+        duplicated = ordered.duplicated(keys)
+        if duplicated.any():
+            warnings.warn('{} duplicate {} rows found in {} groups, forward changes of {!r} may be ambiguous'.format(
+                duplicated.sum(), keys, ordered.loc[duplicated, group].nunique(), column))
+
+        if period is None:
+            future = ordered.groupby(group, sort=False)[column].shift(periods=-horizon)
+        else:
+            latest = ordered.drop_duplicates([group, period], keep='last').set_index([group, period])[column]
+            target = pd.MultiIndex.from_arrays([ordered[group], ordered[period] + horizon])
+            future = pd.Series(latest.reindex(target).to_numpy(), index=ordered.index)
+
+        return (future - ordered[column]).reindex(data.index)
+
+    @staticmethod
+    def last_observation(data: pd.DataFrame, order_by: str, group: str = Variables.BloombergDB.FIELDS.BB_TICKER,
+                         period: str = 'year', keep: str = 'all') -> pd.DataFrame:
+        """
+        Last observation of each group in each period (e.g. year-end snapshot of each company),
+        i.e. rows of data where order_by is at its maximum within (group, period).
+
+        Periods are derived from the 'year' and 'month' columns of data. For half-yearly and quarterly periods,
+        a column 'half' (1 - 2) or 'quarter' (1 - 4) is added, which identifies the period together with 'year'.
+
+        :param data: data frame with columns group, 'year' (and 'month' if period is not 'year') and order_by
+        :param order_by: column ordering the observations within a period (e.g. 'month' or 'Dates')
+        :param group: name of the group column
+        :param period: 'year', 'half' or 'quarter'
+        :param keep: 'all' to keep all rows tied at the maximum of order_by, 'last' to keep only the last of them
+        :return: selected rows in their original order
+        """
+        if period not in SmallFunction.PERIOD_MONTHS:
+            raise ValueError('period must be one of {}, got {!r}'.format(list(SmallFunction.PERIOD_MONTHS), period))
+
+        keys = [group, 'year']
+        if period != 'year':
+            data = data.assign(**{period: (data['month'] - 1) // SmallFunction.PERIOD_MONTHS[period] + 1})
+            keys.append(period)
+
+        if keep == 'last':
+            ordered = data.sort_values(keys + [order_by], kind='mergesort')
+            return ordered.groupby(keys, sort=False).tail(1).sort_index()
+
+        latest = data.groupby(keys, sort=False)[order_by].transform('max')
+        return data.loc[data[order_by] == latest]
+
+
+class ExcelCache:
+    """
+    Transparent on-disk cache of Excel sheets, stored as Parquet files under 'data/cache'.
+
+    Parsing Excel files with openpyxl is slow, therefore each sheet is converted to Parquet the first time it is read.
+    A cached sheet is identified by the path of its workbook, the sheet name and the modification time and size
+    of the workbook. Hence, the cache is rebuilt automatically as soon as the workbook changes.
+
+    If pyarrow is not installed or a sheet cannot be converted to Parquet, the sheet is simply read from Excel.
+    """
+
+    COLUMNS_METADATA_KEY = b'excel_cache_columns'
+
+    def __init__(self, cache_root: str):
+        self.cache_root = cache_root
+
+    def read_excel(self, file_path: str, sheet_name: str) -> pd.DataFrame:
+        """
+        Returns the same data frame as pd.read_excel(file_path, sheet_name=sheet_name),
+        from the Parquet cache whenever the workbook has not changed since it was cached.
+
+        :param file_path: path of the Excel file
+        :param sheet_name: sheet name of file_path that will be read
+        """
+        return self.read_sheets(file_path, [sheet_name])[sheet_name]
+
+    def read_sheets(self, file_path: str, sheet_names: list) -> dict:
+        """
+        Returns a dictionary of data frames (one per sheet name) as pd.read_excel(file_path, sheet_name=sheet_names).
+        Sheets that are not cached yet are parsed together, so that the workbook is only opened once.
+
+        :param file_path: path of the Excel file
+        :param sheet_names: list of sheet names of file_path that will be read
+        """
+        if pa is None:
+            return pd.read_excel(file_path, sheet_name=list(sheet_names))
+
+        sheets = {}
+        for sheet_name in sheet_names:
+            cache_file = self.cache_file(file_path, sheet_name)
+            if os.path.isfile(cache_file):
+                sheets[sheet_name] = self.read_parquet(cache_file)
+
+        missing_sheets = [sheet_name for sheet_name in sheet_names if sheet_name not in sheets]
+        if missing_sheets:
+            parsed_sheets = pd.read_excel(file_path, sheet_name=missing_sheets)
+            for sheet_name in missing_sheets:
+                self.write_parquet(parsed_sheets[sheet_name], file_path, sheet_name)
+                sheets[sheet_name] = parsed_sheets[sheet_name]
+
+        return {sheet_name: sheets[sheet_name] for sheet_name in sheet_names}
+
+    def cache_file(self, file_path: str, sheet_name: str) -> str:
+        """
+        Returns the path of the cached sheet, e.g. 'data/cache/cleaned_data_<directory>__esg_bb__<fingerprint>.parquet'.
+        The fingerprint changes whenever the path, modification time or size of the workbook changes.
+        """
+        stat = os.stat(file_path)
+        identity = '|'.join([os.path.abspath(file_path), str(sheet_name), str(stat.st_mtime_ns), str(stat.st_size)])
+        fingerprint = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+        return os.path.join(self.cache_root, '{}__{}.parquet'.format(self.cache_prefix(file_path, sheet_name), fingerprint))
+
+    @staticmethod
+    def cache_prefix(file_path: str, sheet_name: str) -> str:
+        """
+        Returns the part of the cached file name that does not depend on the state of the workbook.
+        It includes a short hash of the directory of the workbook, so that workbooks with the same name
+        in different directories (e.g. with DataRoot.configure()) do not evict each other's cached sheets.
+        """
+        file_stem = os.path.splitext(os.path.basename(file_path))[0]
+        directory = hashlib.sha1(os.path.abspath(os.path.dirname(file_path)).encode('utf-8')).hexdigest()[:8]
+        return re.sub(r'[^\w\-]', '_', '{}_{}__{}'.format(file_stem, directory, sheet_name))
+
+    @classmethod
+    def read_parquet(cls, cache_file: str) -> pd.DataFrame:
+        """
+        Read a cached sheet and restore its original column labels
+        (Parquet only supports string column names, e.g. year dummies 2007, 2008, ... are integers).
+        """
+        table = pq.read_table(cache_file)
+        data = table.to_pandas()
+        data.columns = json.loads(table.schema.metadata[cls.COLUMNS_METADATA_KEY])
+
+        return data
+
+    @classmethod
+    def to_table(cls, data: pd.DataFrame) -> 'pa.Table':
+        """
+        Convert a data frame to an Arrow table, keeping its original column labels in the schema metadata.
+        """
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[cls.COLUMNS_METADATA_KEY] = json.dumps(list(data.columns)).encode('utf-8')
+
+        return table.replace_schema_metadata(metadata)
+
+    def write_parquet(self, data: pd.DataFrame, file_path: str, sheet_name: str) -> None:
+        """
+        Write a sheet to the cache and remove outdated cached versions of the same sheet.
+        The file is first written to a temporary file and then renamed, so that a broken cache file is never read.
+
+        Several processes may write the same sheet at once (e.g. company_info read by ETL stages running in a
+        process pool): each of them writes its own temporary file, and files already removed or replaced by
+        another process are ignored.
+        """
+        try:
+            table = self.to_table(data)
+        except (pa.ArrowException, TypeError, ValueError):  # e.g. mixed types in a column -> do not cache
+            return
+
+        os.makedirs(self.cache_root, exist_ok=True)
+        prefix = self.cache_prefix(file_path, sheet_name)
+        cache_file = self.cache_file(file_path, sheet_name)
+        for outdated_file in glob.glob(os.path.join(self.cache_root, glob.escape(prefix) + '__*.parquet')):
+            if outdated_file == cache_file:
+                continue
+            try:
+                os.remove(outdated_file)
+            except FileNotFoundError:  # already removed by another process
+                pass
+
+        fd, temp_file = tempfile.mkstemp(dir=self.cache_root, prefix=prefix + '.', suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, temp_file)
+            os.replace(temp_file, cache_file)
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+class DataStore(ABC):
+    """
+    Storage backend of a dataset made of several named tables, e.g. the cleaned data (one table per sheet name
+    in Variables.CleanedData) or the regression data of each hypothesis.
+
+    Writing a table always replaces the previous version of the table as a whole (atomic overwrite),
+    i.e. a table is never duplicated or left half-written when a stage is re-run.
+
+    Backends are registered by name (see DataStore.register()) and implement exists(), read_sheets() and write():
+        - 'parquet' (default if pyarrow is installed): a directory with one Parquet file per table
+        - 'excel': a single Excel file with one sheet per table (as in the original thesis code)
+
+    Independently of the backend, the tables can be exported to a single Excel file with publish().
+    """
+
+    backends = {}
+
+    def __init__(self, root: str, name: str):
+        self.root = root
+        self.name = name
+
+    @classmethod
+    def register(cls, backend_name: str):
+        """
+        Class decorator registering a storage backend under backend_name.
+        """
+        def decorator(backend):
+            cls.backends[backend_name] = backend
+            return backend
+        return decorator
+
+    @classmethod
+    def open(cls, root: str, file_name: str, backend: str = None) -> 'DataStore':
+        """
+        Returns the store of a dataset.
+
+        :param root: directory of the dataset (e.g. 'data/cleaned_data')
+        :param file_name: name of the (published) Excel file of the dataset, e.g. 'cleaned_data.xlsx'
+        :param backend: name of a registered backend, by default 'parquet' if pyarrow is installed, else 'excel'
+        """
+        if backend is None:
+            backend = 'parquet' if pq is not None else 'excel'
+        if backend not in cls.backends:
+            raise KeyError('Unknown data store backend {!r}, registered backends are: {}'.format(
+                backend, list(cls.backends)))
+
+        return cls.backends[backend](root, os.path.splitext(file_name)[0])
+
+    @abstractmethod
+    def exists(self, sheet_name: str) -> bool:
+        """
+        Returns True if the table is stored.
+        """
+
+    @abstractmethod
+    def read_sheets(self, sheet_names: list) -> dict:
+        """
+        Returns the tables (sheet name -> data frame) read in one pass.
+        """
+
+    @abstractmethod
+    def write(self, data: pd.DataFrame, sheet_name: str) -> None:
+        """
+        Replaces the stored table with data (atomic overwrite).
+        """
+
+    def read(self, sheet_name: str) -> pd.DataFrame:
+        return self.read_sheets([sheet_name])[sheet_name]
+
+    def publish(self, sheet_names: list, file_path: str = None) -> str:
+        """
+        Export tables to a single Excel file in one pass, e.g. 'data/cleaned_data/cleaned_data.xlsx'.
+        Other sheets of an existing file (e.g. 'company_info') are kept.
+
+        :param sheet_names: tables to be exported (in this order)
+        :param file_path: path of the Excel file, by default '<root>/<name>.xlsx'
+        :return: path of the Excel file
+        """
+        if file_path is None:
+            file_path = os.path.join(self.root, self.name + '.xlsx')
+
+        sheets = self.read_sheets(sheet_names)
+        self.write_excel(file_path, {sheet_name: sheets[sheet_name] for sheet_name in sheet_names})
+
+        return file_path
+
+    @staticmethod
+    def write_excel(file_path: str, sheets: dict) -> None:
+        """
+        Write data frames (sheet name -> data frame) to an Excel file in one pass. Existing sheets with the same name
+        are replaced, other sheets of the file are kept. The workbook is modified in a copy, which then replaces
+        the original file, so that the file is never left half-written.
+        """
+        temp_file = os.path.splitext(file_path)[0] + '.tmp.xlsx'
+
+        if os.path.isfile(file_path):
+            shutil.copyfile(file_path, temp_file)
+            with pd.ExcelWriter(temp_file, engine='openpyxl', mode='a') as writer:
+                for sheet_name, data in sheets.items():
+                    if sheet_name in writer.book.sheetnames:  # replace instead of adding a sheet 'esg_bb1'
+                        writer.book.remove(writer.book[sheet_name])
+                    data.to_excel(writer, sheet_name=sheet_name, index=False)
+
+        else:
+            with pd.ExcelWriter(temp_file, engine='openpyxl') as writer:
+                for sheet_name, data in sheets.items():
+                    data.to_excel(writer, sheet_name=sheet_name, index=False)
+
+        os.replace(temp_file, file_path)
+
+
+@DataStore.register('parquet')
+class ParquetStore(DataStore):
+    """
+    Dataset stored as a directory of Parquet files, one per table, e.g. 'data/cleaned_data/cleaned_data/esg_bb.parquet'.
+    Data types (e.g. dates, int8 ratings) and column labels are kept as they are.
+    """
+
+    def __init__(self, root: str, name: str):
+        super().__init__(root, name)
+        self.directory = os.path.join(root, name)
+
+    def file_path(self, sheet_name: str) -> str:
+        return os.path.join(self.directory, '{}.parquet'.format(sheet_name))
+
+    def exists(self, sheet_name):
+        return os.path.isfile(self.file_path(sheet_name))
+
+    def read_sheets(self, sheet_names):
+        return {sheet_name: ExcelCache.read_parquet(self.file_path(sheet_name)) for sheet_name in sheet_names}
+
+    def write(self, data, sheet_name):
+        table = ExcelCache.to_table(data)
+
+        os.makedirs(self.directory, exist_ok=True)
+        temp_file = self.file_path(sheet_name) + '.tmp'
+        pq.write_table(table, temp_file)
+        os.replace(temp_file, self.file_path(sheet_name))
+
+
+@DataStore.register('excel')
+class ExcelStore(DataStore):
+    """
+    Dataset stored as a single Excel file with one sheet per table, e.g. 'data/cleaned_data/cleaned_data.xlsx'.
+    """
+
+    def __init__(self, root: str, name: str):
+        super().__init__(root, name)
+        self.file = os.path.join(root, name + '.xlsx')
+        self.excel_cache = ExcelCache(DataRoot().cache_root)
+
+    def exists(self, sheet_name):
+        if not os.path.isfile(self.file):
+            return False
+
+        workbook = openpyxl.load_workbook(self.file, read_only=True)
+        try:
+            return sheet_name in workbook.sheetnames
+        finally:
+            workbook.close()
+
+    def read_sheets(self, sheet_names):
+        return self.excel_cache.read_sheets(self.file, sheet_names)
+
+    def write(self, data, sheet_name):
+        self.write_excel(self.file, {sheet_name: data})
+
+
+class WorkbookSession:
+    """
+    Hands out sheets of a single Excel file, while parsing the file only once.
+
+    All sheets that are needed should be requested upfront with load(), which reads them in one pass
+    (through the Parquet cache if one is given). Afterwards, get() simply returns the loaded sheets.
+    Sheets that are requested with get() without being loaded before are read on demand.
+
+    If a data store is given, sheets are read from the store and only sheets that are not in the store
+    are read from the (published) Excel file.
+    """
+
+    def __init__(self, file_path: str, excel_cache: ExcelCache = None, store: DataStore = None):
+        self.file_path = file_path
+        self.excel_cache = excel_cache
+        self.store = store
+        self.sheets = {}
+
+    def load(self, sheet_names: list) -> None:
+        """
+        Read all sheets in sheet_names that are not loaded yet in one pass.
+        """
+        missing_sheets = [sheet_name for sheet_name in sheet_names if sheet_name not in self.sheets]
+
+        if self.store is not None and missing_sheets:
+            self.sheets.update(self.store.read_sheets([s for s in missing_sheets if self.store.exists(s)]))
+            missing_sheets = [sheet_name for sheet_name in missing_sheets if sheet_name not in self.sheets]
+
+        if not missing_sheets:
+            return
+
+        if self.excel_cache is not None:
+            self.sheets.update(self.excel_cache.read_sheets(self.file_path, missing_sheets))
+        else:
+            self.sheets.update(pd.read_excel(self.file_path, sheet_name=missing_sheets))
+
+    def get(self, sheet_name: str) -> pd.DataFrame:
+        """
+        Returns the data frame of sheet_name.
+        """
+        self.load([sheet_name])
+        return self.sheets[sheet_name]
+
+
+class LazyDataDict(Mapping):
+    """
+    Read-only dictionary whose values are only computed on first access and then memoized.
+
+    :param loaders: dictionary mapping each key to a function (without arguments) that returns its value
+    """
+
+    def __init__(self, loaders: dict):
+        self.loaders = loaders
+        self.data = {}
+
+    def __getitem__(self, key):
+        if key not in self.data:
+            self.data[key] = self.loaders[key]()
+        return self.data[key]
+
+    def __contains__(self, key):
+        return key in self.loaders  # do not load the value only to check the key
+
+    def __iter__(self):
+        return iter(self.loaders)
+
+    def __len__(self):
+        return len(self.loaders)
+
 
 class ExtractData(DataRoot):
     """
@@ -58,6 +659,15 @@ class ExtractData(DataRoot):
         self.cleaned_file_name = Variables.CleanedData.FILE_NAME
         self.h1_file_name = Variables.RegressionData.FILES.H1_FILE_NAME
         self.h2_file_name = Variables.RegressionData.FILES.H2_FILE_NAME
+        self.excel_cache = ExcelCache(self.cache_root)
+
+    def session(self, file_name: str) -> WorkbookSession:
+        """
+        Returns a session reading the sheets of a dataset under 'data/cleaned_data' from its data store,
+        or from its published Excel file if they are not in the store.
+        """
+        return WorkbookSession(os.path.join(self.cleaned_data_root, file_name), self.excel_cache,
+                               store=self.data_store(file_name))
 
     def extract_cleaned_data(self):
         """
@@ -70,8 +680,16 @@ class ExtractData(DataRoot):
             - 'populated_sp': populated S&P credit ratings
             - 'control_var': populated control variables
         """
-        esg_bb = pd.read_excel(os.path.join(self.cleaned_data_root, self.cleaned_file_name),
-                               sheet_name=Variables.CleanedData.BLOOMBERG_ESG_SHEET_NAME)
+        # read all required sheets of the cleaned data in one pass
+        cleaned_data = self.session(self.cleaned_file_name)
+        cleaned_data.load([
+            Variables.CleanedData.BLOOMBERG_ESG_SHEET_NAME,
+            Variables.CleanedData.REFINITIV_ESG_SHEET_NAME,
+            Variables.CleanedData.POPULATED_SP_CREDIT_RTG_SHEET_NAME,
+            Variables.CleanedData.POPULATED_ACCOUNTING_SHEET_NAME,
+        ])
+
+        esg_bb = cleaned_data.get(Variables.CleanedData.BLOOMBERG_ESG_SHEET_NAME)
 
         # get data of Sustainalytics ESG ratings
         sustainalytics = esg_bb.loc[esg_bb[Variables.SustainalyticsESG.TOTAL].notnull()]
@@ -92,16 +710,13 @@ class ExtractData(DataRoot):
         ])
 
         # get data of Refinitiv ESG ratings
-        refinitiv = pd.read_excel(os.path.join(self.cleaned_data_root, self.cleaned_file_name),
-                                  sheet_name=Variables.CleanedData.REFINITIV_ESG_SHEET_NAME)
+        refinitiv = cleaned_data.get(Variables.CleanedData.REFINITIV_ESG_SHEET_NAME)
 
         # get data of populated S&P credit ratings
-        populated_sp = pd.read_excel(os.path.join(self.cleaned_data_root, self.cleaned_file_name),
-                                     sheet_name=Variables.CleanedData.POPULATED_SP_CREDIT_RTG_SHEET_NAME)
+        populated_sp = cleaned_data.get(Variables.CleanedData.POPULATED_SP_CREDIT_RTG_SHEET_NAME)
 
         # get data of populated control variables
-        control_var = pd.read_excel(os.path.join(self.cleaned_data_root, self.cleaned_file_name),
-                                    sheet_name=Variables.CleanedData.POPULATED_ACCOUNTING_SHEET_NAME)
+        control_var = cleaned_data.get(Variables.CleanedData.POPULATED_ACCOUNTING_SHEET_NAME)
 
         return {'spglobal': spglobal,
                 'sustainalytics': sustainalytics,
@@ -109,65 +724,104 @@ class ExtractData(DataRoot):
                 'populated_sp': populated_sp,
                 'control_var': control_var}
 
-    def extract_regression_data(self):
-        """
-        Returns a dictionary contain regression data for each hypothesis.
-        Executing this function can result in long waiting time due to many large data frames.
-        """
-
-        # hypothesis 1 - Refinitiv dataset
-        h1_refinitiv = pd.read_excel(os.path.join(self.cleaned_data_root, self.h1_file_name),
-                                     sheet_name=Variables.RegressionData.FILES.H1_REFINITIV_SHEET_NAME)
-        h1_refinitiv.rename(columns={
-            Variables.RefinitivESG.TOTAL: Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-            Variables.RefinitivESG.ENV: Variables.RegressionData.IndependentVar.H1_ESG_ENV,
-            Variables.RefinitivESG.SOCIAL: Variables.RegressionData.IndependentVar.H1_ESG_SOC,
-            Variables.RefinitivESG.GOV: Variables.RegressionData.IndependentVar.H1_ESG_GOV,
-            'ordinal_rating': Variables.RegressionData.DependentVar.H1_CREDIT_RTG
-        }, inplace=True)
-
-        # hypothesis 1 - S&P Global data
-        h1_spglobal = pd.read_excel(os.path.join(self.cleaned_data_root, self.h1_file_name),
-                                    sheet_name=Variables.RegressionData.FILES.H1_SPGLOBAL_SHEET_NAME)
-        h1_spglobal.rename(columns={
-            Variables.SPGlobalESG.TOTAL: Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-            Variables.SPGlobalESG.ENV: Variables.RegressionData.IndependentVar.H1_ESG_ENV,
-            Variables.SPGlobalESG.SOCIAL: Variables.RegressionData.IndependentVar.H1_ESG_SOC,
-            Variables.SPGlobalESG.ECON: Variables.RegressionData.IndependentVar.H1_ESG_GOV,
-            'ordinal_rating': Variables.RegressionData.DependentVar.H1_CREDIT_RTG
-        }, inplace=True)
-
-        # hypothesis 1 - Sustainalytics data
-        h1_sustainalytics = pd.read_excel(os.path.join(self.cleaned_data_root, self.h1_file_name),
-                                          sheet_name=Variables.RegressionData.FILES.H1_SUSTAINALYTICS_SHEET_NAME)
-        h1_sustainalytics.rename(columns={
-            Variables.SustainalyticsESG.TOTAL: Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-            Variables.SustainalyticsESG.ENV: Variables.RegressionData.IndependentVar.H1_ESG_ENV,
-            Variables.SustainalyticsESG.SOCIAL: Variables.RegressionData.IndependentVar.H1_ESG_SOC,
-            Variables.SustainalyticsESG.GOV: Variables.RegressionData.IndependentVar.H1_ESG_GOV,
-            'ordinal_rating': Variables.RegressionData.DependentVar.H1_CREDIT_RTG
-        }, inplace=True)
-
-        # hypothesis 2 - monthly data
-        h2_monthly = pd.read_excel(os.path.join(self.cleaned_data_root, self.h2_file_name),
-                                   sheet_name=Variables.RegressionData.FILES.H2_MONTHLY_DATA_SHEET_NAME)
-
-        # hypothesis 2 - yearly data
-        h2_yearly = pd.read_excel(os.path.join(self.cleaned_data_root, self.h2_file_name),
-                                  sheet_name=Variables.RegressionData.FILES.H2_YEARLY_DATA_SHEET_NAME)
-
-        # hypothesis 2 - main data
-        h2_main = pd.read_excel(os.path.join(self.cleaned_data_root, self.h2_file_name),
-                                sheet_name=Variables.RegressionData.FILES.H2_MAIN_DATA_SHEET_NAME)
-
-        return {
-            'h1_refinitiv': h1_refinitiv,
-            'h1_spglobal': h1_spglobal,
-            'h1_sustainalytics': h1_sustainalytics,
-            'h2_monthly': h2_monthly,
-            'h2_yearly': h2_yearly,
-            'h2_main': h2_main,
-        }
+    def extract_regression_data(self, preload: bool = False, fixed_effects: bool = False) -> LazyDataDict:
+        """
+        Returns a dictionary contain regression data for each hypothesis. The dictionary has the following keys:
+
+            - 'h1_refinitiv': hypothesis 1 - Refinitiv dataset
+            - 'h1_spglobal': hypothesis 1 - S&P Global dataset
+            - 'h1_sustainalytics': hypothesis 1 - Sustainalytics dataset
+            - 'h2_monthly': hypothesis 2 - monthly dataset
+            - 'h2_yearly': hypothesis 2 - yearly dataset
+            - 'h2_main': hypothesis 2 - main dataset
+
+        Reading all datasets can result in long waiting time due to many large data frames,
+        therefore a dataset is only read (and its columns renamed) when it is accessed for the first time.
+
+        :param preload: if True, all sheets of each regression data file are read upfront in one pass
+        (useful when all datasets are needed anyway, e.g. for descriptive statistics).
+        :param fixed_effects: if True, int8 dummy columns of all years, industries and countries are appended
+        to each dataset when it is read (the regressions choose the dummies to be included).
+        """
+        h1_data = self.session(self.h1_file_name)
+        h2_data = self.session(self.h2_file_name)
+
+        if preload:
+            h1_data.load([
+                Variables.RegressionData.FILES.H1_REFINITIV_SHEET_NAME,
+                Variables.RegressionData.FILES.H1_SPGLOBAL_SHEET_NAME,
+                Variables.RegressionData.FILES.H1_SUSTAINALYTICS_SHEET_NAME,
+            ])
+            h2_data.load([
+                Variables.RegressionData.FILES.H2_MONTHLY_DATA_SHEET_NAME,
+                Variables.RegressionData.FILES.H2_YEARLY_DATA_SHEET_NAME,
+                Variables.RegressionData.FILES.H2_MAIN_DATA_SHEET_NAME,
+            ])
+
+        return LazyDataDict({
+
+            # hypothesis 1 - Refinitiv dataset
+            'h1_refinitiv': partial(self.read_regression_data, h1_data,
+                                    Variables.RegressionData.FILES.H1_REFINITIV_SHEET_NAME, fixed_effects, {
+                                        Variables.RefinitivESG.TOTAL: Variables.RegressionData.IndependentVar.H1_ESG_RTG,
+                                        Variables.RefinitivESG.ENV: Variables.RegressionData.IndependentVar.H1_ESG_ENV,
+                                        Variables.RefinitivESG.SOCIAL: Variables.RegressionData.IndependentVar.H1_ESG_SOC,
+                                        Variables.RefinitivESG.GOV: Variables.RegressionData.IndependentVar.H1_ESG_GOV,
+                                        'ordinal_rating': Variables.RegressionData.DependentVar.H1_CREDIT_RTG
+                                    }),
+
+            # hypothesis 1 - S&P Global data
+            'h1_spglobal': partial(self.read_regression_data, h1_data,
+                                   Variables.RegressionData.FILES.H1_SPGLOBAL_SHEET_NAME, fixed_effects, {
+                                       Variables.SPGlobalESG.TOTAL: Variables.RegressionData.IndependentVar.H1_ESG_RTG,
+                                       Variables.SPGlobalESG.ENV: Variables.RegressionData.IndependentVar.H1_ESG_ENV,
+                                       Variables.SPGlobalESG.SOCIAL: Variables.RegressionData.IndependentVar.H1_ESG_SOC,
+                                       Variables.SPGlobalESG.ECON: Variables.RegressionData.IndependentVar.H1_ESG_GOV,
+                                       'ordinal_rating': Variables.RegressionData.DependentVar.H1_CREDIT_RTG
+                                   }),
+
+            # hypothesis 1 - Sustainalytics data
+            'h1_sustainalytics': partial(self.read_regression_data, h1_data,
+                                         Variables.RegressionData.FILES.H1_SUSTAINALYTICS_SHEET_NAME, fixed_effects, {
+                                             Variables.SustainalyticsESG.TOTAL: Variables.RegressionData.IndependentVar.H1_ESG_RTG,
+                                             Variables.SustainalyticsESG.ENV: Variables.RegressionData.IndependentVar.H1_ESG_ENV,
+                                             Variables.SustainalyticsESG.SOCIAL: Variables.RegressionData.IndependentVar.H1_ESG_SOC,
+                                             Variables.SustainalyticsESG.GOV: Variables.RegressionData.IndependentVar.H1_ESG_GOV,
+                                             'ordinal_rating': Variables.RegressionData.DependentVar.H1_CREDIT_RTG
+                                         }),
+
+            # hypothesis 2 - monthly data
+            'h2_monthly': partial(self.read_regression_data, h2_data,
+                                  Variables.RegressionData.FILES.H2_MONTHLY_DATA_SHEET_NAME, fixed_effects),
+
+            # hypothesis 2 - yearly data
+            'h2_yearly': partial(self.read_regression_data, h2_data,
+                                 Variables.RegressionData.FILES.H2_YEARLY_DATA_SHEET_NAME, fixed_effects),
+
+            # hypothesis 2 - main data
+            'h2_main': partial(self.read_regression_data, h2_data,
+                               Variables.RegressionData.FILES.H2_MAIN_DATA_SHEET_NAME, fixed_effects),
+        })
+
+    @staticmethod
+    def read_regression_data(session: WorkbookSession, sheet_name: str, fixed_effects: bool = False,
+                             columns: dict = None) -> pd.DataFrame:
+        """
+        Read a regression dataset and rename its columns to the names used in the regression.
+        Industry and country are returned as categoricals (they are stored as text in published Excel files).
+
+        :param session: workbook session of the regression data file
+        :param sheet_name: sheet name of the dataset
+        :param fixed_effects: if True, dummy columns of all years, industries and countries are appended
+        :param columns: mapping of old to new column names (if any)
+        """
+        data = FixedEffects.to_categorical(session.get(sheet_name))
+        if columns:
+            data = data.rename(columns=columns)
+        if fixed_effects:
+            data = ALL_DUMMIES.encode(data)
+
+        return data
 
 
 if __name__ == "__main__":
@@ -0,0 +1,273 @@
+import numpy as np
+import pandas as pd
+from scipy import optimize, stats
+from scipy.special import expit
+
+"""
+This module provides a dedicated estimator of the ordered logistic regression (ordered logit):
+
+    P(y = k | x) = F(c_k - x'b) - F(c_(k-1) - x'b),   F(z) = 1 / (1 + exp(-z)),   c_(-1) = -inf, c_(K-1) = inf
+
+The parameters are the same as in OrderedModel of statsmodels: coefficients b, then the first threshold c_0 and the
+logarithms of the increments of the following thresholds (log(c_k - c_(k-1))), so that the thresholds are always
+increasing and results (and start parameters) of both estimators can be exchanged.
+
+Log-likelihood, gradient and Hessian are calculated analytically for all observations at once, the maximum is found
+with a trust-region Newton method of scipy, which typically needs 10 - 30 iterations instead of a few hundred BFGS
+iterations. For example:
+
+    result = OrderedLogit(endog, exog).fit(method='trust-exact')
+    print(result.summary())
+    result.params, result.bse, result.pvalues, result.prsquared
+"""
+
+
+class OrderedLogit:
+    """
+    Ordered logistic regression of endog on exog.
+
+    :param endog: ordered categorical dependent variable (e.g. CREDIT_RTG converted with CategoricalDtype(ordered=True))
+    :param exog: regressors (without constant, which is not identified together with the thresholds)
+    """
+
+    # trust-region (Newton) methods of scipy.optimize.minimize using the analytic Hessian
+    METHODS = ('trust-exact', 'trust-ncg', 'newton-cg')
+
+    def __init__(self, endog: pd.Series, exog: pd.DataFrame):
+        if not isinstance(endog.dtype, pd.CategoricalDtype) or not endog.cat.ordered:
+            raise ValueError('endog must be an ordered categorical variable')
+
+        self.endog_name = endog.name
+        self.labels = list(endog.cat.categories)
+        self.codes = np.asarray(endog.cat.codes, dtype=np.int64)
+        if (self.codes < 0).any():
+            raise ValueError('endog must not contain NA values')
+
+        self.exog = np.asarray(exog, dtype=float)
+        self.nobs, self.k_vars = self.exog.shape
+        self.k_levels = len(self.labels)
+        self.exog_names = [str(column) for column in exog.columns] + [
+            '{}/{}'.format(lower, upper) for lower, upper in zip(self.labels[:-1], self.labels[1:])]
+
+        # indicators of the upper (k) and lower (k - 1) threshold of the category of each observation
+        thresholds = np.arange(self.k_levels - 1)
+        self.upper = (self.codes[:, None] == thresholds[None, :]).astype(float)
+        self.lower = (self.codes[:, None] - 1 == thresholds[None, :]).astype(float)
+
+    @property
+    def start_params(self) -> np.ndarray:
+        """
+        Start parameters of the model without regressors (as in statsmodels): coefficients 0 and
+        thresholds of the observed frequencies of the categories.
+        """
+        frequencies = np.bincount(self.codes, minlength=self.k_levels) / self.nobs
+        cutoffs = stats.logistic.ppf(np.clip(frequencies.cumsum(), 0, 1))
+
+        return np.concatenate([np.zeros(self.k_vars), self.transform_reverse_threshold_params(cutoffs)])
+
+    def transform_threshold_params(self, params: np.ndarray) -> np.ndarray:
+        """
+        Returns the thresholds (with -inf and inf at both ends) of the parameters.
+        """
+        increments = params[self.k_vars:]
+        cutoffs = np.concatenate([increments[:1], np.exp(increments[1:])]).cumsum()
+
+        return np.concatenate([[-np.inf], cutoffs, [np.inf]])
+
+    @staticmethod
+    def transform_reverse_threshold_params(cutoffs: np.ndarray) -> np.ndarray:
+        """
+        Returns the threshold parameters (first threshold and log increments) of increasing thresholds
+        (the last element, i.e. inf, is ignored as in statsmodels).
+        """
+        return np.concatenate([cutoffs[:1], np.log(np.diff(cutoffs[:-1]))])
+
+    def derivatives(self, params: np.ndarray, order: int = 2) -> tuple:
+        """
+        Returns the log-likelihood and (for order >= 1) its gradient and (for order 2) its Hessian.
+        """
+        params = np.asarray(params, dtype=float)
+        cutoffs = self.transform_threshold_params(params)
+        linear = self.exog @ params[:self.k_vars]
+
+        # P = F(upper) - F(lower) = F(upper) * (1 - F(lower)) * (1 - exp(lower - upper)), calculated with logarithms
+        # so that probabilities far in the tails do not underflow (log F(z) = -log(1 + exp(-z)))
+        upper = cutoffs[self.codes + 1] - linear
+        lower = cutoffs[self.codes] - linear
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            spread = np.maximum(-np.expm1(lower - upper), 1e-300)
+            loglike = (-np.logaddexp(0, -upper) - np.logaddexp(0, lower) + np.log(spread)).sum()
+        if order == 0:
+            return loglike,
+
+        # first derivatives of log(P) with respect to the upper and lower bound (0 at infinite bounds):
+        # F'(upper) / P and -F'(lower) / P with F' = F * (1 - F)
+        with np.errstate(over='ignore', invalid='ignore'):
+            d_upper = np.exp(np.logaddexp(0, lower) - np.logaddexp(0, upper)) / spread
+            d_lower = -np.exp(np.logaddexp(0, -upper) - np.logaddexp(0, -lower)) / spread
+        cdf_upper, cdf_lower = expit(upper), expit(lower)
+
+        # gradient with respect to coefficients and thresholds, then chain rule for the log increments
+        jacobian = self.threshold_jacobian(params)
+        grad_thresholds = self.upper.T @ d_upper + self.lower.T @ d_lower
+        gradient = np.concatenate([-self.exog.T @ (d_upper + d_lower), jacobian.T @ grad_thresholds])
+        if order == 1:
+            return loglike, gradient
+
+        # second derivatives of log(P) (F'' = F' * (1 - 2 * F))
+        d_upper_upper = d_upper * (1 - 2 * cdf_upper) - d_upper ** 2
+        d_lower_lower = d_lower * (1 - 2 * cdf_lower) - d_lower ** 2
+        d_upper_lower = -d_upper * d_lower
+
+        hess_coefficients = (self.exog * (d_upper_upper + 2 * d_upper_lower + d_lower_lower)[:, None]).T @ self.exog
+        hess_cross = -(self.exog.T @ (self.upper * (d_upper_upper + d_upper_lower)[:, None]
+                                      + self.lower * (d_upper_lower + d_lower_lower)[:, None]))
+        hess_thresholds = np.diag(self.upper.T @ d_upper_upper + self.lower.T @ d_lower_lower)
+        off_diagonal = self.upper[:, 1:].T @ d_upper_lower
+        hess_thresholds[np.arange(1, self.k_levels - 1), np.arange(self.k_levels - 2)] = off_diagonal
+        hess_thresholds[np.arange(self.k_levels - 2), np.arange(1, self.k_levels - 1)] = off_diagonal
+
+        # c_j depends on exp(t_m) for 1 <= m <= j: second derivative of the transformation on the diagonal
+        hess_increments = jacobian.T @ hess_thresholds @ jacobian
+        increments = np.exp(params[self.k_vars + 1:])
+        hess_increments[np.arange(1, self.k_levels - 1), np.arange(1, self.k_levels - 1)] += \
+            increments * grad_thresholds[::-1].cumsum()[::-1][1:]
+
+        hess_cross = hess_cross @ jacobian
+        hessian = np.block([[hess_coefficients, hess_cross], [hess_cross.T, hess_increments]])
+
+        return loglike, gradient, hessian
+
+    def threshold_jacobian(self, params: np.ndarray) -> np.ndarray:
+        """
+        Returns the derivatives of the thresholds (rows) with respect to the threshold parameters (columns).
+        """
+        k = self.k_levels - 1
+        scale = np.concatenate([[1.0], np.exp(params[self.k_vars + 1:])])
+
+        return np.tril(np.ones((k, k))) * scale[None, :]
+
+    def loglike(self, params: np.ndarray) -> float:
+        return self.derivatives(params, order=0)[0]
+
+    def score(self, params: np.ndarray) -> np.ndarray:
+        return self.derivatives(params, order=1)[1]
+
+    def hessian(self, params: np.ndarray) -> np.ndarray:
+        return self.derivatives(params, order=2)[2]
+
+    def loglike_null(self) -> float:
+        """
+        Returns the log-likelihood of the model without regressors (thresholds of the observed frequencies).
+        """
+        counts = np.bincount(self.codes, minlength=self.k_levels)
+        counts = counts[counts > 0]
+
+        return float((counts * np.log(counts / self.nobs)).sum())
+
+    def fit(self, start_params: np.ndarray = None, method: str = 'trust-exact', maxiter: int = 100,
+            gtol: float = 1e-6) -> 'OrderedLogitResults':
+        """
+        Maximize the log-likelihood with a trust-region Newton method.
+
+        :param start_params: (optional) start parameters, by default the model without regressors
+        :param method: one of OrderedLogit.METHODS
+        :param maxiter: maximum number of iterations
+        :param gtol: convergence threshold of the norm of the gradient of the mean log-likelihood.
+        The fit is also converged if the solver stops at a point satisfying it (e.g. the log-likelihood cannot be
+        improved any more within the floating point precision).
+        """
+        if method not in self.METHODS:
+            raise ValueError('method must be one of {}, got {!r}'.format(self.METHODS, method))
+
+        cache = {}
+
+        def evaluate(params):
+            # log-likelihood, gradient and Hessian are calculated once per point,
+            # a trial step with overflowing thresholds is rejected by the solver (log-likelihood -inf)
+            key = np.asarray(params).tobytes()
+            if key not in cache:
+                cache.clear()
+                with np.errstate(over='ignore', invalid='ignore'):
+                    loglike, gradient, hessian = self.derivatives(params)
+                if not (np.isfinite(loglike) and np.isfinite(gradient).all() and np.isfinite(hessian).all()):
+                    loglike, gradient, hessian = -np.inf, np.zeros_like(gradient), np.zeros_like(hessian)
+                cache[key] = loglike, gradient, hessian
+            return cache[key]
+
+        # the mean log-likelihood is minimized (as in statsmodels), so that gtol does not depend on the sample size
+        start = self.start_params if start_params is None else np.asarray(start_params, dtype=float)
+        solution = optimize.minimize(lambda params: -evaluate(params)[0] / self.nobs, start, method=method,
+                                     jac=lambda params: -evaluate(params)[1] / self.nobs,
+                                     hess=lambda params: -evaluate(params)[2] / self.nobs,
+                                     options={'maxiter': maxiter, 'gtol': gtol})
+
+        return OrderedLogitResults(self, solution.x, {
+            'iterations': int(solution.nit), 'fcalls': int(solution.nfev),
+            'converged': bool(solution.success or np.linalg.norm(solution.jac) <= gtol),
+            'message': solution.message, 'method': method,
+        })
+
+
+class OrderedLogitResults:
+    """
+    Results of OrderedLogit().fit(), with the attributes printed for the regressions of the thesis
+    (params, bse, pvalues, prsquared and summary()).
+
+    :param model: the fitted OrderedLogit
+    :param params: estimated parameters
+    :param mle_retvals: iterations, function evaluations and convergence of the optimizer
+    """
+
+    def __init__(self, model: OrderedLogit, params: np.ndarray, mle_retvals: dict):
+        self.model = model
+        self.mle_retvals = mle_retvals
+        self.nobs = model.nobs
+        self.df_model = model.k_vars
+
+        loglike, _, hessian = model.derivatives(params)
+        self.llf = loglike
+        self.llnull = model.loglike_null()
+        self.prsquared = 1 - self.llf / self.llnull
+
+        # covariance of the parameters: inverse of the negative Hessian (pseudo-inverse if it is singular)
+        try:
+            covariance = np.linalg.inv(-hessian)
+        except np.linalg.LinAlgError:
+            covariance = np.linalg.pinv(-hessian)
+
+        self.params = pd.Series(params, index=model.exog_names)
+        self.covariance = pd.DataFrame(covariance, index=model.exog_names, columns=model.exog_names)
+        with np.errstate(invalid='ignore'):
+            self.bse = pd.Series(np.sqrt(np.diag(covariance)), index=model.exog_names)
+        self.tvalues = self.params / self.bse
+        self.pvalues = pd.Series(2 * stats.norm.sf(np.abs(self.tvalues)), index=model.exog_names)
+
+    def cov_params(self) -> pd.DataFrame:
+        return self.covariance
+
+    def conf_int(self, alpha: float = 0.05) -> pd.DataFrame:
+        quantile = stats.norm.ppf(1 - alpha / 2)
+
+        return pd.DataFrame({0: self.params - quantile * self.bse, 1: self.params + quantile * self.bse})
+
+    def summary(self) -> str:
+        """
+        Returns the results as text in the same layout as the summary of statsmodels (header and coefficient table).
+        """
+        header = [
+            ('Dep. Variable:', self.model.endog_name, 'Log-Likelihood:', '{:.2f}'.format(self.llf)),
+            ('Model:', 'OrderedLogit', 'LL-Null:', '{:.2f}'.format(self.llnull)),
+            ('Method:', self.mle_retvals['method'], 'Pseudo R-squ.:', '{:.4f}'.format(self.prsquared)),
+            ('No. Observations:', self.nobs, 'Iterations:', self.mle_retvals['iterations']),
+            ('Df Model:', self.df_model, 'Converged:', self.mle_retvals['converged']),
+        ]
+        lines = ['{:<18}{:>20}   {:<16}{:>20}'.format(*map(str, row)) for row in header]
+
+        confidence = self.conf_int()
+        table = pd.DataFrame({'coef': self.params, 'std err': self.bse, 'z': self.tvalues, 'P>|z|': self.pvalues,
+                              '[0.025': confidence[0], '0.975]': confidence[1]})
+        width = max(len(line) for line in lines)
+        body = table.to_string(float_format=lambda value: '{:.4f}'.format(value))
+
+        return '\n'.join(['OrderedLogit Results'.center(width), '=' * width] + lines + ['=' * width, body])
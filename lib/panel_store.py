@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from collections.abc import Mapping
+from functools import partial
+
+from lib.variable_names import Variables
+
+"""
+This module provides the panel store used to join cleaned datasets (ESG ratings, credit ratings, accounting data
+and company attributes) when preparing the regression data.
+
+Every dataset is indexed once by a compact integer key:
+    + panel datasets (with 'month' and 'year' columns): ticker_code << 20 | (12 * year + month - 1)
+    + company attributes (without 'month' and 'year'): ticker_code
+where ticker_code is the position of the ticker in the tickers known by the store.
+Joins are then done by binary search on the sorted keys instead of hashing the ticker strings again, for example:
+
+    panel_store = PanelStore(ExtractData().extract_cleaned_data())
+    data = panel_store.join(data, ['populated_sp', 'control_var'])
+"""
+
+
+# index of a dataset in the store: sorted keys, rows of the dataset in the same order, whether it is a panel dataset
+DatasetIndex = namedtuple('DatasetIndex', ['keys', 'data', 'panel'])
+
+
+class PanelStore:
+    """
+    Index of cleaned datasets by (ticker_code, month_index), which is built once per dataset on its first join.
+
+    :param tables: dictionary of the datasets (e.g. LazyDataDict of cleaned data, datasets are only read when joined)
+    :param ticker: column of the company tickers
+    """
+
+    # number of bits reserved for the month index (12 * year + month - 1) in the keys
+    MONTH_BITS = 20
+
+    def __init__(self, tables: Mapping = None, ticker: str = Variables.BloombergDB.FIELDS.BB_TICKER):
+        self.ticker = ticker
+        self.loaders = {name: partial(tables.__getitem__, name) for name in (tables or {})}
+        self.tickers = pd.Index([], dtype=object)
+        self.indexes = {}
+
+    def add(self, name: str, loader) -> None:
+        """
+        Add a dataset to the store.
+
+        :param loader: function (without arguments) returning the dataset, which is called on the first join
+        """
+        self.loaders[name] = loader
+        self.indexes.pop(name, None)
+
+    def keys(self, data: pd.DataFrame, panel: bool = True, extend: bool = False) -> np.ndarray:
+        """
+        Returns the int64 keys of the rows of data (-1 for unknown tickers or missing month / year).
+
+        :param panel: if True, keys of (ticker, month, year), otherwise keys of the ticker only
+        :param extend: if True, tickers that are not known yet get a new code (codes of known tickers do not change)
+        """
+        tickers = data[self.ticker]
+        if extend:
+            self.tickers = self.tickers.append(pd.Index(pd.unique(tickers.dropna())).difference(self.tickers))
+        codes = self.tickers.get_indexer(tickers).astype(np.int64)
+
+        if not panel:
+            return codes
+
+        months = 12 * data['year'].to_numpy(dtype=float) + data['month'].to_numpy(dtype=float) - 1
+        valid = (codes >= 0) & ~np.isnan(months)
+
+        return np.where(valid, (codes << self.MONTH_BITS) + np.where(valid, months, 0).astype(np.int64), -1)
+
+    def index(self, name: str) -> DatasetIndex:
+        """
+        Returns the index of a dataset: its sorted keys, its rows in the same order and whether it is a panel dataset.
+        The index is built on the first call and then reused.
+        """
+        if name not in self.indexes:
+            data = self.loaders[name]()
+            panel = 'month' in data.columns and 'year' in data.columns
+            keys = self.keys(data, panel=panel, extend=True)
+
+            # stable sort, so that rows with the same key keep their order (as in DataFrame.merge())
+            order = np.argsort(keys, kind='mergesort')
+            self.indexes[name] = DatasetIndex(keys[order], data.iloc[order].reset_index(drop=True), panel)
+
+        return self.indexes[name]
+
+    def table(self, name: str) -> pd.DataFrame:
+        """
+        Returns the rows of a dataset of the store (sorted by key, with a new range index).
+        The returned data frame is shared with the index and therefore must not be modified in place.
+        """
+        return self.index(name).data
+
+    def join(self, data: pd.DataFrame, tables, columns: dict = None, how: str = 'left') -> pd.DataFrame:
+        """
+        Join of one or several datasets of the store to data, one after another.
+        Same result as data.merge(table, on=['month', 'year', ticker], how=how) for each panel dataset
+        (on=ticker for company attributes), i.e. rows of data are repeated if several rows of a dataset match.
+
+        :param tables: name or list of names of the datasets
+        :param columns: (optional) columns to be joined of each dataset, e.g. {'company_info': ['INDUSTRY', 'COUNTRY']}.
+        By default, all columns except the key columns are joined.
+        :param how: 'left' (rows of data without match are kept) or 'inner' (they are dropped)
+        :return: the joined data frame (with a new range index, as DataFrame.merge())
+        """
+        if how not in ('left', 'inner'):
+            raise ValueError("how must be 'left' or 'inner', got {!r}".format(how))
+
+        if isinstance(tables, str):
+            tables = [tables]
+        columns = columns or {}
+
+        # index all datasets first (so that all their tickers are known),
+        # then keys of data are only calculated once, company attributes are joined on the ticker code
+        indexes = [self.index(name) for name in tables]
+        keys = self.keys(data) if any(index.panel for index in indexes) else None
+        codes = self.keys(data, panel=False)
+
+        result = data.reset_index(drop=True)
+        for name, (sorted_keys, table, panel) in zip(tables, indexes):
+            table_columns = columns.get(name, [column for column in table.columns
+                                               if column not in (self.ticker, 'month', 'year')])
+            overlap = [column for column in table_columns if column in result.columns]
+            if overlap:
+                raise ValueError('Columns {} of {} are already in the data'.format(overlap, name))
+
+            left, right = self.matches(sorted_keys, keys if panel else codes)
+            if how == 'inner':
+                left, right = left[right >= 0], right[right >= 0]
+            matched = table[table_columns].take(np.maximum(right, 0)) if len(table) else \
+                pd.DataFrame(np.nan, index=np.arange(len(right)), columns=table_columns)
+            if (right < 0).any():
+                matched = matched.where(np.broadcast_to((right >= 0)[:, None], matched.shape))
+
+            if len(left) != len(result) or (left != np.arange(len(result))).any():
+                result = result.take(left).reset_index(drop=True)
+                codes = codes[left]
+                if keys is not None:
+                    keys = keys[left]
+            result = pd.concat([result, matched.reset_index(drop=True)], axis=1)
+
+        return result
+
+    @staticmethod
+    def matches(sorted_keys: np.ndarray, keys: np.ndarray) -> tuple:
+        """
+        Returns the positions of matching rows (left join) as two arrays:
+        positions in keys (repeated for multiple matches) and positions in sorted_keys (-1 if no match).
+        """
+        start = np.searchsorted(sorted_keys, keys, side='left')
+        counts = np.searchsorted(sorted_keys, keys, side='right') - start
+        counts[keys < 0] = 0
+
+        if (counts <= 1).all():
+            return np.arange(len(keys)), np.where(counts == 1, start, -1)
+
+        rows = np.maximum(counts, 1)
+        left = np.repeat(np.arange(len(keys)), rows)
+        offset = np.arange(len(left)) - np.repeat(np.cumsum(rows) - rows, rows)
+        right = np.where(np.repeat(counts, rows) > 0, np.repeat(start, rows) + offset, -1)
+
+        return left, right
@@ -1,8 +1,10 @@
 import os
 import pandas as pd
-from scipy.stats.mstats import winsorize
 
-from lib.helpers import DataRoot, ExtractData
+from lib.helpers import DataRoot, ExtractData, SmallFunction
+from lib.fixed_effects import FixedEffects
+from lib.panel_store import PanelStore
+from lib.winsorizer import Winsorizer
 from lib.variable_names import Variables
 
 
@@ -29,7 +31,12 @@ class PrepareData(DataRoot):
         self.cleaned_data_dict = ExtractData().extract_cleaned_data()
         self.bb_ticker = Variables.BloombergDB.FIELDS.BB_TICKER
 
-    def control(self, mode='h1') -> None:
+        # index of cleaned data and company attributes, built once and reused by all hypotheses
+        self.panel_store = PanelStore(self.cleaned_data_dict, ticker=self.bb_ticker)
+        self.panel_store.add('company_info', lambda: self.company_info)
+        self.panel_store.add('h1_base', self.hypothesis1_base)
+
+    def control(self, mode='h1', publish=False) -> None:
         """
         This function prepares data for the main regression of two hypotheses and
         data for additional analyses of hypothesis 2.
@@ -38,97 +45,160 @@ class PrepareData(DataRoot):
             - 'h1': prepare data for hypothesis 1
             - 'h2': prepare data for hypothesis 2
 
-        Data for hypothesis 1 is then exported to Excel file under 'data/cleaned_data/h1_regression_data.xlsx'
+        Data for hypothesis 1 is then saved in the data store under 'data/cleaned_data/h1_regression_data'
             - dataset of Refinitiv ESG ratings is saved under sheet name 'h1_refinitiv',
-            - dataset of S&P Global ESG ratings is saved under sheet name 'h1_spglobal', and
-            - dataset of Sustainalytics ESG ratings is saved under sheet name 'h1_sustainalytics'.
+            - dataset of S&P Global ESG ratings is saved under sheet name 'h1_spglobal',
+            - dataset of Sustainalytics ESG ratings is saved under sheet name 'h1_sustainalytics',
+            - dataset of the common sample of all three providers is saved under sheet name 'h1_common', and
+            - winsorization thresholds of the control variables of each dataset are saved under sheet name 'h1_winsorize'.
 
-        Data for hypothesis 2 is then exported to Excel file under 'data/cleaned_data/h2_regression_data.xlsx'
+        Data for hypothesis 2 is then saved in the data store under 'data/cleaned_data/h2_regression_data'
             - monthly dataset used for additional analysis is saved under sheet name 'h2_monthly',
             - yearly dataset used for additional analysis is saved under sheet name 'h2_yearly', and
             - dataset used for main regression is saved under sheet name 'h2_main'.
+
+        :param publish: if True, the prepared data is also exported to Excel file
+        'data/cleaned_data/h1_regression_data.xlsx' or 'data/cleaned_data/h2_regression_data.xlsx'
         """
 
         if mode == 'h1':
 
-            # prepare data for hypothesis 1, separated by each ESG rating providers and export to Excel
-            h1_refinitiv = self.hypothesis1(data=self.cleaned_data_dict['refinitiv'])
-            h1_spglobal = self.hypothesis1(data=self.cleaned_data_dict['spglobal'])
-            h1_sustainalytics = self.hypothesis1(data=self.cleaned_data_dict['sustainalytics'])
+            # prepare data for hypothesis 1, separated by each ESG rating providers (and on their common sample)
+            # from one base panel and save to the data store
+            h1_data = self.hypothesis1_providers()
+
+            # winsorization thresholds of the control variables of each dataset
+            h1_winsorize = pd.concat([data.attrs['winsorize'].assign(dataset=sheet_name)
+                                      for sheet_name, data in h1_data.items()], ignore_index=True)
 
-            with pd.ExcelWriter(os.path.join(self.cleaned_data_root, Variables.RegressionData.FILES.H1_FILE_NAME)) as writer:
-                h1_refinitiv.to_excel(writer, sheet_name=Variables.RegressionData.FILES.H1_REFINITIV_SHEET_NAME, index=False)
-                h1_spglobal.to_excel(writer, sheet_name=Variables.RegressionData.FILES.H1_SPGLOBAL_SHEET_NAME, index=False)
-                h1_sustainalytics.to_excel(writer, sheet_name=Variables.RegressionData.FILES.H1_SUSTAINALYTICS_SHEET_NAME, index=False)
+            self.save(Variables.RegressionData.FILES.H1_FILE_NAME, {
+                **h1_data,
+                Variables.RegressionData.FILES.H1_WINSORIZE_SHEET_NAME: h1_winsorize,
+            }, publish=publish)
 
         else:  # i.e mode == 'h2'
 
-            # prepare data for main regression as well as additional analyses of hypothesis 2 and export to Excel
+            # prepare data for main regression as well as additional analyses of hypothesis 2 and save to the data store
             h2_monthly = self.hypothesis2_monthly()
             h2_yearly = self.hypothesis2_yearly()
             h2_main = self.hypothesis2_main(h2_monthly, start_year=2006, end_year=2020)
 
-            with pd.ExcelWriter(os.path.join(self.cleaned_data_root, Variables.RegressionData.FILES.H2_FILE_NAME)) as writer:
-                h2_monthly.to_excel(writer, sheet_name=Variables.RegressionData.FILES.H2_MONTHLY_DATA_SHEET_NAME, index=False)
-                h2_yearly.to_excel(writer, sheet_name=Variables.RegressionData.FILES.H2_YEARLY_DATA_SHEET_NAME, index=False)
-                h2_main.to_excel(writer, sheet_name=Variables.RegressionData.FILES.H2_MAIN_DATA_SHEET_NAME, index=False)
+            self.save(Variables.RegressionData.FILES.H2_FILE_NAME, {
+                Variables.RegressionData.FILES.H2_MONTHLY_DATA_SHEET_NAME: h2_monthly,
+                Variables.RegressionData.FILES.H2_YEARLY_DATA_SHEET_NAME: h2_yearly,
+                Variables.RegressionData.FILES.H2_MAIN_DATA_SHEET_NAME: h2_main,
+            }, publish=publish)
+
+    def save(self, file_name: str, datasets: dict, publish: bool = False) -> None:
+        """
+        Save prepared datasets (sheet name -> data frame) to the data store of file_name
+        and optionally export them to Excel file 'data/cleaned_data/<file_name>'.
+        """
+        store = self.data_store(file_name)
+        for sheet_name, data in datasets.items():
+            store.write(data, sheet_name=sheet_name)
 
+        if publish:
+            store.publish(sheet_names=list(datasets), file_path=os.path.join(self.cleaned_data_root, file_name))
 
-    def hypothesis1(self, data) -> pd.DataFrame:
+    def hypothesis1_base(self) -> pd.DataFrame:
+        """
+        Base panel of hypothesis 1, shared by the datasets of all ESG rating providers:
+            - merge monthly populated credit ratings with monthly populated accounting data
+            - NA values are excluded
+            - S&P credit rating = 0 (NR) are excluded
+            - add industry & country data
+        """
+        # merge populated credit ratings with populated accounting data
+        base = self.panel_store.join(self.cleaned_data_dict['populated_sp'], 'control_var')
+
+        # drop rows where there is at least 1 NA value
+        base = base.dropna(how='any')
+
+        # drop credit ratings with 'NR' values (i.e 0)
+        base = base.loc[base['ordinal_rating'] != 0].reset_index(drop=True)
+
+        # get industry & country data
+        return self.panel_store.join(base, 'company_info', columns={'company_info': ['INDUSTRY', 'COUNTRY']})
+
+    def hypothesis1(self, data, winsorize_by=None) -> pd.DataFrame:
         """
         This function retrieves necessary data to run hypothesis 1 for corresponding ESG provider.
 
         The following steps are done:
-            - merge monthly ESG ratings with monthly populated credit ratings and monthly populated accounting data
+            - merge monthly ESG ratings with the base panel (see hypothesis1_base()), i.e. with monthly populated
+            credit ratings, monthly populated accounting data and industry & country data
             - NA values are excluded
-            - S&P credit rating = 0 (NR) are excluded
-            - create year dummies
-            - create industry dummies
-            - create country dummies
+            - store industry and country as categoricals (year, industry and country dummies
+            are created by FixedEffects when the model is fitted)
             - winsorize all control variables at 5% and 95%
 
         :parameter data - dataframe of cleaned ESG scores of a specific ESG rating provider,
         extracted from 'cleaned_data.xlsx'.
+        :parameter winsorize_by - (optional) column(s), e.g. 'year' or 'INDUSTRY', to winsorize within each group
+        instead of the whole sample (robustness check).
 
         :return a dataframe of regression data of a specific ESG rating provider.
         """
 
-        # merge ESG data with populated credit ratings and accounting data
-        data = data.merge(self.cleaned_data_dict['populated_sp'], on=['month', 'year', self.bb_ticker], how='left')
-        data = data.merge(self.cleaned_data_dict['control_var'], on=['month', 'year', self.bb_ticker], how='left')
+        # merge ESG data with the base panel (built once and reused for all providers)
+        data = self.panel_store.join(data.dropna(how='any'), 'h1_base')
 
-        # drop rows where there is at least 1 NA value
-        data = data.dropna(how='any')
-
-        # drop credit ratings with 'NR' values (i.e 0)
-        data = data.loc[data['ordinal_rating'] != 0].reset_index(drop=True)
+        # drop rows where there is at least 1 NA value, i.e. ESG ratings without credit ratings or accounting data
+        # (missing industry & country data are kept)
+        data = data.dropna(subset=[column for column in data.columns if column not in ['INDUSTRY', 'COUNTRY']])
+        data = data.reset_index(drop=True)
 
-        # create year dummies
-        year_dummy = pd.get_dummies(data['year'])
-
-        # get industry & country data
-        data = data.merge(self.company_info[[self.bb_ticker, 'INDUSTRY', 'COUNTRY']], on=self.bb_ticker, how='left')
+        return self.hypothesis1_finalize(data, winsorize_by)
 
-        # create industry dummies
-        industry_dummy = pd.get_dummies(data['INDUSTRY'])
+    def hypothesis1_providers(self, winsorize_by=None) -> dict:
+        """
+        Retrieve the data of hypothesis 1 for all ESG rating providers from one base panel (see hypothesis1_base()).
 
-        # create country dummies
-        country_dummy = pd.get_dummies(data['COUNTRY'])
+        :parameter winsorize_by - see hypothesis1()
+        :return a dictionary with the dataset of each provider and of their common sample
+        (i.e. months where all three providers have ESG ratings), keyed by sheet name, e.g. 'h1_refinitiv', 'h1_common'.
+        """
+        providers = {
+            Variables.RegressionData.FILES.H1_REFINITIV_SHEET_NAME: ('refinitiv', [
+                Variables.RefinitivESG.GOV, Variables.RefinitivESG.ENV,
+                Variables.RefinitivESG.SOCIAL, Variables.RefinitivESG.TOTAL]),
+            Variables.RegressionData.FILES.H1_SPGLOBAL_SHEET_NAME: ('spglobal', [
+                Variables.SPGlobalESG.ECON, Variables.SPGlobalESG.ENV,
+                Variables.SPGlobalESG.SOCIAL, Variables.SPGlobalESG.TOTAL]),
+            Variables.RegressionData.FILES.H1_SUSTAINALYTICS_SHEET_NAME: ('sustainalytics', [
+                Variables.SustainalyticsESG.ENV, Variables.SustainalyticsESG.GOV,
+                Variables.SustainalyticsESG.TOTAL, Variables.SustainalyticsESG.SOCIAL]),
+        }
+
+        result = {sheet_name: self.hypothesis1(self.cleaned_data_dict[name], winsorize_by=winsorize_by)
+                  for sheet_name, (name, _) in providers.items()}
+
+        # common sample: base panel with ESG scores of all three providers
+        common = self.panel_store.join(self.panel_store.table('h1_base'), [name for name, _ in providers.values()],
+                                       columns={name: columns for name, columns in providers.values()}, how='inner')
+        common = common.dropna(subset=[column for _, columns in providers.values() for column in columns])
+        common = common.reset_index(drop=True)
+        result[Variables.RegressionData.FILES.H1_COMMON_SHEET_NAME] = self.hypothesis1_finalize(common, winsorize_by)
 
-        # merge dummies to final data based on index
-        data = data.merge(year_dummy, how='left', left_index=True, right_index=True)
-        data = data.merge(industry_dummy, how='left', left_index=True, right_index=True)
-        data = data.merge(country_dummy, how='left', left_index=True, right_index=True)
+        return result
 
-        # winsorize all control variables at 5% and 95%
-        data[Variables.RegressionData.ControlVar.H1_ICOV] = winsorize(data[Variables.RegressionData.ControlVar.H1_ICOV], limits=[0.05, 0.05])
-        data[Variables.RegressionData.ControlVar.H1_OMAR] = winsorize(data[Variables.RegressionData.ControlVar.H1_OMAR], limits=[0.05, 0.05])
-        data[Variables.RegressionData.ControlVar.H1_SIZE] = winsorize(data[Variables.RegressionData.ControlVar.H1_SIZE], limits=[0.05, 0.05])
-        data[Variables.RegressionData.ControlVar.H1_LEV] = winsorize(data[Variables.RegressionData.ControlVar.H1_LEV], limits=[0.05, 0.05])
+    @staticmethod
+    def hypothesis1_finalize(data: pd.DataFrame, winsorize_by=None) -> pd.DataFrame:
+        """
+        Last steps of hypothesis 1: store industry & country as categoricals and winsorize all control variables.
+        """
+        # store industry & country as categoricals (dummies are created when the model is fitted)
+        data = FixedEffects.to_categorical(data)
 
-        return data
+        # winsorize all control variables at 5% and 95% (thresholds are kept in data.attrs['winsorize'])
+        return Winsorizer([Variables.RegressionData.ControlVar.H1_ICOV,
+                           Variables.RegressionData.ControlVar.H1_OMAR,
+                           Variables.RegressionData.ControlVar.H1_SIZE,
+                           Variables.RegressionData.ControlVar.H1_LEV],
+                          limits=(0.05, 0.05), by=winsorize_by).apply(data, inplace=True)
 
-    def hypothesis2_monthly(self) -> pd.DataFrame:
+    def hypothesis2_monthly(self, horizons: tuple = (1,)) -> pd.DataFrame:
         """
         Retrieve monthly data necessary to run additional analysis for hypothesis 2.
 
@@ -138,9 +208,15 @@ class PrepareData(DataRoot):
             - NA values are excluded
             - S&P credit rating = 0 (NR) are excluded
             - create ESG_RATED dummy (= 1 if at least 1 ESG rating available, =0 otherwise)
-            - create year dummies
-            - create industry dummies
-            - create country dummies
+            - store industry and country as categoricals (year, industry and country dummies
+            are created by FixedEffects when the model is fitted)
+
+        :param horizons: horizons (in months) of the forward credit rating changes, e.g. (1, 3, 6, 12).
+        The 1-month change 'CR_CHANGE_M' is always calculated, other horizons are named e.g. 'CR_CHANGE_3M'.
+        Rows are only excluded based on the 1-month change.
+        'CR_CHANGE_M' is the change to the next observation of the company, so that it stays identical to the
+        original thesis code. Other horizons compare the rating 'horizon' calendar months ahead,
+        i.e. they are NA if the company has no rating in that month (e.g. gaps after dropping NR ratings).
         """
 
         # get populated credit rating
@@ -149,41 +225,30 @@ class PrepareData(DataRoot):
         # drop credit ratings with 'NR' values (i.e 0)
         populated_sp = populated_sp.loc[populated_sp['ordinal_rating'] != 0].reset_index(drop=True)
 
-        # calculate monthly credit rating changes for each company
-        result = []
-        for company in populated_sp[self.bb_ticker].unique():
-            df = populated_sp.loc[populated_sp[self.bb_ticker] == company]
-            df[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE] = df['ordinal_rating'].diff(periods=1)
-            df[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE] = df[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE].shift(periods=-1)
-            result.append(df)
-        result = pd.concat(result)
-
-        # merge with populated accounting data and ESG ratings from all three providers
-        result = result.merge(self.cleaned_data_dict['control_var'], on=['month', 'year', self.bb_ticker], how='left')
-        result = result.merge(self.cleaned_data_dict['refinitiv'][[Variables.RefinitivESG.TOTAL,
-                                                                   self.bb_ticker,
-                                                                   'month',
-                                                                   'year'
-                                                                   ]],
-                              on=['month', 'year', self.bb_ticker],
-                              how='left')
-        result = result.merge(self.cleaned_data_dict['spglobal'][[Variables.SPGlobalESG.TOTAL,
-                                                                  self.bb_ticker,
-                                                                  'month',
-                                                                  'year'
-                                                                  ]],
-                              on=['month', 'year', self.bb_ticker],
-                              how='left')
-        result = result.merge(self.cleaned_data_dict['sustainalytics'][[Variables.SustainalyticsESG.TOTAL,
-                                                                        self.bb_ticker,
-                                                                        'month',
-                                                                        'year'
-                                                                        ]],
-                              on=['month', 'year', self.bb_ticker],
-                              how='left')
-
-        # get industry & country data
-        result = result.merge(self.company_info[[self.bb_ticker, 'INDUSTRY', 'COUNTRY']], on=self.bb_ticker, how='left')
+        # calculate forward credit rating changes of each company
+        # (the 1-month change compares consecutive rows as in the original thesis code,
+        # longer horizons compare the rating 'horizon' calendar months ahead)
+        result = populated_sp.copy()
+        month_index = result['year'] * 12 + result['month']
+        for horizon in sorted(set(horizons) | {1}):
+            if horizon == 1:
+                result[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE] = SmallFunction.forward_change(
+                    result, column='ordinal_rating', group=self.bb_ticker, sort_by=['year', 'month'])
+            else:
+                column = Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE_HORIZON.format(horizon)
+                result[column] = SmallFunction.forward_change(result.assign(month_index=month_index),
+                                                              column='ordinal_rating', group=self.bb_ticker,
+                                                              sort_by=['year', 'month'], horizon=horizon,
+                                                              period='month_index')
+
+        # merge with populated accounting data, ESG ratings from all three providers and industry & country data
+        result = self.panel_store.join(result, ['control_var', 'refinitiv', 'spglobal', 'sustainalytics', 'company_info'],
+                                       columns={
+                                           'refinitiv': [Variables.RefinitivESG.TOTAL],
+                                           'spglobal': [Variables.SPGlobalESG.TOTAL],
+                                           'sustainalytics': [Variables.SustainalyticsESG.TOTAL],
+                                           'company_info': ['INDUSTRY', 'COUNTRY'],
+                                       })
 
         # remove rows where control variables have NA values
         result = result.loc[
@@ -198,32 +263,14 @@ class PrepareData(DataRoot):
             ]
 
         # create dummy for ESG_RATED variable (main independent variable)
-        result.loc[
+        result = result.assign(ESG_RATED=(
             (result[Variables.SustainalyticsESG.TOTAL].notnull()) |
             (result[Variables.RefinitivESG.TOTAL].notnull()) |
-            (result[Variables.SPGlobalESG.TOTAL].notnull()),
-            'ESG_RATED'
-        ] = 1
-        result.loc[
-            (result[Variables.SustainalyticsESG.TOTAL].isnull()) &
-            (result[Variables.RefinitivESG.TOTAL].isnull()) &
-            (result[Variables.SPGlobalESG.TOTAL].isnull()),
-            'ESG_RATED'
-        ] = 0
-
-        # create year dummies
-        year_dummy = pd.get_dummies(result['year'])
-
-        # create industry dummies
-        industry_dummy = pd.get_dummies(result['INDUSTRY'])
-
-        # create country dummies
-        country_dummy = pd.get_dummies(result['COUNTRY'])
-
-        # merge dummies to data on index
-        result = result.merge(year_dummy, how='left', left_index=True, right_index=True)
-        result = result.merge(industry_dummy, how='left', left_index=True, right_index=True)
-        result = result.merge(country_dummy, how='left', left_index=True, right_index=True)
+            (result[Variables.SPGlobalESG.TOTAL].notnull())
+        ).astype(float))
+
+        # store industry & country as categoricals (dummies are created when the model is fitted)
+        result = FixedEffects.to_categorical(result)
 
         return result
 
@@ -237,9 +284,8 @@ class PrepareData(DataRoot):
             - NA values are excluded
             - S&P credit rating = 0 (NR) are excluded
             - create ESG_RATED dummy (= 1 if at least 1 ESG rating available, =0 otherwise)
-            - create year dummies
-            - create industry dummies
-            - create country dummies
+            - store industry and country as categoricals (year, industry and country dummies
+            are created by FixedEffects when the model is fitted)
         """
         # get populated credit rating
         populated_sp = self.cleaned_data_dict['populated_sp']
@@ -247,30 +293,17 @@ class PrepareData(DataRoot):
         # drop credit ratings with 'NR' values (i.e 0)
         populated_sp = populated_sp.loc[populated_sp['ordinal_rating'] != 0].reset_index(drop=True)
 
-        # get yearly populated credit ratings
-        populated_rtg_yearly = []
-        for company in populated_sp[self.bb_ticker].unique():
-            df = populated_sp.loc[populated_sp[self.bb_ticker] == company]
-            for year in df['year'].unique():
-                df_year = df.loc[df['year'] == year]
-                max_date = max(df_year['month'])
-                df_year = df_year.loc[df_year['month'] == max_date]
-                populated_rtg_yearly.append(df_year)
-        populated_rtg_yearly = pd.concat(populated_rtg_yearly)
+        # get yearly populated credit ratings (rating of the last month of each year)
+        populated_rtg_yearly = SmallFunction.last_observation(populated_sp, order_by='month', group=self.bb_ticker)
         populated_rtg_yearly = populated_rtg_yearly.drop(columns=['month'])
 
         # calculate yearly credit rating changes
-        result = []
-        for company in populated_rtg_yearly[self.bb_ticker].unique():
-            df = populated_rtg_yearly.loc[populated_rtg_yearly[self.bb_ticker] == company]
-            df[Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE] = df['ordinal_rating'].diff(periods=1)
-            df[Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE] = df[Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE].shift(periods=-1)
-            result.append(df)
-        result = pd.concat(result)
+        result = populated_rtg_yearly.copy()
+        result[Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE] = SmallFunction.forward_change(
+            result, column='ordinal_rating', group=self.bb_ticker, sort_by=['year'])
 
         # merge with cleaned accounting data (not populated)
-        accounting = pd.read_excel(os.path.join(self.cleaned_data_root, Variables.CleanedData.FILE_NAME),
-                                   sheet_name=Variables.CleanedData.ACCOUNTING_SHEET_NAME)[[
+        accounting = ExtractData().session(Variables.CleanedData.FILE_NAME).get(Variables.CleanedData.ACCOUNTING_SHEET_NAME)[[
             self.bb_ticker,
             Variables.RegressionData.ControlVar.H1_SIZE,
             Variables.RegressionData.ControlVar.H1_LEV,
@@ -290,15 +323,7 @@ class PrepareData(DataRoot):
                                                              'month',
                                                              'year',
                                                              'Dates']]
-        esg_refinitiv_yearly = []
-        for company in esg_refinitiv[self.bb_ticker].unique():
-            df = esg_refinitiv.loc[esg_refinitiv[self.bb_ticker] == company]
-            for year in df['year'].unique():
-                df_year = df.loc[df['year'] == year]
-                max_date = max(df_year['Dates'])
-                df_year = df_year.loc[df_year['Dates'] == max_date]
-                esg_refinitiv_yearly.append(df_year)
-        esg_refinitiv_yearly = pd.concat(esg_refinitiv_yearly)
+        esg_refinitiv_yearly = SmallFunction.last_observation(esg_refinitiv, order_by='Dates', group=self.bb_ticker)
         esg_refinitiv_yearly = esg_refinitiv_yearly.drop(columns=['month', 'Dates'])
 
         result = result.merge(esg_refinitiv_yearly, on=[self.bb_ticker, 'year'], how='left')
@@ -309,15 +334,7 @@ class PrepareData(DataRoot):
                                                            'Dates',
                                                            'year'
                                                            ]]
-        esg_spglobal_yearly = []
-        for company in esg_spglobal[self.bb_ticker].unique():
-            df = esg_spglobal.loc[esg_spglobal[self.bb_ticker] == company]
-            for year in df['year'].unique():
-                df_year = df.loc[df['year'] == year]
-                max_date = max(df_year['Dates'])
-                df_year = df_year.loc[df_year['Dates'] == max_date]
-                esg_spglobal_yearly.append(df_year)
-        esg_spglobal_yearly = pd.concat(esg_spglobal_yearly)
+        esg_spglobal_yearly = SmallFunction.last_observation(esg_spglobal, order_by='Dates', group=self.bb_ticker)
         esg_spglobal_yearly = esg_spglobal_yearly.drop(columns=['Dates'])
 
         result = result.merge(esg_spglobal_yearly, on=[self.bb_ticker, 'year'], how='left')
@@ -328,15 +345,8 @@ class PrepareData(DataRoot):
                                                                        'Dates',
                                                                        'year'
                                                                        ]]
-        esg_sustainalytics_yearly = []
-        for company in esg_sustainalytics['BB_TICKER'].unique():
-            df = esg_sustainalytics.loc[esg_sustainalytics[self.bb_ticker] == company]
-            for year in df['year'].unique():
-                df_year = df.loc[df['year'] == year]
-                max_date = max(df_year['Dates'])
-                df_year = df_year.loc[df_year['Dates'] == max_date]
-                esg_sustainalytics_yearly.append(df_year)
-        esg_sustainalytics_yearly = pd.concat(esg_sustainalytics_yearly)
+        esg_sustainalytics_yearly = SmallFunction.last_observation(esg_sustainalytics, order_by='Dates',
+                                                                   group=self.bb_ticker)
         esg_sustainalytics_yearly = esg_sustainalytics_yearly.drop(columns=['Dates'])
 
         result = result.merge(esg_sustainalytics_yearly, on=[self.bb_ticker, 'year'], how='left')
@@ -358,32 +368,14 @@ class PrepareData(DataRoot):
 
         # create dummy for ESG_RATED
         # dummy = 1 if has at least 1 ESG rating, = 0 otherwise
-        result.loc[
+        result = result.assign(ESG_RATED=(
             (result[Variables.SustainalyticsESG.TOTAL].notnull()) |
             (result[Variables.RefinitivESG.TOTAL].notnull()) |
-            (result[Variables.SPGlobalESG.TOTAL].notnull()),
-            'ESG_RATED'
-        ] = 1
-        result.loc[
-            (result[Variables.SustainalyticsESG.TOTAL].isnull()) &
-            (result[Variables.RefinitivESG.TOTAL].isnull()) &
-            (result[Variables.SPGlobalESG.TOTAL].isnull()),
-            'ESG_RATED'
-        ] = 0
-
-        # create year dummies
-        year_dummy = pd.get_dummies(result['year'])
-
-        # create industry dummies
-        industry_dummy = pd.get_dummies(result['INDUSTRY'])
-
-        # create country dummies
-        country_dummy = pd.get_dummies(result['COUNTRY'])
-
-        # merge dummies to data on index
-        result = result.merge(year_dummy, how='left', left_index=True, right_index=True)
-        result = result.merge(industry_dummy, how='left', left_index=True, right_index=True)
-        result = result.merge(country_dummy, how='left', left_index=True, right_index=True)
+            (result[Variables.SPGlobalESG.TOTAL].notnull())
+        ).astype(float))
+
+        # store industry & country as categoricals (dummies are created when the model is fitted)
+        result = FixedEffects.to_categorical(result)
 
         return result
 
@@ -411,59 +403,73 @@ class PrepareData(DataRoot):
                 + = 1 if at least 1 ESG rating available during the sample period of the company
                 + = 0 otherwise
 
-            - create industry dummies
-
-            - create country dummies
+            - store industry and country as categoricals (dummies are created by FixedEffects
+            when the model is fitted)
         """
 
-        # calculate total number of times of credit rating changes for each company
-        # & calculate average values of the control variables during the sample period of each company
-        # & create ESG_RATED dummy
-        result = []
-        for company in h2_monthly[self.bb_ticker].unique():
-            df = h2_monthly.loc[h2_monthly[self.bb_ticker] == company]
-            df = df.loc[(df['year'] >= start_year) & (df['year'] <= end_year)]
-            if not df.empty:
-                if len(df[Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY].unique()) > 1:
-                    df = df.loc[df[Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY] == 1]
-                data_dict = {
-                    Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE:
-                        df[df[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE] != 0].count()[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE],
-                    'upgrade': df[df[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE] > 0].count()[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE],
-                    'downgrade': df[df[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE] < 0].count()[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE],
-                    'no_years': len(df['year'].unique()),
-                    Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY: df[Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY].unique().item(),
-                    Variables.RegressionData.ControlVar.H2_AVG_SIZE: df[Variables.RegressionData.ControlVar.H1_SIZE].mean(),
-                    Variables.RegressionData.ControlVar.H2_AVG_LEV: df[Variables.RegressionData.ControlVar.H1_LEV].mean(),
-                    Variables.RegressionData.ControlVar.H2_AVG_ICOV: df[Variables.RegressionData.ControlVar.H1_ICOV].mean(),
-                    Variables.RegressionData.ControlVar.H2_AVG_OMAR: df[Variables.RegressionData.ControlVar.H1_OMAR].mean(),
-                    'INDUSTRY': df['INDUSTRY'].unique().item(),
-                    'COUNTRY': df['COUNTRY'].unique().item(),
-                    self.bb_ticker: company
-                }
-                df_summary = pd.DataFrame.from_dict([data_dict])
-                result.append(df_summary)
-            else:
-                continue
-        result = pd.concat(result)
-        result = result.reset_index(drop=True)
+        return self.hypothesis2_main_periods(h2_monthly, periods=[(start_year, end_year)])[(start_year, end_year)]
 
-        # create LONG_TERM dummy
-        # = 1 if no_years of a company > average of no_years of the whole sample (here: 9 years)
-        result.loc[result['no_years'] > result['no_years'].mean(), Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY] = 1
-        result.loc[result['no_years'] <= result['no_years'].mean(), Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY] = 0
+    def hypothesis2_main_periods(self, h2_monthly: pd.DataFrame, periods: list) -> dict:
+        """
+        Same as hypothesis2_main(), but for several sample periods at once (e.g. sub-periods 2006 - 2016 and 2010 - 2019).
+        The company summaries of all periods are calculated with a single groupby aggregation.
 
-        # create industry dummies
-        industry_dummy = pd.get_dummies(result['INDUSTRY'])
+        :param h2_monthly: data generated by hypothesis2_monthly()
+        :param periods: list of sample periods as (start_year, end_year)
+        :return: a dictionary with the data of each period, keyed by (start_year, end_year)
+        """
+        change = Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE
+        esg_rated = Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY
 
-        # create country dummies
-        country_dummy = pd.get_dummies(result['COUNTRY'])
+        # stack the monthly data of each sample period
+        data = pd.concat([
+            h2_monthly.loc[(h2_monthly['year'] >= start_year) & (h2_monthly['year'] <= end_year)].assign(period=i)
+            for i, (start_year, end_year) in enumerate(periods)
+        ])
 
-        # merge dummies to data on index
-        result = result.merge(industry_dummy, how='left', left_index=True, right_index=True)
-        result = result.merge(country_dummy, how='left', left_index=True, right_index=True)
+        # for company that switches its status from non ESG-rated to ESG-rated during the sample period,
+        # only keep the months after having ESG ratings available
+        switches = data.groupby(['period', self.bb_ticker])[esg_rated].transform('nunique') > 1
+        data = data.loc[~switches | (data[esg_rated] == 1)]
 
-        return result
+        # calculate total number of times of credit rating changes for each company
+        # & calculate average values of the control variables during the sample period of each company
+        # & create ESG_RATED dummy
+        data = data.assign(**{
+            Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE: data[change].notnull() & (data[change] != 0),
+            'upgrade': data[change] > 0,
+            'downgrade': data[change] < 0,
+        })
+        summary = data.groupby(['period', self.bb_ticker], sort=False).agg(**{
+            Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE: (Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE, 'sum'),
+            'upgrade': ('upgrade', 'sum'),
+            'downgrade': ('downgrade', 'sum'),
+            'no_years': ('year', 'nunique'),
+            esg_rated: (esg_rated, 'first'),
+            Variables.RegressionData.ControlVar.H2_AVG_SIZE: (Variables.RegressionData.ControlVar.H1_SIZE, 'mean'),
+            Variables.RegressionData.ControlVar.H2_AVG_LEV: (Variables.RegressionData.ControlVar.H1_LEV, 'mean'),
+            Variables.RegressionData.ControlVar.H2_AVG_ICOV: (Variables.RegressionData.ControlVar.H1_ICOV, 'mean'),
+            Variables.RegressionData.ControlVar.H2_AVG_OMAR: (Variables.RegressionData.ControlVar.H1_OMAR, 'mean'),
+            'INDUSTRY': ('INDUSTRY', 'first'),
+            'COUNTRY': ('COUNTRY', 'first'),
+        }).reset_index(level=self.bb_ticker)
+        summary = FixedEffects.to_categorical(summary)
+
+        # move BB_TICKER to the last column
+        summary = summary[[column for column in summary.columns if column != self.bb_ticker] + [self.bb_ticker]]
+
+        results = {}
+        for i, period in enumerate(periods):
+            result = summary.loc[summary.index == i].reset_index(drop=True)
+
+            # create LONG_TERM dummy
+            # = 1 if no_years of a company > average of no_years of the whole sample (here: 9 years)
+            result[Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY] = (
+                    result['no_years'] > result['no_years'].mean()).astype(float)
+
+            results[tuple(period)] = result
+
+        return results
 
 
 if __name__ == "__main__":
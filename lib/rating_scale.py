@@ -0,0 +1,116 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+from lib.variable_names import Variables
+
+"""
+This module provides the ordinal scales used to transform credit ratings (e.g. 'BBB+') to an ordinal scale (e.g. 15).
+
+Only the S&P scale is needed in the thesis. Scales of other rating agencies (e.g. Moody's or Fitch)
+can be added by registering a new scale, for example:
+
+    RatingScale.register(RatingScale(name='moodys', ordinal={'C': 1, 'Ca': 2, ..., 'Aaa': 21}, investment_grade=11))
+
+and then passing its name to BloombergCreditRtg.hard_code_rtg().
+"""
+
+
+class RatingScale:
+    """
+    Ordinal scale of credit ratings of a rating agency.
+
+    :param name: name under which the scale is registered
+    :param ordinal: mapping of each rating to its ordinal value (the higher, the better the rating)
+    :param investment_grade: ratings with an ordinal value above this threshold are labelled 'investment',
+    all other ratings are labelled 'speculative'
+    """
+
+    registry = {}
+
+    def __init__(self, name: str, ordinal: dict, investment_grade: int):
+        self.name = name
+        self.ordinal = ordinal
+        self.investment_grade = investment_grade
+
+        # lookup tables: position of a rating in self.ratings -> ordinal value / grade
+        self.ratings = pd.Index(list(ordinal.keys()))
+        self.ordinal_values = np.array(list(ordinal.values()), dtype='int8')
+        self.grades = np.where(self.ordinal_values > investment_grade, 'investment', 'speculative').astype(object)
+
+    @classmethod
+    def register(cls, scale: 'RatingScale') -> None:
+        """
+        Register a scale, so that it can be retrieved by its name.
+        """
+        cls.registry[scale.name] = scale
+
+    @classmethod
+    def get(cls, name: str) -> 'RatingScale':
+        """
+        Returns the registered scale with the given name.
+        """
+        if name not in cls.registry:
+            raise KeyError('Unknown rating scale {!r}, registered scales are: {}'.format(name, list(cls.registry)))
+
+        return cls.registry[name]
+
+    def encode(self, ratings: pd.Series) -> pd.DataFrame:
+        """
+        Transform credit ratings to 'ordinal_rating' (int8) and 'grade' with a single lookup.
+
+        Ratings that are not part of the scale are reported with a warning and kept without ordinal rating and grade
+        (NaN, 'ordinal_rating' is then float), so that no observation is dropped silently.
+
+        :param ratings: series of credit ratings (e.g. 'BBB+')
+        """
+        positions = self.ratings.get_indexer(ratings)  # -1 if the rating is not part of the scale
+        known = positions >= 0
+
+        encoded = pd.DataFrame({
+            'ordinal_rating': self.ordinal_values[positions],
+            'grade': self.grades[positions],
+        }, index=ratings.index)
+
+        if not known.all():
+            unknown = ratings[~known].value_counts(dropna=False).to_dict()
+            warnings.warn('The following ratings are not part of the {} scale and are kept without ordinal rating '
+                          'and grade: {}'.format(self.name, unknown))
+            encoded = encoded.where(pd.Series(known, index=ratings.index), axis=0)
+
+        return encoded
+
+
+# S&P long-term issuer credit ratings
+#   - NR: rating has not been assigned or is no longer assigned.
+#   - investment grade: above BB+ (i.e. > 12)
+RatingScale.register(RatingScale(
+    name=Variables.SPCreditRtg.RATING_SCALE,
+    ordinal={
+        'NR': 0,
+        'D': 1,
+        'SD': 1,
+        'C': 2,
+        'CC': 3,
+        'CCC-': 4,
+        'CCC': 5,
+        'CCC+': 6,
+        'B-': 7,
+        'B': 8,
+        'B+': 9,
+        'BB-': 10,
+        'BB': 11,
+        'BB+': 12,
+        'BBB-': 13,
+        'BBB': 14,
+        'BBB+': 15,
+        'A-': 16,
+        'A': 17,
+        'A+': 18,
+        'AA-': 19,
+        'AA': 20,
+        'AA+': 21,
+        'AAA': 22,
+    },
+    investment_grade=12,
+))
@@ -1,11 +1,11 @@
+from functools import partial
 import pandas as pd
-from pandas.api.types import CategoricalDtype
 
 from lib.variable_names import Variables
-from lib.helpers import ExtractData
+from lib.helpers import ExtractData, LazyDataDict
 from lib.prepare_data import PrepareData
-
-from statsmodels.miscmodels.ordinal_model import OrderedModel
+from lib.regression_spec import RegressionSpec, SpecRunner
+from lib.result_store import ResultStore
 
 """
 This module runs regression for both hypotheses in the thesis.
@@ -17,6 +17,18 @@ To execute a specific mode to see how the output is generated:
     + assign a string to the 'mode' variable in function Regression().control()
     + choices of the 'mode' variable are defined in function Regression().control()
 
+All regressions are declared as specifications (see lib/regression_spec.py) in SPECS below,
+a robustness check is added with one more RegressionSpec in the corresponding list.
+Year, industry and country dummies are derived from the sample of each regression.
+Nested models of hypothesis 2 (baseline -> extended -> full) and the sub sample periods and size quantiles are
+warm-started from the related model if it was fitted before (e.g. running the modes 'main' and 'sub-periods' one after
+another with the same Regression()). Nested models of hypothesis 1 (baseline -> full), industry sub samples and lagged
+models are fitted from the default start parameters, as warm starts did not reliably reduce their iterations
+(e.g. more BFGS iterations for the full models of hypothesis 1 using Refinitiv and Sustainalytics,
+and for the first industry of hypothesis 2).
+The results are saved in a result store (see lib/result_store.py), from which the tables of the thesis (TABLES)
+are rendered with Regression().table('table_6') without re-fitting the regressions.
+
 statsmodels package (dev version 13.) is applied.
 For more information about Ordinal Regression of statsmodels:
 https://www.statsmodels.org/devel/examples/notebooks/generated/ordinal_regression.html#Logit-ordinal-regression
@@ -27,15 +39,204 @@ or one can simply run 'git clone git://github.com/statsmodels/statsmodels.git' i
 source directory.
 """
 
+# variables of hypothesis 1
+H1_CREDIT_RTG = Variables.RegressionData.DependentVar.H1_CREDIT_RTG
+H1_BASELINE = [Variables.RegressionData.IndependentVar.H1_ESG_RTG]
+H1_FULL = H1_BASELINE + [Variables.RegressionData.ControlVar.H1_SIZE,
+                         Variables.RegressionData.ControlVar.H1_LEV,
+                         Variables.RegressionData.ControlVar.H1_ICOV,
+                         Variables.RegressionData.ControlVar.H1_OMAR]
+
+# variables of hypothesis 2
+H2_CREDIT_RTG_CHANGE = Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE
+H2_BASELINE = [Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY]
+H2_EXTENDED = H2_BASELINE + [Variables.RegressionData.ControlVar.H2_AVG_SIZE,
+                             Variables.RegressionData.ControlVar.H2_AVG_LEV,
+                             Variables.RegressionData.ControlVar.H2_AVG_ICOV,
+                             Variables.RegressionData.ControlVar.H2_AVG_OMAR]
+H2_FULL = H2_EXTENDED + [Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY]
+H2_ALTERNATIVE = H2_BASELINE + H1_FULL[1:]
+
+# fixed effects of hypothesis 2 (the main dataset has one observation per company, i.e. no year)
+INDUSTRY_COUNTRY = ['INDUSTRY', 'COUNTRY']
+
+# industries of the industry breakdown
+INDUSTRIES = [Variables.RegressionData.INDUSTRY.INDUSTRY_1,
+              Variables.RegressionData.INDUSTRY.INDUSTRY_2,
+              Variables.RegressionData.INDUSTRY.INDUSTRY_3]
+
+
+def in_industry(industry: str) -> str:
+    """
+    Returns the sample query of a single industry.
+    """
+    return 'INDUSTRY == {!r}'.format(industry)
+
+
+def size_quantile(data, lower: float = None, upper: float = None):
+    """
+    Returns the mask of companies with SIZE at least at the lower quantile (or at most at the upper quantile).
+    """
+    size = data[Variables.RegressionData.ControlVar.H1_SIZE]
+    if lower is not None:
+        return size >= size.quantile(q=lower)
+
+    return size <= size.quantile(q=upper)
+
+
+# specifications of all regressions, grouped by the function of Regression() running them
+SPECS = {
+
+    # table 6 in the thesis
+    'h1_refinitiv': [
+        RegressionSpec('h1_refinitiv_baseline', 'h1_refinitiv', H1_CREDIT_RTG, H1_BASELINE,
+                       title='Main result for baseline regression of hypothesis 1 using dataset from Refinitiv...'),
+        RegressionSpec('h1_refinitiv_full', 'h1_refinitiv', H1_CREDIT_RTG, H1_FULL,
+                       title='Main result for full regression of hypothesis 1 using dataset from Refinitiv...'),
+    ],
+    'h1_spglobal': [
+        RegressionSpec('h1_spglobal_baseline', 'h1_spglobal', H1_CREDIT_RTG, H1_BASELINE,
+                       title='Main result for baseline regression of hypothesis 1 using dataset from S&P Global...'),
+        RegressionSpec('h1_spglobal_full', 'h1_spglobal', H1_CREDIT_RTG, H1_FULL,
+                       title='Main result for full regression of hypothesis 1 using dataset from S&P Global...'),
+    ],
+    'h1_sustainalytics': [
+        RegressionSpec('h1_sustainalytics_baseline', 'h1_sustainalytics', H1_CREDIT_RTG, H1_BASELINE,
+                       title='Main result for baseline regression of hypothesis 1 using dataset from Sustainalytics...'),
+        RegressionSpec('h1_sustainalytics_full', 'h1_sustainalytics', H1_CREDIT_RTG, H1_FULL,
+                       title='Main result for full regression of hypothesis 1 using dataset from Sustainalytics...'),
+    ],
+    'h2_main': [
+        RegressionSpec('h2_main_baseline', 'h2_main', H2_CREDIT_RTG_CHANGE, H2_BASELINE, INDUSTRY_COUNTRY,
+                       title='Main result for baseline regression of hypothesis 2 ...'),
+        RegressionSpec('h2_main_extended', 'h2_main', H2_CREDIT_RTG_CHANGE, H2_EXTENDED, INDUSTRY_COUNTRY,
+                       warm_start='h2_main_baseline',
+                       title='Main result for extended regression of hypothesis 2 ...'),
+        RegressionSpec('h2_main_full', 'h2_main', H2_CREDIT_RTG_CHANGE, H2_FULL, INDUSTRY_COUNTRY,
+                       warm_start='h2_main_extended',
+                       title='Main result for full regression of hypothesis 2 ...'),
+    ],
+
+    # Appendix B of the thesis
+    'h1_refinitiv_sub_sample_periods': [
+        RegressionSpec('h1_refinitiv_{}_{}'.format(start, end), 'h1_refinitiv', H1_CREDIT_RTG, H1_FULL,
+                       sample='{} <= year <= {}'.format(start, end), warm_start='h1_refinitiv_full',
+                       title='Main result for full regression of hypothesis 1 using dataset from Refinitiv '
+                             'between {} and {}...'.format(start, end))
+        for start, end in [(2006, 2012), (2013, 2019), (2006, 2010), (2011, 2015), (2016, 2019)]
+    ],
+    'h2_main_sub_sample_periods': [
+        RegressionSpec('h2_main_{}_{}'.format(start, end), 'h2_main_{}_{}'.format(start, end),
+                       H2_CREDIT_RTG_CHANGE, H2_FULL, INDUSTRY_COUNTRY, warm_start='h2_main_full',
+                       title='Main result for full regression of hypothesis 2 between {} and {} ...'.format(start, end))
+        for start, end in [(2006, 2016), (2010, 2019)]
+    ],
+
+    # Appendix C of the thesis
+    'h1_refinitiv_industry_breakdown': [
+        RegressionSpec('h1_refinitiv_industry_{}'.format(i), 'h1_refinitiv', H1_CREDIT_RTG, H1_FULL,
+                       sample=in_industry(industry),
+                       title='Main result of full regression of hypothesis 1 using Refinitiv dataset, '
+                             'separated by {} industry...'.format(industry))
+        for i, industry in enumerate(INDUSTRIES, start=1)
+    ],
+    'h2_main_industry_breakdown': [
+        RegressionSpec('h2_main_industry_{}'.format(i), 'h2_main', H2_CREDIT_RTG_CHANGE, H2_FULL, INDUSTRY_COUNTRY,
+                       sample=in_industry(industry),
+                       method='lbfgs' if industry == Variables.RegressionData.INDUSTRY.INDUSTRY_3 else 'bfgs',
+                       title='Main result of full regression of hypothesis 2, '
+                             'separated by {} industry...'.format(industry))
+        for i, industry in enumerate(INDUSTRIES, start=1)
+    ],
+
+    # Appendix D of the thesis
+    'h1_refinitiv_lagged': [
+        RegressionSpec('h1_refinitiv_lagged_12', 'h1_refinitiv', H1_CREDIT_RTG, H1_FULL,
+                       lags=dict.fromkeys(H1_FULL, 12),
+                       title='Main result for full regression of hypothesis 1 using dataset from Refinitiv '
+                             'with explanatory variables lagged by 12 months...'),
+        RegressionSpec('h1_refinitiv_lagged_24', 'h1_refinitiv', H1_CREDIT_RTG, H1_FULL,
+                       lags={**dict.fromkeys(H1_FULL, 12), Variables.RegressionData.IndependentVar.H1_ESG_RTG: 24},
+                       title='Main result for full regression of hypothesis 1 using dataset from Refinitiv '
+                             'with explanatory variables lagged by 24 months...'),
+    ],
+
+    # Appendix E of the thesis
+    'h2_alternative_models': [
+        RegressionSpec('h2_monthly_full', 'h2_monthly',
+                       Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE, H2_ALTERNATIVE,
+                       title='Main result for full regression of hypothesis 2 '
+                             'with monthly credit rating changes as dependent variable ...'),
+        RegressionSpec('h2_yearly_full', 'h2_yearly',
+                       Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE, H2_ALTERNATIVE,
+                       title='Main result for full regression of hypothesis 2 '
+                             'with yearly credit rating changes as dependent variable ...'),
+    ],
+
+    # Appendix F of the thesis
+    'h1_size_impact': [
+        RegressionSpec('h1_refinitiv_size_top_25', 'h1_refinitiv', H1_CREDIT_RTG, H1_FULL,
+                       sample=partial(size_quantile, lower=0.75), warm_start='h1_refinitiv_full',
+                       title='Main result for full regression of hypothesis 1 using Refinitiv dataset '
+                             'with top 25% quantile...'),
+        RegressionSpec('h1_refinitiv_size_bottom_25', 'h1_refinitiv', H1_CREDIT_RTG, H1_FULL,
+                       sample=partial(size_quantile, upper=0.25), warm_start='h1_refinitiv_full',
+                       title='Main result for full regression of hypothesis 1 using Refinitiv dataset '
+                             'with bottom 25% quantile...'),
+    ],
+}
+
+# functions of Regression() run by each mode of Regression().control()
+MODES = {
+    'main': ['h1_refinitiv', 'h1_spglobal', 'h1_sustainalytics', 'h2_main'],
+    'sub-periods': ['h1_refinitiv_sub_sample_periods', 'h2_main_sub_sample_periods'],
+    'industry-breakdown': ['h1_refinitiv_industry_breakdown', 'h2_main_industry_breakdown'],
+    'endogeneity': ['h1_refinitiv_lagged'],
+    'alternative-model': ['h2_alternative_models'],
+    'size-impact': ['h1_size_impact'],
+}
+
+# functions of Regression() reported in each table of the thesis
+TABLES = {
+    'table_6': MODES['main'],
+    'appendix_b': MODES['sub-periods'],
+    'appendix_c': MODES['industry-breakdown'],
+    'appendix_d': MODES['endogeneity'],
+    'appendix_e': MODES['alternative-model'],
+    'appendix_f': MODES['size-impact'],
+}
+
+
+def table_specs(table: str) -> list:
+    """
+    Returns the names of the specifications reported in a table of the thesis, e.g. table_specs('table_6').
+    """
+    return [spec.name for name in TABLES[table] for spec in SPECS[name]]
+
 
 class Regression:
     """
     Run main regression as well as additional analyses for two hypotheses
+
+    :param jobs: number of processes fitting the regressions of a mode in parallel (1: one after another)
+    :param method: (optional) optimizer used for all regressions instead of the one of their specification,
+    e.g. 'trust-exact' (OrderedLogit with analytic Hessian, see lib/ordered_logit.py)
+    :param store: (optional) ResultStore in which the results are saved, by default under 'data/regression_results'
     """
 
-    def __init__(self):
+    def __init__(self, jobs: int = 1, method: str = None, store: ResultStore = None):
         self.regression_data_dict = ExtractData().extract_regression_data()
 
+        # data of hypothesis 2 is re-generated for the sub sample periods (only when needed)
+        self.sub_periods = LazyDataDict({'h2_main': self.h2_main_periods})
+        self.datasets = LazyDataDict({
+            **{name: partial(self.regression_data_dict.__getitem__, name) for name in self.regression_data_dict},
+            'h2_main_2006_2016': lambda: self.sub_periods['h2_main'][(2006, 2016)],
+            'h2_main_2010_2019': lambda: self.sub_periods['h2_main'][(2010, 2019)],
+        })
+        self.store = store if store is not None else ResultStore()
+        self.runner = SpecRunner(self.datasets, jobs=jobs, method=method, store=self.store)
+
     def control(self, mode='main'):
         """
         This function runs main regressions and additional analyses for both hypotheses.
@@ -48,34 +249,34 @@ class Regression:
             - 'alternative-model': run alternative regression models for hypothesis 2
             - 'size-impact': run additional analyses for size impact for hypothesis 1
 
-        The results will be printed out in the console.
+        All regressions of a mode are run as one batch (see SPECS and MODES), in parallel with Regression(jobs=4).
+        The results will be printed out in the console and saved in the result store (see table()).
         Note: the regression may take long time to execute and print results in the console.
         """
+        if mode in MODES:
+            return self.run([spec for name in MODES[mode] for spec in SPECS[name]])
 
-        if mode == 'main':
-            self.h1_refinitiv()
-            self.h1_spglobal()
-            self.h1_sustainalytics()
-            self.h2_main()
-
-        # additional analysis
-
-        elif mode == 'sub-periods':
-            self.h1_refinitiv_sub_sample_periods()
-            self.h2_main_sub_sample_periods()
-
-        elif mode == 'industry-breakdown':
-            self.h1_refinitiv_industry_breakdown()
-            self.h2_main_industry_breakdown()
+    def run(self, specs: list, verbose: bool = True) -> dict:
+        """
+        Run a batch of regression specifications, returns their results keyed by the names of the specifications.
+        """
+        return self.runner.run(specs, verbose=verbose)
 
-        elif mode == 'endogeneity':
-            self.h1_refinitiv_lagged()
+    def table(self, table: str = 'table_6', **kwargs) -> pd.DataFrame:
+        """
+        Render a table of the thesis ('table_6', 'appendix_b', ..., 'appendix_f') from the stored results,
+        the regressions of the table must have been run before (e.g. with control(mode='main') for table 6).
 
-        elif mode == 'alternative-model':
-            self.h2_alternative_models()
+        :param kwargs: options of ResultStore().table(), e.g. thresholds=True
+        """
+        return self.store.table(table_specs(table), **kwargs)
 
-        elif mode == 'size-impact':
-            self.h1_size_impact()
+    def h2_main_periods(self) -> dict:
+        """
+        Re-generate data of hypothesis 2 for both sub sample periods (2006 - 2016 and 2010 - 2019) in one pass.
+        """
+        return PrepareData().hypothesis2_main_periods(h2_monthly=self.regression_data_dict['h2_monthly'],
+                                                      periods=[(2006, 2016), (2010, 2019)])
 
     def h1_refinitiv(self) -> None:
         """
@@ -98,56 +299,7 @@ class Regression:
 
         The regression results are printed in the console and are used to report table 6 in the thesis.
         """
-        data = self.regression_data_dict['h1_refinitiv'].copy(deep=True)
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = data[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # baseline model (1)
-        base_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    data[[
-                                        Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                        2007, 2008, 2009, 2010, 2011, 2012, 2013,
-                                        # year dummies (exclude one year, which is used as reference)
-                                        2014, 2015, 2016, 2017, 2018, 2019,
-                                        'Energy and Natural Resources', 'Utility',
-                                        # industry dummies (exclude one industry, which is used as reference)
-                                        'BELGIUM',  # country dummies (exclude one country, which is used as reference)
-                                        'BRITAIN', 'CZECH', 'DENMARK', 'FINLAND', 'FRANCE', 'GERMANY', 'GREECE',
-                                        'HUNGARY', 'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY',
-                                        'POLAND', 'PORTUGAL', 'RUSSIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY',
-                                    ]],
-                                    distr='logit')
-        res_log = base_mod_log.fit(method='bfgs')
-        print('Main result for baseline regression of hypothesis 1 using dataset from Refinitiv...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        # full model (2)
-        full_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    data[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                          Variables.RegressionData.ControlVar.H1_SIZE,
-                                          Variables.RegressionData.ControlVar.H1_LEV,
-                                          Variables.RegressionData.ControlVar.H1_ICOV,
-                                          Variables.RegressionData.ControlVar.H1_OMAR,
-                                          2007, 2008, 2009, 2010, 2011, 2012,
-                                          2013, 2014, 2015, 2016, 2017, 2018, 2019,
-                                          'Energy and Natural Resources', 'Utility',
-                                          'BELGIUM', 'BRITAIN', 'CZECH', 'DENMARK', 'FINLAND', 'FRANCE', 'GERMANY',
-                                          'GREECE', 'HUNGARY', 'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS',
-                                          'NORWAY',
-                                          'POLAND', 'PORTUGAL', 'RUSSIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY',
-                                          ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using dataset from Refinitiv...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
+        self.run(SPECS['h1_refinitiv'])
 
     def h1_spglobal(self) -> None:
         """
@@ -170,95 +322,7 @@ class Regression:
 
         The regression results are printed in the console and are used to report table 6 in the thesis.
         """
-        data = self.regression_data_dict['h1_spglobal']
-
-        # convert credit rating to categorical variable
-        change_type = CategoricalDtype(
-            categories=sorted(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = data[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logit regression
-
-        # baseline model (1)
-        base_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    data[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                          2017,  # year dummies (exclude one year, which is used as reference)
-                                          2018,
-                                          2019,
-                                          2020,
-                                          'Energy and Natural Resources',
-                                          # industry dummies (exclude one industry, which is used as reference)
-                                          'Utility',
-                                          'BELGIUM',
-                                          # country dummies (exclude one country, which is used as reference)
-                                          'BRITAIN',
-                                          'CZECH',
-                                          'DENMARK',
-                                          'FINLAND',
-                                          'FRANCE',
-                                          'GERMANY',
-                                          'GREECE',
-                                          'HUNGARY',
-                                          'IRELAND',
-                                          'ITALY',
-                                          'LUXEMBOURG',
-                                          'NETHERLANDS',
-                                          'NORWAY',
-                                          'PORTUGAL',
-                                          'RUSSIA',
-                                          'SPAIN',
-                                          'SWEDEN',
-                                          'SWITZERLAND'
-                                          ]],
-                                    distr='logit')
-        res_log = base_mod_log.fit(method='bfgs')
-        print('Main result for baseline regression of hypothesis 1 using dataset from S&P Global...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        # full model (2)
-        full_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    data[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                          Variables.RegressionData.ControlVar.H1_SIZE,
-                                          Variables.RegressionData.ControlVar.H1_LEV,
-                                          Variables.RegressionData.ControlVar.H1_ICOV,
-                                          Variables.RegressionData.ControlVar.H1_OMAR,
-                                          2017,  # year dummies (exclude one year, which is used as reference)
-                                          2018,
-                                          2019,
-                                          2020,
-                                          'Energy and Natural Resources',
-                                          # industry dummies (exclude one industry, which is used as reference)
-                                          'Utility',
-                                          'BELGIUM',
-                                          # country dummies (exclude one country, which is used as reference)
-                                          'BRITAIN',
-                                          'CZECH',
-                                          'DENMARK',
-                                          'FINLAND',
-                                          'FRANCE',
-                                          'GERMANY',
-                                          'GREECE',
-                                          'HUNGARY',
-                                          'IRELAND',
-                                          'ITALY',
-                                          'LUXEMBOURG',
-                                          'NETHERLANDS',
-                                          'NORWAY',
-                                          'PORTUGAL',
-                                          'RUSSIA',
-                                          'SPAIN',
-                                          'SWEDEN',
-                                          'SWITZERLAND'
-                                          ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using dataset from S&P Global...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
+        self.run(SPECS['h1_spglobal'])
 
     def h1_sustainalytics(self):
         """
@@ -281,93 +345,7 @@ class Regression:
 
         The regression results are printed in the console and are used to report table 6 in the thesis.
         """
-        data = self.regression_data_dict['h1_sustainalytics']
-
-        # convert credit rating to categorical variable
-        change_type = CategoricalDtype(
-            categories=sorted(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = data[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logit regression
-
-        # baseline model (1)
-        base_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    data[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                          2015,  # year dummies (exclude one year, which is used as reference)
-                                          2016,
-                                          2017,
-                                          2018,
-                                          2019,
-                                          2020,
-                                          'Energy and Natural Resources',
-                                          # industry dummies (exclude one industry, which is used as reference)
-                                          'Utility',
-                                          'BELGIUM',
-                                          # country dummies (exclude one country, which is used as reference)
-                                          'BRITAIN',
-                                          'CZECH',
-                                          'DENMARK',
-                                          'FINLAND',
-                                          'FRANCE',
-                                          'GERMANY',
-                                          'IRELAND',
-                                          'ITALY',
-                                          'LUXEMBOURG',
-                                          'NETHERLANDS',
-                                          'NORWAY',
-                                          'PORTUGAL',
-                                          'SPAIN',
-                                          'SWEDEN',
-                                          'SWITZERLAND',
-                                          ]],
-                                    distr='logit')
-        res_log = base_mod_log.fit(method='bfgs')
-        print('Main result for baseline regression of hypothesis 1 using dataset from Sustainalytics...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        # full model (2)
-        full_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    data[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                          Variables.RegressionData.ControlVar.H1_SIZE,
-                                          Variables.RegressionData.ControlVar.H1_LEV,
-                                          Variables.RegressionData.ControlVar.H1_ICOV,
-                                          Variables.RegressionData.ControlVar.H1_OMAR,
-                                          2015,  # year dummies (exclude one year, which is used as reference)
-                                          2016,
-                                          2017,
-                                          2018,
-                                          2019,
-                                          2020,
-                                          'Energy and Natural Resources',
-                                          # industry dummies (exclude one industry, which is used as reference)
-                                          'Utility',
-                                          'BELGIUM',
-                                          # country dummies (exclude one country, which is used as reference)
-                                          'BRITAIN',
-                                          'CZECH',
-                                          'DENMARK',
-                                          'FINLAND',
-                                          'FRANCE',
-                                          'GERMANY',
-                                          'IRELAND',
-                                          'ITALY',
-                                          'LUXEMBOURG',
-                                          'NETHERLANDS',
-                                          'NORWAY',
-                                          'PORTUGAL',
-                                          'SPAIN',
-                                          'SWEDEN',
-                                          'SWITZERLAND'
-                                          ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using dataset from Sustainalytics...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
+        self.run(SPECS['h1_sustainalytics'])
 
     def h2_main(self) -> None:
         """
@@ -396,75 +374,7 @@ class Regression:
         The regression results are printed in the console and are used to report table 6 in the thesis.
 
         """
-        data = self.regression_data_dict['h2_main'].copy(deep=True)
-
-        # convert credit rating changes to categorical variable
-        change_type = CategoricalDtype(
-            categories=sorted(data[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].unique()), ordered=True)
-        data[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE] = data[
-            Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].astype(change_type)
-
-        # baseline model (1)
-        extended_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE],
-                                        data[[
-                                            Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                            'Energy and Natural Resources', 'Utility',
-                                            'AZERBAIJAN', 'BELGIUM', 'BRITAIN', 'CROATIA', 'CZECH', 'DENMARK',
-                                            'ESTONIA', 'FINLAND', 'FRANCE', 'GERMANY', 'GREECE', 'HUNGARY',
-                                            'ICELAND', 'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY',
-                                            'POLAND', 'PORTUGAL', 'RUSSIA', 'SLOVAKIA', 'SLOVENIA',
-                                            'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY', 'UKRAINE'
-                                        ]],
-                                        distr='logit')
-        res_log = extended_mod_log.fit(method='bfgs')
-        print('Main result for baseline regression of hypothesis 2 ...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        # extended model (2)
-        extended_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE],
-                                        data[[
-                                            Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                            Variables.RegressionData.ControlVar.H2_AVG_SIZE,
-                                            Variables.RegressionData.ControlVar.H2_AVG_LEV,
-                                            Variables.RegressionData.ControlVar.H2_AVG_ICOV,
-                                            Variables.RegressionData.ControlVar.H2_AVG_OMAR,
-                                            'Energy and Natural Resources', 'Utility',
-                                            'AZERBAIJAN', 'BELGIUM', 'BRITAIN', 'CROATIA', 'CZECH', 'DENMARK',
-                                            'ESTONIA', 'FINLAND', 'FRANCE', 'GERMANY', 'GREECE', 'HUNGARY',
-                                            'ICELAND', 'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS',
-                                            'NORWAY', 'POLAND', 'PORTUGAL', 'RUSSIA', 'SLOVAKIA', 'SLOVENIA',
-                                            'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY', 'UKRAINE'
-                                        ]],
-                                        distr='logit')
-        res_log = extended_mod_log.fit(method='bfgs')
-        print('Main result for extended regression of hypothesis 2 ...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        # full model (3)
-        full_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE],
-                                    data[[
-                                        Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                        Variables.RegressionData.ControlVar.H2_AVG_SIZE,
-                                        Variables.RegressionData.ControlVar.H2_AVG_LEV,
-                                        Variables.RegressionData.ControlVar.H2_AVG_ICOV,
-                                        Variables.RegressionData.ControlVar.H2_AVG_OMAR,
-                                        Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY,
-                                        'Energy and Natural Resources', 'Utility',
-                                        'AZERBAIJAN', 'BELGIUM', 'BRITAIN', 'CROATIA', 'CZECH', 'DENMARK', 'ESTONIA',
-                                        'FINLAND', 'FRANCE', 'GERMANY', 'GREECE', 'HUNGARY', 'ICELAND', 'IRELAND',
-                                        'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY', 'POLAND', 'PORTUGAL', 'RUSSIA',
-                                        'SLOVAKIA', 'SLOVENIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY', 'UKRAINE'
-                                    ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 2 ...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
+        self.run(SPECS['h2_main'])
 
     def h1_refinitiv_sub_sample_periods(self) -> None:
         """
@@ -475,261 +385,11 @@ class Regression:
             - 2011 -> 2015
             - 2016 -> 2019
 
-        Reason for repetition:
-            - some dummies are redundant after slicing data and hence column names used in the regression will be changed.
-            - lose some observations: affect the categorical dependent variable, which is generated based on the dataset
+        Dummies of years and countries that are not observed in a sub sample are left out automatically.
 
         Regression results are printed out in the console and used to report data in Appendix B of the thesis.
         """
-        data = self.regression_data_dict['h1_refinitiv'].copy(deep=True)
-
-        #
-        # 2006 - 2012
-        #
-        sub_data1 = data.loc[(data['year'] >= 2006) & (data['year'] <= 2012)].copy(deep=True)
-        sub_data1 = sub_data1.loc[:, (sub_data1 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data1[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data1[[
-                                        Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                        Variables.RegressionData.ControlVar.H1_SIZE,
-                                        Variables.RegressionData.ControlVar.H1_LEV,
-                                        Variables.RegressionData.ControlVar.H1_ICOV,
-                                        Variables.RegressionData.ControlVar.H1_OMAR,
-                                        2007, 2008, 2009, 2010, 2011, 2012,
-                                        'Energy and Natural Resources', 'Utility',
-                                        'BELGIUM', 'BRITAIN', 'CZECH', 'FINLAND', 'FRANCE', 'GERMANY', 'GREECE',
-                                        'HUNGARY', 'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY',
-                                        'POLAND', 'PORTUGAL', 'RUSSIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY'
-                                    ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using dataset from Refinitiv between 2006 and 2012...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        #
-        # 2013 - 2019
-        #
-        sub_data2 = data.loc[(data['year'] >= 2013) & (data['year'] <= 2019)].copy(deep=True)
-        sub_data2 = sub_data2.loc[:, (sub_data2 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data2[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data2[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                               Variables.RegressionData.ControlVar.H1_SIZE,
-                                               Variables.RegressionData.ControlVar.H1_LEV,
-                                               Variables.RegressionData.ControlVar.H1_ICOV,
-                                               Variables.RegressionData.ControlVar.H1_OMAR,
-                                               2014,
-                                               2015,
-                                               2016,
-                                               2017,
-                                               2018,
-                                               2019,
-                                               'Energy and Natural Resources',
-                                               'Utility',
-                                               'BELGIUM',
-                                               'BRITAIN',
-                                               'CZECH',
-                                               'DENMARK',
-                                               'FINLAND',
-                                               'FRANCE',
-                                               'GERMANY',
-                                               'GREECE',
-                                               'HUNGARY',
-                                               'IRELAND',
-                                               'ITALY',
-                                               'LUXEMBOURG',
-                                               'NETHERLANDS',
-                                               'NORWAY',
-                                               'POLAND',
-                                               'PORTUGAL',
-                                               'RUSSIA',
-                                               'SPAIN',
-                                               'SWEDEN',
-                                               'SWITZERLAND',
-                                               'TURKEY'
-                                               ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using dataset from Refinitiv between 2013 and 2019...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        #
-        # 2006 - 2010
-        #
-        sub_data3 = data.loc[(data['year'] >= 2006) & (data['year'] <= 2010)].copy(deep=True)
-        sub_data3 = sub_data3.loc[:, (sub_data3 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data3[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data3[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data3[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(sub_data3[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data3[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                               Variables.RegressionData.ControlVar.H1_SIZE,
-                                               Variables.RegressionData.ControlVar.H1_LEV,
-                                               Variables.RegressionData.ControlVar.H1_ICOV,
-                                               Variables.RegressionData.ControlVar.H1_OMAR,
-                                               2007,
-                                               2008,
-                                               2009,
-                                               2010,
-                                               'Energy and Natural Resources',
-                                               'Utility',
-                                               'BELGIUM',
-                                               'BRITAIN',
-                                               'CZECH',
-                                               'FINLAND',
-                                               'FRANCE',
-                                               'GERMANY',
-                                               'GREECE',
-                                               'HUNGARY',
-                                               'IRELAND',
-                                               'ITALY',
-                                               'LUXEMBOURG',
-                                               'NETHERLANDS',
-                                               'NORWAY',
-                                               'POLAND',
-                                               'PORTUGAL',
-                                               'RUSSIA',
-                                               'SPAIN',
-                                               'SWEDEN',
-                                               'SWITZERLAND',
-                                               'TURKEY'
-                                               ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using dataset from Refinitiv between 2006 and 2010...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        #
-        # 2011 - 2015
-        #
-        sub_data4 = data.loc[(data['year'] >= 2011) & (data['year'] <= 2015)].copy(deep=True)
-        sub_data4 = sub_data4.loc[:, (sub_data4 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data4[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data4[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data4[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(sub_data4[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data4[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                               Variables.RegressionData.ControlVar.H1_SIZE,
-                                               Variables.RegressionData.ControlVar.H1_LEV,
-                                               Variables.RegressionData.ControlVar.H1_ICOV,
-                                               Variables.RegressionData.ControlVar.H1_OMAR,
-                                               2012,
-                                               2013,
-                                               2014,
-                                               2015,
-                                               'Energy and Natural Resources',
-                                               'Utility',
-                                               'BELGIUM',
-                                               'BRITAIN',
-                                               'CZECH',
-                                               'DENMARK',
-                                               'FINLAND',
-                                               'FRANCE',
-                                               'GERMANY',
-                                               'GREECE',
-                                               'HUNGARY',
-                                               'IRELAND',
-                                               'ITALY',
-                                               'LUXEMBOURG',
-                                               'NETHERLANDS',
-                                               'NORWAY',
-                                               'POLAND',
-                                               'PORTUGAL',
-                                               'RUSSIA',
-                                               'SPAIN',
-                                               'SWEDEN',
-                                               'SWITZERLAND',
-                                               'TURKEY'
-                                               ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using dataset from Refinitiv between 2011 and 2015...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        #
-        # 2016 - 2019
-        #
-        sub_data5 = data.loc[(data['year'] >= 2016) & (data['year'] <= 2019)].copy(deep=True)
-        sub_data5 = sub_data5.loc[:, (sub_data5 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data5[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data5[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data5[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(sub_data5[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data5[[Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                               Variables.RegressionData.ControlVar.H1_SIZE,
-                                               Variables.RegressionData.ControlVar.H1_LEV,
-                                               Variables.RegressionData.ControlVar.H1_ICOV,
-                                               Variables.RegressionData.ControlVar.H1_OMAR,
-                                               2017,
-                                               2018,
-                                               2019,
-                                               'Energy and Natural Resources',
-                                               'Utility',
-                                               'BELGIUM',
-                                               'BRITAIN',
-                                               'CZECH',
-                                               'DENMARK',
-                                               'FINLAND',
-                                               'FRANCE',
-                                               'GERMANY',
-                                               'GREECE',
-                                               'HUNGARY',
-                                               'IRELAND',
-                                               'ITALY',
-                                               'LUXEMBOURG',
-                                               'NETHERLANDS',
-                                               'NORWAY',
-                                               'PORTUGAL',
-                                               'RUSSIA',
-                                               'SPAIN',
-                                               'SWEDEN',
-                                               'SWITZERLAND',
-                                               'TURKEY'
-                                               ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using dataset from Refinitiv between 2016 and 2019...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
+        self.run(SPECS['h1_refinitiv_sub_sample_periods'])
 
     def h2_main_sub_sample_periods(self) -> None:
         """
@@ -737,88 +397,11 @@ class Regression:
             - 2006 -> 2016
             - 2010 -> 2019
 
-        Reason for code repetition:
-            - some dummies are redundant after slicing data and hence column names used in the regression will be changed.
-            - lose some observations: affect the categorical dependent variable, which is generated based on the dataset
+        The data of hypothesis 2 is re-generated for each period (see h2_main_periods()).
 
         Regression results are printed out in the console and used to report data in Appendix B of the thesis.
         """
-
-        #
-        # 2006 - 2016
-        #
-
-        # re-generate data
-        sub_data1 = PrepareData().hypothesis2_main(h2_monthly=self.regression_data_dict['h2_monthly'], start_year=2006,
-                                                   end_year=2016)
-
-        # convert credit rating changes to categorical variable
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data1[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].unique()),
-            ordered=True)
-        sub_data1[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE] = sub_data1[
-            Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log1 = OrderedModel(sub_data1[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE],
-                                     sub_data1[[Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                                Variables.RegressionData.ControlVar.H2_AVG_SIZE,
-                                                Variables.RegressionData.ControlVar.H2_AVG_LEV,
-                                                Variables.RegressionData.ControlVar.H2_AVG_ICOV,
-                                                Variables.RegressionData.ControlVar.H2_AVG_OMAR,
-                                                Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY,
-                                                'Energy and Natural Resources', 'Utility',
-                                                'AZERBAIJAN', 'BELGIUM', 'BRITAIN', 'CROATIA', 'CZECH', 'DENMARK',
-                                                'ESTONIA', 'FINLAND', 'FRANCE', 'GERMANY', 'GREECE', 'HUNGARY',
-                                                'ICELAND',
-                                                'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY', 'POLAND',
-                                                'PORTUGAL', 'RUSSIA', 'SLOVAKIA', 'SLOVENIA', 'SPAIN', 'SWEDEN',
-                                                'SWITZERLAND', 'TURKEY', 'UKRAINE'
-                                                ]],
-                                     distr='logit')
-        res_log1 = full_mod_log1.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 2 between 2006 and 2016 ...')
-        print(res_log1.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log1.prsquared)
-
-        #
-        # 2010 - 2019
-        #
-
-        # re-generate data
-        sub_data2 = PrepareData().hypothesis2_main(h2_monthly=self.regression_data_dict['h2_monthly'], start_year=2010,
-                                                   end_year=2019)
-
-        # convert credit rating changes to categorical variable
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data2[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].unique()),
-            ordered=True)
-        sub_data2[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE] = sub_data2[
-            Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log2 = OrderedModel(sub_data2[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE],
-                                     sub_data2[[Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                                Variables.RegressionData.ControlVar.H2_AVG_SIZE,
-                                                Variables.RegressionData.ControlVar.H2_AVG_LEV,
-                                                Variables.RegressionData.ControlVar.H2_AVG_ICOV,
-                                                Variables.RegressionData.ControlVar.H2_AVG_OMAR,
-                                                Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY,
-                                                'Energy and Natural Resources', 'Utility',
-                                                'AZERBAIJAN', 'BELGIUM', 'BRITAIN', 'CROATIA', 'CZECH', 'DENMARK',
-                                                'ESTONIA', 'FINLAND', 'FRANCE', 'GERMANY', 'GREECE', 'HUNGARY',
-                                                'ICELAND',
-                                                'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY', 'POLAND',
-                                                'PORTUGAL', 'RUSSIA', 'SLOVAKIA', 'SLOVENIA', 'SPAIN', 'SWEDEN',
-                                                'SWITZERLAND', 'TURKEY', 'UKRAINE'
-                                                ]],
-                                     distr='logit')
-        res_log2 = full_mod_log2.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 2 between 2010 and 2019 ...')
-        print(res_log2.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log2.prsquared)
+        self.run(SPECS['h2_main_sub_sample_periods'])
 
     def h1_refinitiv_industry_breakdown(self) -> None:
         """
@@ -827,224 +410,20 @@ class Regression:
             - 'Energy and Natural Resources'
             - 'Utility'
 
-        Reason for repetition:
-            - some dummies are redundant after slicing data and hence column names used in the regression will be changed.
-            - lose some observations: affect the categorical dependent variable, which is generated based on the dataset
-
         Regression results are printed out in the console and used to report data in Appendix C of the thesis.
         """
-        data = self.regression_data_dict['h1_refinitiv'].copy(deep=True)
-
-        #
-        # Aerospace/Automotive/Capital Goods/Metal
-        #
-        sub_data1 = data.loc[data['INDUSTRY'] == Variables.RegressionData.INDUSTRY.INDUSTRY_1].copy(deep=True)
-        sub_data1 = sub_data1.loc[:, (sub_data1 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data1[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log1 = OrderedModel(sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                     sub_data1[[
-                                         Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                         Variables.RegressionData.ControlVar.H1_SIZE,
-                                         Variables.RegressionData.ControlVar.H1_LEV,
-                                         Variables.RegressionData.ControlVar.H1_ICOV,
-                                         Variables.RegressionData.ControlVar.H1_OMAR,
-                                         2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019,
-                                         'BRITAIN', 'FINLAND', 'FRANCE', 'GERMANY', 'IRELAND', 'ITALY',
-                                         'LUXEMBOURG', 'RUSSIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY'
-                                     ]],
-                                     distr='logit')
-        res_log1 = full_mod_log1.fit(method='bfgs')
-        print(
-            'Main result of full regression of hypothesis 1 using Refinitiv dataset, separated by Aerospace/Automotive/Capital Goods/Metal industry...')
-        print(res_log1.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log1.prsquared)
-
-        #
-        # Energy and Natural Resources
-        #
-        sub_data2 = data.loc[data['INDUSTRY'] == Variables.RegressionData.INDUSTRY.INDUSTRY_2].copy(deep=True)
-        sub_data2 = sub_data2.loc[:, (sub_data2 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data2[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log2 = OrderedModel(sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                     sub_data2[[
-                                         Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                         Variables.RegressionData.ControlVar.H1_SIZE,
-                                         Variables.RegressionData.ControlVar.H1_LEV,
-                                         Variables.RegressionData.ControlVar.H1_ICOV,
-                                         Variables.RegressionData.ControlVar.H1_OMAR,
-                                         2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019,
-                                         'BRITAIN', 'DENMARK', 'FRANCE', 'HUNGARY', 'ITALY', 'NETHERLANDS',
-                                         'NORWAY', 'RUSSIA', 'SPAIN'
-                                     ]],
-                                     distr='logit')
-        res_log2 = full_mod_log2.fit(method='bfgs')
-        print(
-            'Main result of full regression of hypothesis 1 using Refinitiv dataset, separated by Energy and Natural Resources industry...')
-        print(res_log2.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log2.prsquared)
-
-        #
-        # Utility
-        #
-        sub_data3 = data.loc[data['INDUSTRY'] == Variables.RegressionData.INDUSTRY.INDUSTRY_3].copy(deep=True)
-        sub_data3 = sub_data3.loc[:, (sub_data3 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data3[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data3[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data3[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log3 = OrderedModel(sub_data3[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                     sub_data3[[
-                                         Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                         Variables.RegressionData.ControlVar.H1_SIZE,
-                                         Variables.RegressionData.ControlVar.H1_LEV,
-                                         Variables.RegressionData.ControlVar.H1_ICOV,
-                                         Variables.RegressionData.ControlVar.H1_OMAR,
-                                         2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019,
-                                         'BELGIUM', 'BRITAIN', 'CZECH', 'DENMARK', 'FINLAND', 'FRANCE', 'GERMANY',
-                                         'GREECE', 'ITALY', 'POLAND', 'PORTUGAL', 'RUSSIA', 'SPAIN'
-                                     ]],
-                                     distr='logit')
-        res_log3 = full_mod_log3.fit(method='bfgs')
-        print(
-            'Main result of full regression of hypothesis 1 using Refinitiv dataset, separated by Utility industry...')
-        print(res_log3.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log3.prsquared)
+        self.run(SPECS['h1_refinitiv_industry_breakdown'])
 
     def h2_main_industry_breakdown(self) -> None:
         """
         Re-run full regression as in h2_main() but breaking the sample into a single industry:
             - 'Aerospace/Automotive/Capital Goods/Metal'
             - 'Energy and Natural Resources'
-            - 'Utility'
-
-        Reason for repetition:
-            - some dummies are redundant after slicing data and hence column names used in the regression will be changed.
-            - lose some observations: affect the categorical dependent variable, which is generated based on the dataset
+            - 'Utility' (fitted with lbfgs)
 
         Regression results are printed out in the console and used to report data in Appendix C of the thesis.
         """
-        data = self.regression_data_dict['h2_main'].copy(deep=True)
-
-        #
-        # Aerospace/Automotive/Capital Goods/Metal
-        #
-        sub_data1 = data.loc[data['INDUSTRY'] == Variables.RegressionData.INDUSTRY.INDUSTRY_1].copy(deep=True)
-        sub_data1 = sub_data1.loc[:, (sub_data1 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data1[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].unique()),
-            ordered=True)
-        sub_data1[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE] = sub_data1[
-            Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log1 = OrderedModel(sub_data1[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE],
-                                     sub_data1[[
-                                         Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                         Variables.RegressionData.ControlVar.H2_AVG_SIZE,
-                                         Variables.RegressionData.ControlVar.H2_AVG_LEV,
-                                         Variables.RegressionData.ControlVar.H2_AVG_ICOV,
-                                         Variables.RegressionData.ControlVar.H2_AVG_OMAR,
-                                         Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY,
-                                         'BRITAIN', 'DENMARK', 'FINLAND', 'FRANCE', 'GERMANY',
-                                         'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'RUSSIA', 'SPAIN',
-                                         'SWEDEN', 'SWITZERLAND', 'TURKEY'
-                                     ]],
-                                     distr='logit')
-        res_log1 = full_mod_log1.fit(method='bfgs')
-        print(
-            'Main result of full regression of hypothesis 2, separated by Aerospace/Automotive/Capital Goods/Metal industry...')
-        print(res_log1.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log1.prsquared)
-
-        #
-        # Energy and Natural Resources
-        #
-        sub_data2 = data.loc[data['INDUSTRY'] == Variables.RegressionData.INDUSTRY.INDUSTRY_2].copy(deep=True)
-        sub_data2 = sub_data2.loc[:, (sub_data2 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data2[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].unique()),
-            ordered=True)
-        sub_data2[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE] = sub_data2[
-            Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log2 = OrderedModel(sub_data2[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE],
-                                     sub_data2[[
-                                         Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                         Variables.RegressionData.ControlVar.H2_AVG_SIZE,
-                                         Variables.RegressionData.ControlVar.H2_AVG_LEV,
-                                         Variables.RegressionData.ControlVar.H2_AVG_ICOV,
-                                         Variables.RegressionData.ControlVar.H2_AVG_OMAR,
-                                         Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY,
-                                         'BELGIUM', 'BRITAIN', 'DENMARK', 'FRANCE', 'HUNGARY', 'ITALY',
-                                         'NETHERLANDS', 'NORWAY', 'RUSSIA', 'SLOVENIA', 'SPAIN', 'UKRAINE'
-                                     ]],
-                                     distr='logit')
-        res_log2 = full_mod_log2.fit(method='bfgs')
-        print('Main result of full regression of hypothesis 2, separated by Energy and Natural Resources industry...')
-        print(res_log2.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log2.prsquared)
-
-        #
-        # Utility
-        #
-        sub_data3 = data.loc[data['INDUSTRY'] == Variables.RegressionData.INDUSTRY.INDUSTRY_3].copy(deep=True)
-        sub_data3 = sub_data3.loc[:, (sub_data3 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data3[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].unique()),
-            ordered=True)
-        sub_data3[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE] = sub_data3[
-            Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log3 = OrderedModel(sub_data3[Variables.RegressionData.DependentVar.H2_CREDIT_RTG_CHANGE],
-                                     sub_data3[[
-                                         Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                         Variables.RegressionData.ControlVar.H2_AVG_SIZE,
-                                         Variables.RegressionData.ControlVar.H2_AVG_LEV,
-                                         Variables.RegressionData.ControlVar.H2_AVG_ICOV,
-                                         Variables.RegressionData.ControlVar.H2_AVG_OMAR,
-                                         Variables.RegressionData.ControlVar.H2_LONG_TERM_DUMMY,
-                                         'BELGIUM', 'BRITAIN', 'CROATIA', 'CZECH', 'DENMARK', 'ESTONIA', 'FINLAND',
-                                         'FRANCE',
-                                         'GERMANY', 'GREECE', 'ICELAND', 'IRELAND', 'ITALY', 'NETHERLANDS',
-                                         'NORWAY', 'POLAND', 'PORTUGAL', 'RUSSIA', 'SLOVAKIA', 'SPAIN', 'SWEDEN'
-                                     ]],
-                                     distr='logit')
-        res_log3 = full_mod_log3.fit(method='lbfgs')
-        print('Main result of full regression of hypothesis 2, separated by Utility industry...')
-        print(res_log3.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log3.prsquared)
+        self.run(SPECS['h2_main_industry_breakdown'])
 
     def h1_refinitiv_lagged(self) -> None:
         """
@@ -1052,274 +431,25 @@ class Regression:
             - ESG_RTG lagged by 12 months or 24 months
             - financial control variables lagged by 12 months
 
-        Reason for repetition:
-            - some dummies are redundant after slicing data and hence column names used in the regression will be changed.
-            - lose some observations: affect the categorical dependent variable, which is generated based on the dataset
-
         Regression results are printed out in the console and used to report data in Appendix D of the thesis.
         """
-        data = self.regression_data_dict['h1_refinitiv'].copy(deep=True)
-
-        #
-        # lagged 12 months
-        #
-        sub_data1 = []
-        for company in data[Variables.BloombergDB.FIELDS.BB_TICKER].unique():
-            df = data.loc[data[Variables.BloombergDB.FIELDS.BB_TICKER] == company]
-            df[Variables.RegressionData.IndependentVar.H1_ESG_RTG] = df[
-                Variables.RegressionData.IndependentVar.H1_ESG_RTG].shift(periods=12)
-            df[Variables.RegressionData.ControlVar.H1_SIZE] = df[Variables.RegressionData.ControlVar.H1_SIZE].shift(
-                periods=12)
-            df[Variables.RegressionData.ControlVar.H1_LEV] = df[Variables.RegressionData.ControlVar.H1_LEV].shift(
-                periods=12)
-            df[Variables.RegressionData.ControlVar.H1_ICOV] = df[Variables.RegressionData.ControlVar.H1_ICOV].shift(
-                periods=12)
-            df[Variables.RegressionData.ControlVar.H1_OMAR] = df[Variables.RegressionData.ControlVar.H1_OMAR].shift(
-                periods=12)
-            sub_data1.append(df)
-        sub_data1 = pd.concat(sub_data1)
-        sub_data1 = sub_data1.dropna(how='any')
-        sub_data1 = sub_data1.loc[:, (sub_data1 != 0).any(axis=0)]
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data1[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        full_mod_log = OrderedModel(sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data1[[
-                                        Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                        Variables.RegressionData.ControlVar.H1_SIZE,
-                                        Variables.RegressionData.ControlVar.H1_LEV,
-                                        Variables.RegressionData.ControlVar.H1_ICOV,
-                                        Variables.RegressionData.ControlVar.H1_OMAR,
-                                        2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019,
-                                        'Energy and Natural Resources', 'Utility',
-                                        'BELGIUM', 'BRITAIN', 'CZECH', 'DENMARK', 'FINLAND', 'FRANCE', 'GERMANY',
-                                        'GREECE', 'HUNGARY', 'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY',
-                                        'POLAND', 'PORTUGAL', 'RUSSIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY'
-                                    ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print(
-            'Main result for full regression of hypothesis 1 using dataset from Refinitiv with explanatory variables lagged by 12 months...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        #
-        # ESG_RTG lagged 24 months, control variables lagged 12 months
-        #
-        sub_data2 = []
-        for company in data[Variables.BloombergDB.FIELDS.BB_TICKER].unique():
-            df = data.loc[data[Variables.BloombergDB.FIELDS.BB_TICKER] == company]
-            df[Variables.RegressionData.IndependentVar.H1_ESG_RTG] = df[
-                Variables.RegressionData.IndependentVar.H1_ESG_RTG].shift(periods=24)
-            df[Variables.RegressionData.ControlVar.H1_SIZE] = df[Variables.RegressionData.ControlVar.H1_SIZE].shift(
-                periods=12)
-            df[Variables.RegressionData.ControlVar.H1_LEV] = df[Variables.RegressionData.ControlVar.H1_LEV].shift(
-                periods=12)
-            df[Variables.RegressionData.ControlVar.H1_ICOV] = df[Variables.RegressionData.ControlVar.H1_ICOV].shift(
-                periods=12)
-            df[Variables.RegressionData.ControlVar.H1_OMAR] = df[Variables.RegressionData.ControlVar.H1_OMAR].shift(
-                periods=12)
-            sub_data2.append(df)
-        sub_data2 = pd.concat(sub_data2)
-        sub_data2 = sub_data2.dropna(how='any')
-        sub_data2 = sub_data2.loc[:, (sub_data2 != 0).any(axis=0)]
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data2[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        full_mod_log = OrderedModel(sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data2[[
-                                        Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                        Variables.RegressionData.ControlVar.H1_SIZE,
-                                        Variables.RegressionData.ControlVar.H1_LEV,
-                                        Variables.RegressionData.ControlVar.H1_ICOV,
-                                        Variables.RegressionData.ControlVar.H1_OMAR,
-                                        2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019,
-                                        'Energy and Natural Resources', 'Utility',
-                                        'BELGIUM', 'BRITAIN', 'CZECH', 'DENMARK', 'FINLAND', 'FRANCE', 'GERMANY',
-                                        'GREECE', 'HUNGARY', 'IRELAND', 'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY',
-                                        'POLAND', 'PORTUGAL', 'RUSSIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY'
-                                    ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print(
-            'Main result for full regression of hypothesis 1 using dataset from Refinitiv with explanatory variables lagged by 24 months...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
+        self.run(SPECS['h1_refinitiv_lagged'])
 
     def h2_alternative_models(self):
         """
         Run regression for hypothesis 2 but using monthly and yearly credit rating changes as dependent variables.
 
-        Reason for repetition:
-            - some dummies are redundant after slicing data and hence column names used in the regression will be changed.
-            - lose some observations: affect the categorical dependent variable, which is generated based on the dataset
-
         Regression results are printed out in the console and used to report data in Appendix E of the thesis.
         """
-
-        #
-        # monthly credit rating changes as dependent variable
-        #
-        data = self.regression_data_dict['h2_monthly'].copy(deep=True)
-
-        # convert credit rating changes to categorical variable
-        change_type = CategoricalDtype(
-            categories=sorted(data[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE].unique()),
-            ordered=True)
-        data[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE] = data[
-            Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H2_MONTHLY_CREDIT_RTG_CHANGE],
-                                    data[[
-                                        Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                        Variables.RegressionData.ControlVar.H1_SIZE,
-                                        Variables.RegressionData.ControlVar.H1_LEV,
-                                        Variables.RegressionData.ControlVar.H1_ICOV,
-                                        Variables.RegressionData.ControlVar.H1_OMAR,
-                                        2007, 2008, 2009, 2010, 2011, 2012, 2013,
-                                        2014, 2015, 2016, 2017, 2018, 2019, 2020,
-                                        'Energy and Natural Resources', 'Utility',
-                                        'AZERBAIJAN', 'BELGIUM', 'BRITAIN', 'CROATIA', 'CZECH', 'DENMARK', 'ESTONIA',
-                                        'FINLAND', 'FRANCE', 'GERMANY', 'GREECE', 'HUNGARY', 'ICELAND', 'IRELAND',
-                                        'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY', 'POLAND', 'PORTUGAL',
-                                        'RUSSIA', 'SLOVAKIA', 'SLOVENIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY',
-                                        'UKRAINE'
-                                    ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print(
-            'Main result for full regression of hypothesis 2 with monthly credit rating changes as dependent variable ...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        #
-        # yearly credit rating changes as dependent variable
-        #
-        data = self.regression_data_dict['h2_yearly'].copy(deep=True)
-
-        # convert credit rating changes to categorical variable
-        change_type = CategoricalDtype(
-            categories=sorted(data[Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE].unique()),
-            ordered=True)
-        data[Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE] = data[
-            Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(data[Variables.RegressionData.DependentVar.H2_YEARLY_CREDIT_RTG_CHANGE],
-                                    data[[
-                                        Variables.RegressionData.IndependentVar.H2_ESG_RATED_DUMMY,
-                                        Variables.RegressionData.ControlVar.H1_SIZE,
-                                        Variables.RegressionData.ControlVar.H1_LEV,
-                                        Variables.RegressionData.ControlVar.H1_ICOV,
-                                        Variables.RegressionData.ControlVar.H1_OMAR,
-                                        2007, 2008, 2009, 2010, 2011, 2012, 2013,
-                                        2014, 2015, 2016, 2017, 2018, 2019,
-                                        'Energy and Natural Resources', 'Utility',
-                                        'AZERBAIJAN', 'BELGIUM', 'BRITAIN', 'CROATIA', 'CZECH', 'DENMARK', 'ESTONIA',
-                                        'FINLAND', 'FRANCE', 'GERMANY', 'GREECE', 'HUNGARY', 'ICELAND', 'IRELAND',
-                                        'ITALY', 'LUXEMBOURG', 'NETHERLANDS', 'NORWAY', 'POLAND', 'PORTUGAL',
-                                        'RUSSIA', 'SLOVAKIA', 'SLOVENIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND', 'TURKEY',
-                                        'UKRAINE'
-                                    ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print(
-            'Main result for full regression of hypothesis 2 with yearly credit rating changes as dependent variable ...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
+        self.run(SPECS['h2_alternative_models'])
 
     def h1_size_impact(self):
         """
         Re-run full regression as in h1_refinitiv() but breaking the sample into top 25% and bottom 25% quantile.
 
-        Reason for repetition:
-            - some dummies are redundant after slicing data and hence column names used in the regression will be changed.
-            - lose some observations: affect the categorical dependent variable, which is generated based on the dataset
-
         Regression results are printed out in the console and used to report data in Appendix F of the thesis.
         """
-        data = self.regression_data_dict['h1_refinitiv'].copy(deep=True)
-
-        #
-        # top 25% quantile
-        #
-        # quartile check for big companies
-        sub_data1 = data.loc[data['SIZE'] >= data['SIZE'].quantile(q=0.75)].copy(deep=True)
-        sub_data1 = sub_data1.loc[:, (sub_data1 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data1[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(sub_data1[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data1[[
-                                        Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                        Variables.RegressionData.ControlVar.H1_SIZE,
-                                        Variables.RegressionData.ControlVar.H1_LEV,
-                                        Variables.RegressionData.ControlVar.H1_ICOV,
-                                        Variables.RegressionData.ControlVar.H1_OMAR,
-                                        2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019,
-                                        'Energy and Natural Resources', 'Utility',
-                                        'DENMARK', 'FRANCE', 'GERMANY', 'ITALY', 'LUXEMBOURG',
-                                        'NETHERLANDS', 'NORWAY', 'RUSSIA', 'SPAIN'
-                                    ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using Refinitiv dataset with top 25% quantile...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
-
-        #
-        # bottom 25% quantile
-        #
-        # quartile check for big companies
-        sub_data2 = data.loc[data['SIZE'] <= data['SIZE'].quantile(q=0.25)].copy(deep=True)
-        sub_data2 = sub_data2.loc[:, (sub_data2 != 0).any(axis=0)]  # remove redundant dummies
-
-        # convert dependent variable to categorical type (as required to run ordered logistic regression)
-        change_type = CategoricalDtype(
-            categories=sorted(sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG].unique()), ordered=True)
-        sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG] = sub_data2[
-            Variables.RegressionData.DependentVar.H1_CREDIT_RTG].astype(change_type)
-
-        # ordered logistic regression
-        full_mod_log = OrderedModel(sub_data2[Variables.RegressionData.DependentVar.H1_CREDIT_RTG],
-                                    sub_data2[[
-                                        Variables.RegressionData.IndependentVar.H1_ESG_RTG,
-                                        Variables.RegressionData.ControlVar.H1_SIZE,
-                                        Variables.RegressionData.ControlVar.H1_LEV,
-                                        Variables.RegressionData.ControlVar.H1_ICOV,
-                                        Variables.RegressionData.ControlVar.H1_OMAR,
-                                        2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019,
-                                        'Energy and Natural Resources', 'Utility',
-                                        'BELGIUM', 'BRITAIN', 'FINLAND', 'FRANCE', 'GERMANY', 'IRELAND', 'ITALY',
-                                        'LUXEMBOURG',
-                                        'NORWAY', 'POLAND', 'PORTUGAL', 'RUSSIA', 'SPAIN', 'SWEDEN', 'SWITZERLAND',
-                                        'TURKEY'
-                                    ]],
-                                    distr='logit')
-        res_log = full_mod_log.fit(method='bfgs')
-        print('Main result for full regression of hypothesis 1 using Refinitiv dataset with bottom 25% quantile...')
-        print(res_log.summary())
-        print('Pseudo R squared of the regression is: ')
-        print(res_log.prsquared)
+        self.run(SPECS['h1_size_impact'])
 
 
 if __name__ == "__main__":
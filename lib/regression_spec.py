@@ -0,0 +1,339 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+from statsmodels.miscmodels.ordinal_model import OrderedModel
+
+from lib.fixed_effects import FixedEffects
+from lib.ordered_logit import OrderedLogit
+from lib.variable_names import Variables
+
+"""
+This module provides the specifications of the ordered logistic regressions and the runner executing them.
+
+A specification only describes a regression, the design (dependent variable, regressors and dummies)
+is derived from the data when the regression is run, for example:
+
+    spec = RegressionSpec('h1_refinitiv_2006_2012', dataset='h1_refinitiv', dependent='CREDIT_RTG',
+                          regressors=['ESG_RTG', 'SIZE'], sample='2006 <= year <= 2012')
+    SpecRunner(datasets).run([spec])
+
+Dummies of the fixed effects are created by FixedEffects for the categories observed in the sample,
+without the reference category (by default the first observed category), so that dummy lists never have to be
+edited by hand after slicing the data.
+
+Regressions are independent of each other, a batch can therefore be fitted in a pool of processes
+(SpecRunner(datasets, jobs=4)). The designs are built in the main process, so that a worker only receives the
+dependent variable and the regressors of its regression, and results are collected in the order of the batch.
+
+A regression can be warm-started from the estimates of a related regression fitted before (e.g. the full model from
+the baseline model, or a sub sample from the full sample) with warm_start='h1_refinitiv_full': shared coefficients
+and thresholds are taken over, coefficients of new regressors (e.g. dummies) start at zero.
+If a warm-started fit does not converge, the regression is fitted again from the default start parameters.
+"""
+
+
+class RegressionSpec:
+    """
+    Specification of an ordered logistic regression.
+
+    :param name: unique name of the regression, e.g. 'h1_refinitiv_full'
+    :param dataset: name of the dataset, e.g. 'h1_refinitiv'
+    :param dependent: dependent variable (converted to an ordered categorical variable)
+    :param regressors: independent and control variables
+    :param fixed_effects: columns for which dummies are included, e.g. ['year', 'INDUSTRY', 'COUNTRY']
+    :param sample: (optional) selection of the sample, either a query (e.g. '2006 <= year <= 2012')
+    or a function returning a boolean mask of the rows of the dataset
+    :param lags: (optional) number of periods each variable is lagged by within each company, e.g. {'ESG_RTG': 12}.
+    Observations without lagged values are excluded.
+    :param reference: (optional) explicit reference category of fixed effects, e.g. {'year': 2006}
+    :param method: optimizer used to fit the model, e.g. 'bfgs' (OrderedModel of statsmodels)
+    or 'trust-exact' (OrderedLogit with analytic Hessian)
+    :param title: text printed before the results
+    :param warm_start: (optional) name of a related specification whose estimates are used as start parameters,
+    if it is fitted before (earlier in the batch or in a previous batch of the runner)
+    """
+
+    def __init__(self, name: str, dataset: str, dependent: str, regressors: list,
+                 fixed_effects: list = ('year', 'INDUSTRY', 'COUNTRY'), sample=None, lags: dict = None,
+                 reference: dict = None, method: str = 'bfgs', title: str = None, warm_start: str = None):
+        self.name = name
+        self.dataset = dataset
+        self.dependent = dependent
+        self.regressors = list(regressors)
+        self.fixed_effects = list(fixed_effects)
+        self.sample = sample
+        self.lags = dict(lags or {})
+        self.reference = dict(reference or {})
+        self.method = method
+        self.title = title or 'Result of regression {}...'.format(name)
+        self.warm_start = warm_start
+
+    def __repr__(self):
+        return 'RegressionSpec({!r}, dataset={!r})'.format(self.name, self.dataset)
+
+
+class SpecRunner:
+    """
+    Derive the design of regression specifications and fit them with OrderedModel of statsmodels.
+
+    :param datasets: dictionary of the datasets used by the specifications (e.g. LazyDataDict of regression data)
+    :param group: column identifying the companies, within which variables are lagged
+    :param jobs: number of processes fitting the regressions of a batch
+    (1: all regressions are fitted one after another in the main process)
+    :param method: (optional) optimizer used for all specifications instead of their own,
+    e.g. 'trust-exact' to fit all regressions with OrderedLogit
+    :param store: (optional) ResultStore (lib/result_store.py), in which the results of each batch are saved
+
+    The results of all fitted specifications are kept in self.results (keyed by name) and used for warm starts.
+    """
+
+    def __init__(self, datasets: Mapping, group: str = Variables.BloombergDB.FIELDS.BB_TICKER, jobs: int = 1,
+                 method: str = None, store=None):
+        self.datasets = datasets
+        self.group = group
+        self.jobs = max(1, int(jobs))
+        self.method = method
+        self.store = store
+        self.results = {}
+
+    def sample(self, spec: RegressionSpec) -> pd.DataFrame:
+        """
+        Returns the observations of a specification: lagged variables, sample selection and no NA values.
+        """
+        data = self.datasets[spec.dataset]
+
+        if spec.lags:
+            grouped = data.groupby(self.group, sort=False)
+            data = data.assign(**{column: grouped[column].shift(periods) for column, periods in spec.lags.items()})
+
+        if spec.sample is not None:
+            data = data.query(spec.sample) if isinstance(spec.sample, str) else data.loc[spec.sample(data)]
+
+        fixed_effects = [column for column in spec.fixed_effects if column in data.columns]
+
+        return data.dropna(subset=[spec.dependent] + spec.regressors + fixed_effects)
+
+    def design(self, spec: RegressionSpec) -> tuple:
+        """
+        Returns the dependent variable (ordered categorical) and the regressors (including dummies)
+        of a specification.
+        """
+        data = self.sample(spec)
+
+        endog = data[spec.dependent].astype(CategoricalDtype(categories=sorted(data[spec.dependent].unique()),
+                                                             ordered=True))
+        dummies = FixedEffects(spec.fixed_effects, reference=spec.reference).design_matrix(data)
+        exog = pd.concat([data[spec.regressors], dummies], axis=1)
+
+        return endog, exog
+
+    def start_params(self, spec: RegressionSpec, endog: pd.Series, exog: pd.DataFrame):
+        """
+        Returns the start parameters of a specification, i.e. the estimates of its warm start mapped to its design,
+        or None (default start parameters of statsmodels) if the warm start is not fitted yet.
+        """
+        source = self.results.get(spec.warm_start)
+        if source is None:
+            return None
+
+        return warm_start_params(source, endog, exog)
+
+    def fit(self, spec: RegressionSpec):
+        """
+        Fit the ordered logistic regression of a specification and return the results of statsmodels.
+        """
+        endog, exog = self.design(spec)
+        start_params = self.start_params(spec, endog, exog)
+        self.results[spec.name] = result = fit_design(endog, exog, self.method or spec.method, start_params)
+        self.record_start(spec, start_params, result)
+
+        return result
+
+    @staticmethod
+    def record_start(spec: RegressionSpec, start_params, result) -> None:
+        """
+        Store the name of the warm start actually used in result.mle_retvals['warm_start']
+        (None if the regression was fitted from the default start parameters, see fit_design()).
+        """
+        warm = start_params is not None and not result.mle_retvals.get('cold_restart', False)
+        result.mle_retvals['warm_start'] = spec.warm_start if warm else None
+
+    def run(self, specs: list, verbose: bool = True) -> OrderedDict:
+        """
+        Fit a batch of specifications and return their results keyed by specification name (in the given order).
+        With jobs > 1, the regressions are fitted in parallel (a warm-started regression after its warm start),
+        results are still printed in the given order. The results of the batch are then saved in the store (if any).
+
+        :param verbose: if True, the summary, pseudo R squared and iterations of each regression are printed
+        """
+        names = [spec.name for spec in specs]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError('Names of regression specifications must be unique: {}'.format(duplicates))
+
+        # regressions are fitted in waves: a regression waits for its warm start if it comes earlier in the batch
+        levels = {}
+        for spec in specs:
+            levels[spec.name] = levels[spec.warm_start] + 1 if spec.warm_start in levels else 0
+        if self.jobs == 1 or len(specs) < 2:
+            waves = [[spec] for spec in specs]
+        else:
+            waves = [[spec for spec in specs if levels[spec.name] == level]
+                     for level in range(max(levels.values()) + 1)]
+
+        printed = 0
+        pool = ProcessPoolExecutor(max_workers=min(self.jobs, len(specs))) if len(waves) < len(specs) else None
+        with pool or nullcontext():
+            for wave in waves:
+                if pool is None:
+                    for spec in wave:
+                        self.fit(spec)
+                else:
+                    # only the designs (not the datasets) are sent to the workers
+                    designs = [self.design(spec) for spec in wave]
+                    starts = [self.start_params(spec, endog, exog) for spec, (endog, exog) in zip(wave, designs)]
+                    fitted = pool.map(fit_design, [endog for endog, _ in designs], [exog for _, exog in designs],
+                                      [self.method or spec.method for spec in wave], starts)
+                    for spec, start, result in zip(wave, starts, fitted):
+                        self.record_start(spec, start, result)
+                        self.results[spec.name] = result
+
+                # print results of the batch in the given order
+                while verbose and printed < len(specs) and specs[printed].name in self.results:
+                    self.report(specs[printed], self.results[specs[printed].name])
+                    printed += 1
+
+        results = OrderedDict((spec.name, self.results[spec.name]) for spec in specs)
+        if self.store is not None:
+            self.store.save(specs, results)
+
+        return results
+
+    @staticmethod
+    def report(spec: RegressionSpec, result) -> None:
+        """
+        Print the summary, pseudo R squared and number of iterations of the result of a specification.
+        """
+        print(spec.title)
+        print(result.summary())
+        print('Pseudo R squared of the regression is: ')
+        print(result.prsquared)
+        print('Iterations of the optimizer: {} (converged: {}, warm start: {}{})'.format(
+            result.mle_retvals['iterations'], result.mle_retvals['converged'], result.mle_retvals['warm_start'],
+            ', re-fitted from default start parameters as the warm start of {} did not converge'.format(
+                spec.warm_start) if result.mle_retvals.get('cold_restart') else ''))
+
+    def benchmark(self, specs: list, methods: tuple = ('bfgs', 'trust-exact')) -> pd.DataFrame:
+        """
+        Fit each specification with each optimizer (without warm start) and compare them with the first optimizer:
+        runtime in seconds, iterations, convergence, log-likelihood, pseudo R squared and the largest absolute
+        difference of the parameters and standard errors.
+        """
+        rows = []
+        for spec in specs:
+            endog, exog = self.design(spec)
+            reference = None
+            for method in methods:
+                result = fit_design(endog, exog, method)
+                if reference is None:
+                    reference = result
+                rows.append({
+                    'name': spec.name, 'method': method, 'runtime': result.mle_retvals['runtime'],
+                    'iterations': result.mle_retvals['iterations'], 'converged': result.mle_retvals['converged'],
+                    'llf': result.llf, 'prsquared': result.prsquared,
+                    'max_params_diff': np.max(np.abs(np.asarray(result.params) - np.asarray(reference.params))),
+                    'max_bse_diff': np.max(np.abs(np.asarray(result.bse) - np.asarray(reference.bse))),
+                })
+
+        return pd.DataFrame(rows).set_index(['name', 'method'])
+
+    @staticmethod
+    def convergence(results: Mapping) -> pd.DataFrame:
+        """
+        Returns the warm start, number of iterations and function evaluations, convergence and cold restart
+        (see fit_design()) of each result (e.g. returned by run()), to compare the optimizer with and without warm starts.
+        """
+        columns = ['warm_start', 'iterations', 'fcalls', 'converged', 'cold_restart']
+        return pd.DataFrame([
+            {column: result.mle_retvals.get(column) for column in columns} for result in results.values()
+        ], index=pd.Index(list(results), name='name'), columns=columns)
+
+
+def warm_start_params(result, endog: pd.Series, exog: pd.DataFrame) -> np.ndarray:
+    """
+    Map the estimates of a fitted ordered logistic regression to start parameters of the model of endog on exog:
+        + coefficients of the same regressors are taken over, coefficients of new regressors are 0
+        + thresholds between the same categories are taken over, other thresholds are calculated from the observed
+          frequencies (as the default start parameters of statsmodels)
+    If the thresholds obtained are not increasing, all thresholds are calculated from the observed frequencies.
+    """
+    source = result.model
+    model = OrderedModel(endog, exog, distr='logit')
+    params = np.asarray(result.params)
+
+    coefficients = pd.Series(params[:source.k_vars], index=source.exog_names[:source.k_vars])
+    coefficients = coefficients.reindex(model.exog_names[:model.k_vars]).fillna(0).to_numpy()
+
+    default = model.transform_threshold_params(model.start_params)[1:-1]
+    thresholds = pd.Series(source.transform_threshold_params(params)[1:-1], index=source.exog_names[source.k_vars:])
+    thresholds = thresholds.reindex(model.exog_names[model.k_vars:]).to_numpy()
+    thresholds = np.where(np.isnan(thresholds), default, thresholds)
+    if not (np.diff(thresholds) > 0).all():
+        thresholds = default
+
+    return np.concatenate([coefficients, model.transform_reverse_threshold_params(np.append(thresholds, np.inf))])
+
+
+def fit_design(endog: pd.Series, exog: pd.DataFrame, method: str = 'bfgs', start_params: np.ndarray = None):
+    """
+    Fit an ordered logistic regression of endog on exog and return the results of statsmodels
+    (executed in a worker process of SpecRunner when jobs > 1).
+    Methods of OrderedLogit (e.g. 'trust-exact') use the estimator with analytic Hessian of lib/ordered_logit.py,
+    other methods (e.g. 'bfgs') use OrderedModel of statsmodels.
+    The optimizer, its number of iterations and the runtime of the fit (in seconds) are stored in
+    result.mle_retvals ('method', 'iterations' and 'runtime').
+
+    If the fit from start_params (warm start) does not converge or has missing standard errors (e.g. a singular
+    Hessian at a quasi-separated point), the model is fitted again from the default start parameters.
+    The cold fit is kept if it converges with finite standard errors or reaches a higher log-likelihood
+    (result.mle_retvals['cold_restart'] is then True), the runtime includes both fits.
+    """
+    start = time.perf_counter()
+    result = fit_start(endog, exog, method, start_params)
+    result.mle_retvals['cold_restart'] = False
+    if start_params is not None and not reliable_fit(result):
+        cold = fit_start(endog, exog, method)
+        if reliable_fit(cold) or cold.llf > result.llf:
+            result = cold
+            result.mle_retvals['cold_restart'] = True
+    result.mle_retvals['runtime'] = time.perf_counter() - start
+
+    return result
+
+
+def reliable_fit(result) -> bool:
+    """
+    Returns True if the fit converged and all its standard errors are finite.
+    """
+    return bool(result.mle_retvals['converged']) and bool(np.isfinite(np.asarray(result.bse, dtype=float)).all())
+
+
+def fit_start(endog: pd.Series, exog: pd.DataFrame, method: str = 'bfgs', start_params: np.ndarray = None):
+    """
+    Fit an ordered logistic regression once from start_params (by default the start parameters of the estimator).
+    """
+    if method in OrderedLogit.METHODS:
+        return OrderedLogit(endog, exog).fit(start_params=start_params, method=method)
+
+    iterations = []
+    result = OrderedModel(endog, exog, distr='logit').fit(start_params=start_params, method=method,
+                                                          callback=iterations.append)
+    result.mle_retvals.update({'iterations': len(iterations), 'method': method})
+
+    return result
@@ -0,0 +1,237 @@
+import os
+import warnings
+import numpy as np
+import pandas as pd
+
+from lib.helpers import DataRoot, DataStore
+
+"""
+This module keeps the results of the regressions (see lib/regression_spec.py) in a data store, so that the tables
+of the thesis are rendered from stored results instead of being copied from the console, and without re-fitting.
+
+The results are stored in two tables keyed by the name of the specification:
+    + 'fits': one row per regression with its dataset, dependent variable, fixed effects, number of observations,
+      log-likelihood, pseudo R squared, optimizer, iterations, convergence and runtime
+    + 'estimates': one row per parameter of each regression with its coefficient, standard error and p-value,
+      and the value of the threshold for the thresholds between two categories
+
+Fitting a specification again replaces its rows, other specifications are kept. For example:
+
+    store = ResultStore()
+    store.save(specs, results)
+    store.table(['h1_refinitiv_baseline', 'h1_refinitiv_full'])
+"""
+
+
+class ResultStore:
+    """
+    Results of fitted regression specifications, stored in 'data/regression_results/regression_results'
+    (one Parquet file per table, or 'regression_results.xlsx' if pyarrow is not installed, see DataStore).
+
+    :param root: directory of the results, by default DataRoot().regression_results_root
+    :param backend: (optional) name of the backend of DataStore, e.g. 'excel'
+    """
+
+    FILE_NAME = 'regression_results.xlsx'
+    FITS = 'fits'
+    ESTIMATES = 'estimates'
+    FIT_COLUMNS = ['name', 'dataset', 'dependent', 'regressors', 'fixed_effects', 'title', 'nobs', 'llf', 'llnull',
+                   'prsquared', 'method', 'warm_start', 'iterations', 'fcalls', 'converged', 'runtime', 'fitted_at']
+    ESTIMATE_COLUMNS = ['name', 'parameter', 'kind', 'coef', 'bse', 'pvalue', 'threshold']
+
+    # significance levels of the stars in the tables
+    STARS = [(0.01, '***'), (0.05, '**'), (0.1, '*')]
+
+    def __init__(self, root: str = None, backend: str = None):
+        self.store = DataStore.open(root or DataRoot().regression_results_root, self.FILE_NAME, backend=backend)
+
+    @classmethod
+    def records(cls, spec, result) -> tuple:
+        """
+        Returns the row of the 'fits' table (dictionary) and the rows of the 'estimates' table (data frame)
+        of the result of a specification.
+        Parameters are either regressors of the specification, dummies of the fixed effects or thresholds.
+        """
+        model = result.model
+        params = np.asarray(result.params)
+        # dummies of the fixed effects may be named by their category (e.g. the year as int)
+        names = [str(name) for name in model.exog_names]
+        retvals = result.mle_retvals
+
+        fit = {
+            'name': spec.name, 'dataset': spec.dataset, 'dependent': spec.dependent,
+            'regressors': ', '.join(spec.regressors), 'fixed_effects': ', '.join(spec.fixed_effects),
+            'title': spec.title, 'nobs': int(result.nobs), 'llf': float(result.llf), 'llnull': float(result.llnull),
+            'prsquared': float(result.prsquared), 'method': retvals.get('method'),
+            'warm_start': retvals.get('warm_start'), 'iterations': retvals.get('iterations'),
+            'fcalls': retvals.get('fcalls'), 'converged': bool(retvals.get('converged')),
+            'runtime': retvals.get('runtime'), 'fitted_at': pd.Timestamp.now(),
+        }
+
+        kind = np.where(np.arange(len(names)) >= model.k_vars, 'threshold',
+                        np.where(np.isin(names, list(spec.regressors)), 'regressor', 'fixed_effect'))
+        threshold = np.full(len(names), np.nan)
+        threshold[model.k_vars:] = model.transform_threshold_params(params)[1:-1]
+        estimates = pd.DataFrame({
+            'name': spec.name, 'parameter': names, 'kind': kind, 'coef': params,
+            'bse': np.asarray(result.bse, dtype=float), 'pvalue': np.asarray(result.pvalues, dtype=float),
+            'threshold': threshold,
+        }, columns=cls.ESTIMATE_COLUMNS)
+
+        return fit, estimates
+
+    def save(self, specs: list, results) -> None:
+        """
+        Store the results of a batch of specifications (e.g. returned by SpecRunner().run()) in one pass,
+        replacing stored results of specifications with the same name.
+
+        :param specs: fitted specifications (RegressionSpec)
+        :param results: results keyed by the names of the specifications
+        """
+        records = [self.records(spec, results[spec.name]) for spec in specs]
+        fits = pd.DataFrame([fit for fit, _ in records], columns=self.FIT_COLUMNS)
+        estimates = pd.concat([estimates for _, estimates in records], ignore_index=True)
+
+        # the estimates are written first, so that a regression is never listed in 'fits' without its estimates
+        os.makedirs(self.store.root, exist_ok=True)
+        for sheet_name, data in [(self.ESTIMATES, estimates), (self.FITS, fits)]:
+            if self.store.exists(sheet_name):
+                stored = self.store.read(sheet_name)
+                data = pd.concat([stored[~stored['name'].isin(fits['name'])], data], ignore_index=True)
+            self.store.write(data, sheet_name)
+
+    def read(self, sheet_name: str, names: list = None) -> pd.DataFrame:
+        """
+        Returns the stored 'fits' or 'estimates' (of the given specifications only, in this order).
+        """
+        if not self.store.exists(sheet_name):
+            raise FileNotFoundError('No regression results are stored yet, please run the regressions first '
+                                    '(e.g. python -m lib regress --mode main)')
+
+        data = self.store.read(sheet_name)
+        if names is None:
+            return data
+
+        missing = [name for name in names if name not in set(data['name'])]
+        if missing:
+            raise KeyError('Results of {} are not stored yet, please run these regressions first'.format(missing))
+
+        order = data['name'].map(pd.Series(range(len(names)), index=names))
+        return data[order.notna()].assign(order=order).sort_values('order', kind='mergesort').drop(columns='order')
+
+    def fits(self, names: list = None) -> pd.DataFrame:
+        return self.read(self.FITS, names).set_index('name')
+
+    def estimates(self, names: list = None) -> pd.DataFrame:
+        return self.read(self.ESTIMATES, names)
+
+    def table(self, names: list, thresholds: bool = False, digits: int = 3) -> pd.DataFrame:
+        """
+        Render a publication table of stored results, with one column per specification:
+            + coefficient of each regressor (with stars: *** p < 0.01, ** p < 0.05, * p < 0.1)
+              and its standard error in brackets in the row below
+            + (optional) values of the thresholds between the categories of the dependent variable
+            + fixed effects (Yes / No), number of observations, pseudo R squared and log-likelihood
+            + convergence of the optimizer (Yes / No) and notes on each regression that did not converge
+              or has parameters without standard error (e.g. if the Hessian could not be inverted),
+              these regressions are also reported with a warning
+
+        Standard errors that are not available are rendered as '(n/a)'.
+
+        :param names: names of the specifications (columns of the table)
+        :param thresholds: if True, the thresholds are reported after the regressors
+        :param digits: number of decimal places
+        """
+        fits = self.fits(names)
+        estimates = self.estimates(names)
+        notes = self.notes(fits, estimates)
+        if any(notes.values()):
+            warnings.warn('Results of the following regressions are not reliable: {}'.format(
+                {name: note for name, note in notes.items() if note}))
+
+        kinds = ['regressor', 'threshold'] if thresholds else ['regressor']
+        estimates = estimates[estimates['kind'].isin(kinds)]
+
+        # rows in the order of appearance (regressors of the first specification first)
+        estimates = estimates.assign(order=estimates['kind'].map({'regressor': 0, 'threshold': 1}))
+        parameters = estimates.drop_duplicates('parameter').sort_values('order', kind='mergesort')['parameter']
+
+        cells = estimates.set_index(['parameter', 'name'])
+        rows = []
+        for parameter in parameters:
+            coef, bse = [], []
+            for name in names:
+                if (parameter, name) not in cells.index:
+                    coef.append('')
+                    bse.append('')
+                    continue
+                estimate = cells.loc[(parameter, name)]
+                if estimate['kind'] == 'threshold':
+                    coef.append('{:.{}f}'.format(estimate['threshold'], digits))
+                else:
+                    coef.append('{:.{}f}{}'.format(estimate['coef'], digits, self.stars(estimate['pvalue'])))
+                    bse.append('({:.{}f})'.format(estimate['bse'], digits) if np.isfinite(estimate['bse']) else '(n/a)')
+            rows += [[parameter] + coef, [''] + bse] if any(bse) else [[parameter] + coef]
+
+        fixed_effects = [fixed_effect for name in names for fixed_effect in self.split(fits.loc[name, 'fixed_effects'])]
+        for fixed_effect in dict.fromkeys(fixed_effects):
+            rows.append(['{} dummies'.format(fixed_effect.capitalize())] + [
+                'Yes' if fixed_effect in self.split(fits.loc[name, 'fixed_effects']) else 'No' for name in names])
+        rows.append(['Observations'] + [str(fits.loc[name, 'nobs']) for name in names])
+        rows.append(['Pseudo R squared'] + ['{:.{}f}'.format(fits.loc[name, 'prsquared'], digits) for name in names])
+        rows.append(['Log-likelihood'] + ['{:.{}f}'.format(fits.loc[name, 'llf'], digits) for name in names])
+        rows.append(['Converged'] + ['Yes' if fits.loc[name, 'converged'] else 'No' for name in names])
+        if any(notes.values()):
+            rows.append(['Notes'] + [notes[name] for name in names])
+
+        return pd.DataFrame(rows, columns=['variable'] + list(names))
+
+    def publish(self, tables: dict, file_path: str = None, **kwargs) -> str:
+        """
+        Render tables of stored results (table name -> names of the specifications) and export them to a single
+        Excel file, one sheet per table, e.g. 'data/regression_results/regression_tables.xlsx'.
+
+        :param kwargs: options of table(), e.g. thresholds=True
+        :return: path of the Excel file
+        """
+        if file_path is None:
+            file_path = os.path.join(self.store.root, 'regression_tables.xlsx')
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+
+        DataStore.write_excel(file_path, {table_name: self.table(names, **kwargs) for table_name, names in tables.items()})
+
+        return file_path
+
+    @staticmethod
+    def notes(fits: pd.DataFrame, estimates: pd.DataFrame) -> dict:
+        """
+        Returns a note for each regression (name -> note, '' if there is nothing to report) whose optimizer did not
+        converge or whose standard errors are not available for some parameters (including fixed effects and thresholds).
+        """
+        missing_bse = (~np.isfinite(estimates['bse'].astype(float))).groupby(estimates['name']).sum()
+
+        notes = {}
+        for name in fits.index:
+            note = []
+            if not fits.loc[name, 'converged']:
+                note.append('optimizer did not converge')
+            if missing_bse.get(name, 0):
+                note.append('no standard error for {} of {} parameters'.format(
+                    int(missing_bse[name]), int((estimates['name'] == name).sum())))
+            notes[name] = '; '.join(note)
+
+        return notes
+
+    @classmethod
+    def stars(cls, pvalue: float) -> str:
+        for level, stars in cls.STARS:
+            if pvalue < level:
+                return stars
+        return ''
+
+    @staticmethod
+    def split(values) -> list:
+        """
+        Returns the list of a comma-separated string stored in a table, e.g. of the fixed effects.
+        """
+        return [value for value in str(values).split(', ') if value] if isinstance(values, str) else []
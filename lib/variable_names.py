@@ -85,6 +85,7 @@ class Variables:
         """
 
         LT_LOCAL_ISSUER = 'LT Local Issuer Credit'
+        RATING_SCALE = 'S&P'
 
 
     class CleanedData:
@@ -99,6 +100,7 @@ class Variables:
         POPULATED_SP_CREDIT_RTG_SHEET_NAME = 'populated_sp_credit_rtg'
         ACCOUNTING_SHEET_NAME = 'accounting'
         POPULATED_ACCOUNTING_SHEET_NAME = 'populated_accounting'
+        MANIFEST_FILE_NAME = 'cleaned_data_manifest.json'
 
     class DescriptiveStats:
         """
@@ -137,6 +139,8 @@ class Variables:
             H1_SUSTAINALYTICS_SHEET_NAME = 'h1_sustainalytics'
             H1_REFINITIV_SHEET_NAME = 'h1_refinitiv'
             H1_SPGLOBAL_SHEET_NAME = 'h1_spglobal'
+            H1_COMMON_SHEET_NAME = 'h1_common'
+            H1_WINSORIZE_SHEET_NAME = 'h1_winsorize'
 
             # H2 file names
             H2_FILE_NAME = 'h2_regression_data.xlsx'
@@ -154,6 +158,7 @@ class Variables:
             H1_CREDIT_RTG = 'CREDIT_RTG'
             H2_CREDIT_RTG_CHANGE = 'CR_CHANGE'
             H2_MONTHLY_CREDIT_RTG_CHANGE = 'CR_CHANGE_M'
+            H2_MONTHLY_CREDIT_RTG_CHANGE_HORIZON = 'CR_CHANGE_{}M'  # e.g. 'CR_CHANGE_3M' (3-month horizon)
             H2_YEARLY_CREDIT_RTG_CHANGE = 'CR_CHANGE_Y'
 
         class IndependentVar:
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+"""
+This module provides the winsorization of several variables at once, e.g. of the control variables of hypothesis 1:
+
+    winsorizer = Winsorizer(['SIZE', 'LEVERAGE'], limits=(0.05, 0.05))
+    data = winsorizer.apply(data)
+    winsorizer.thresholds       # lower and upper clipping threshold of each variable
+
+Limits can also be calculated separately per group (e.g. by='year' or by='INDUSTRY') as a robustness check.
+
+The thresholds are the same as in scipy.stats.mstats.winsorize(): with n observations,
+the int(lower * n) lowest values are set to the next lowest value and the int(upper * n) highest values are set to
+the next highest value. They are taken from a single DataFrame.quantile() call (per group) and values are then
+clipped without creating masked arrays.
+"""
+
+
+class Winsorizer:
+    """
+    Winsorize several columns of a data frame.
+
+    :param columns: columns to be winsorized
+    :param limits: proportions (lower, upper) of the observations to be clipped at each end, e.g. (0.05, 0.05)
+    :param by: (optional) column or list of columns, limits are then calculated separately within each group
+    """
+
+    def __init__(self, columns: list, limits: tuple = (0.05, 0.05), by=None):
+        self.columns = list(columns)
+        self.limits = limits
+        self.by = [by] if isinstance(by, str) else by
+        self.thresholds = None
+
+    def quantiles(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the lower and upper thresholds (rows 'lower' and 'upper') and number of observations (row 'nobs')
+        of each column of data.
+        """
+        nobs = data.count()
+        result = pd.DataFrame(np.nan, index=['lower', 'upper', 'nobs'], columns=data.columns)
+        result.loc['nobs'] = nobs
+
+        # columns with the same number of observations (i.e. all columns without NA values) share one quantile call
+        for n, columns in nobs.groupby(nobs).groups.items():
+            if n == 0:
+                continue
+            positions = [int(self.limits[0] * n), n - int(self.limits[1] * n) - 1]
+            quantiles = data[list(columns)].quantile([position / max(n - 1, 1) for position in positions],
+                                                     interpolation='nearest')
+            result.loc[['lower', 'upper'], list(columns)] = quantiles.to_numpy()
+
+        return result
+
+    def apply(self, data: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        Returns data with winsorized columns. The thresholds used are stored in self.thresholds and in
+        data.attrs['winsorize'] (one row per group and column with 'lower', 'upper' and 'nobs').
+
+        :param inplace: if True, the columns of data are overwritten instead of returning a copy
+        """
+        if self.by is None:
+            groups = [((), data[self.columns])]
+        else:
+            grouped = data.groupby(self.by, sort=True)
+            codes = grouped.ngroup().fillna(-1).astype(int).to_numpy()  # NaN for rows with a NaN group key
+            groups = [(key if isinstance(key, tuple) else (key,), frame) for key, frame in grouped[self.columns]]
+
+        quantiles = [self.quantiles(frame) for _, frame in groups]
+        lower = np.array([q.loc['lower'].to_numpy(dtype=float) for q in quantiles]).reshape(len(groups), -1)
+        upper = np.array([q.loc['upper'].to_numpy(dtype=float) for q in quantiles]).reshape(len(groups), -1)
+
+        # thresholds of the group of each row (rows without group, i.e. code -1, are not clipped)
+        if self.by is None:
+            row_lower, row_upper = lower[0], upper[0]
+        else:
+            row_lower = np.append(lower, np.full((1, len(self.columns)), np.nan), axis=0)[codes]
+            row_upper = np.append(upper, np.full((1, len(self.columns)), np.nan), axis=0)[codes]
+
+        values = data[self.columns].to_numpy(dtype=float)
+        np.copyto(values, row_lower, where=values < row_lower)
+        np.copyto(values, row_upper, where=values > row_upper)
+
+        result = data if inplace else data.copy()
+        for i, column in enumerate(self.columns):
+            result[column] = values[:, i].astype(data[column].dtype, copy=False)
+
+        self.thresholds = pd.DataFrame([
+            dict(zip(self.by or [], key), variable=column, lower=q.at['lower', column], upper=q.at['upper', column],
+                 nobs=int(q.at['nobs', column]))
+            for (key, _), q in zip(groups, quantiles)
+            for column in self.columns
+        ], columns=(self.by or []) + ['variable', 'lower', 'upper', 'nobs'])
+        result.attrs['winsorize'] = self.thresholds
+
+        return result
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from lib import regression_spec
+from lib.regression_spec import fit_design
+
+"""
+Tests of the fallback of warm-started fits to a cold fit in fit_design().
+"""
+
+
+def fake_result(converged: bool, bse: list, llf: float) -> SimpleNamespace:
+    return SimpleNamespace(mle_retvals={'converged': converged}, bse=pd.Series(bse), llf=llf)
+
+
+def test_warm_start_with_missing_standard_errors_falls_back_to_cold_fit(monkeypatch):
+    # the warm start converges to a quasi-separated point with a singular Hessian (no standard errors)
+    warm = fake_result(True, [np.nan, np.nan], llf=-100.0)
+    cold = fake_result(True, [0.1, 0.2], llf=-100.5)
+    calls = []
+
+    def fit_start(endog, exog, method='bfgs', start_params=None):
+        calls.append(start_params)
+        return warm if start_params is not None else cold
+
+    monkeypatch.setattr(regression_spec, 'fit_start', fit_start)
+    result = fit_design(None, None, 'bfgs', start_params=np.zeros(2))
+
+    assert result is cold
+    assert result.mle_retvals['cold_restart']
+    assert len(calls) == 2
+
+
+def test_warm_start_with_finite_standard_errors_is_kept(monkeypatch):
+    warm = fake_result(True, [0.1, 0.2], llf=-100.0)
+    calls = []
+
+    def fit_start(endog, exog, method='bfgs', start_params=None):
+        calls.append(start_params)
+        return warm
+
+    monkeypatch.setattr(regression_spec, 'fit_start', fit_start)
+    result = fit_design(None, None, 'bfgs', start_params=np.zeros(2))
+
+    assert result is warm
+    assert not result.mle_retvals['cold_restart']
+    assert len(calls) == 1
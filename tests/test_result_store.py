@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from lib.regression_spec import RegressionSpec, SpecRunner
+from lib.result_store import ResultStore
+
+"""
+Tests of the result store with regressions fitted by OrderedModel of statsmodels (bfgs), whose year dummies
+are named by the year as int.
+"""
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def dataset() -> pd.DataFrame:
+    rng = np.random.RandomState(0)
+    n = 600
+    data = pd.DataFrame({
+        'TICKER': np.repeat(['A', 'B', 'C', 'D', 'E', 'F'], n // 6),
+        'year': np.tile([2006, 2007, 2008, 2009], n // 4),
+        'ESG_RTG': rng.normal(size=n),
+        'SIZE': rng.normal(size=n),
+    })
+    latent = 0.8 * data['ESG_RTG'] - 0.5 * data['SIZE'] + 0.2 * (data['year'] - 2006) + rng.logistic(size=n)
+    data['CREDIT_RTG'] = np.digitize(latent, [-1, 0.5, 2]) + 1
+
+    return data
+
+
+@pytest.fixture
+def specs() -> list:
+    return [
+        RegressionSpec('baseline', 'test', 'CREDIT_RTG', ['ESG_RTG'], fixed_effects=['year'], method='bfgs'),
+        RegressionSpec('full', 'test', 'CREDIT_RTG', ['ESG_RTG', 'SIZE'], fixed_effects=['year'], method='bfgs'),
+    ]
+
+
+def test_save_statsmodels_results_with_year_dummies(tmp_path, dataset, specs):
+    store = ResultStore(str(tmp_path), backend='parquet')
+    results = SpecRunner({'test': dataset}, group='TICKER', store=store).run(specs, verbose=False)
+
+    # the year dummies are named by the year as int in statsmodels
+    assert 2007 in results['full'].model.exog_names
+
+    estimates = store.estimates(['baseline', 'full'])
+    full = estimates[estimates['name'] == 'full'].set_index('parameter')
+    assert list(full.index) == [str(name) for name in results['full'].model.exog_names]
+    assert full.loc['2007', 'kind'] == 'fixed_effect'
+    assert full.loc['SIZE', 'kind'] == 'regressor'
+    assert np.allclose(full['coef'], results['full'].params)
+
+    fits = store.fits()
+    assert list(fits.index) == ['baseline', 'full']
+    assert fits.loc['full', 'method'] == 'bfgs'
+
+    table = store.table(['baseline', 'full'], thresholds=True)
+    assert list(table.columns) == ['variable', 'baseline', 'full']
+    assert 'Year dummies' in set(table['variable'])
+    assert '2007' not in set(table['variable'])
+
+
+def test_save_replaces_results_of_the_same_specification(tmp_path, dataset, specs):
+    store = ResultStore(str(tmp_path), backend='parquet')
+    runner = SpecRunner({'test': dataset}, group='TICKER', store=store)
+    runner.run(specs, verbose=False)
+    runner.run(specs[1:], verbose=False)
+
+    assert list(store.fits().index) == ['baseline', 'full']
+    assert store.estimates()['name'].value_counts().to_dict() == {
+        'baseline': len(runner.results['baseline'].params), 'full': len(runner.results['full'].params)}
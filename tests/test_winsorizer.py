@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+from lib.winsorizer import Winsorizer
+
+"""
+Tests of the winsorization per group.
+"""
+
+
+def test_rows_without_group_are_not_clipped():
+    data = pd.DataFrame({'g': ['x'] * 10 + [None] * 3, 'a': range(13)})
+
+    result = Winsorizer(['a'], (0.1, 0.1), by='g').apply(data)
+
+    np.testing.assert_array_equal(result['a'].to_numpy(), [1, 1, 2, 3, 4, 5, 6, 7, 8, 8, 10, 11, 12])
+    assert result['a'].dtype == data['a'].dtype